@@ -0,0 +1,75 @@
+# benchmarks/bench_markdown_splitter.py
+"""
+Throughput of the markdown chunker against the recursive splitter on large pages.
+
+    python -m benchmarks.bench_markdown_splitter --pages 20 --page-kb 400
+
+--cleaned runs the pages through TextCleaner first, as URLLoader does
+before sections are parsed and split.
+"""
+import argparse
+import random
+from langchain_core.documents import Document
+from benchmarks.common import BenchConfig, best_of, print_table, synthetic_markdown
+from scratch_rag_application.text_splitter.markdown_splitter import MarkdownDocumentSplitter
+from scratch_rag_application.utils.text_cleaner import TextCleaner
+
+
+def large_pages(pages: int, page_kb: int, seed: int = 11):
+    rng = random.Random(seed)
+    documents = []
+    for i in range(pages):
+        parts, size = [], 0
+        while size < page_kb * 1024:
+            parts.append(synthetic_markdown(rng))
+            size += len(parts[-1])
+        documents.append(Document(page_content="\n\n".join(parts),
+                                  metadata={"source": f"https://docs.example.com/large-{i}"}))
+    return documents
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--page-kb", type=int, default=400)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cleaned", action="store_true")
+    args = parser.parse_args()
+
+    documents = large_pages(args.pages, args.page_kb)
+    if args.cleaned:
+        cleaner = TextCleaner()
+        documents = [Document(page_content=cleaner.clean(doc.page_content), metadata=doc.metadata)
+                     for doc in documents]
+    megabytes = sum(len(doc.page_content) for doc in documents) / 1e6
+    print(f"Splitting {args.pages} pages of ~{args.page_kb}KB ({megabytes:.1f}MB)\n")
+
+    config = BenchConfig().with_overrides(**{
+        f"text_splitter__{kind}__{key}": value
+        for kind in ("markdown", "recursive_character")
+        for key, value in (("chunk_size", args.chunk_size),
+                           ("chunk_overlap", args.chunk_overlap))})
+    splitters = [("markdown (linear scan)", MarkdownDocumentSplitter(config))]
+    try:
+        from langchain_text_splitters import MarkdownTextSplitter
+        from scratch_rag_application.text_splitter.recursive_splitter import RecursiveDocumentSplitter
+        splitters.append(("recursive_character", RecursiveDocumentSplitter(config)))
+        splitters.append(("langchain MarkdownTextSplitter", MarkdownTextSplitter(
+            chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap)))
+    except ImportError:
+        print("langchain_text_splitters is not installed; only the linear scan is timed\n")
+
+    rows = []
+    for name, splitter in splitters:
+        seconds, chunks = best_of(lambda: splitter.split_documents(documents), args.repeat)
+        oversized = sum(len(chunk.page_content) > args.chunk_size for chunk in chunks)
+        rows.append([name, len(chunks), oversized, f"{seconds:.2f}",
+                     f"{megabytes / seconds:.1f}", f"{len(chunks) / seconds:,.0f}"])
+    print_table(["splitter", "chunks", "oversized", "seconds", "MB/s", "chunks/s"], rows)
+
+
+if __name__ == "__main__":
+    main()
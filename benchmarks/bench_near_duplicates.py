@@ -0,0 +1,108 @@
+# benchmarks/bench_near_duplicates.py
+"""
+Near-duplicate chunk elimination on docs pages that share boilerplate.
+
+    python -m benchmarks.bench_near_duplicates --docs 100 --thresholds 0.7,0.85,0.95
+
+Every page gets a navigation block and one of a few callouts, each with a
+word or two changed per page, before it is split by the markdown
+splitter. For each threshold the table shows the chunks and characters of
+embedding input saved and the time taken. Recall is the share of chunk
+pairs whose exact shingle Jaccard similarity reaches the threshold that end
+up in the same group; false merges are dropped chunks whose exact
+similarity to their canonical chunk is below it. The exact comparison is
+quadratic and runs only up to --exact-max chunks.
+"""
+import argparse
+import logging
+import random
+from itertools import combinations
+from typing import List, Set
+from langchain_core.documents import Document
+from benchmarks.common import BenchConfig, best_of, print_table, sample_documents
+from scratch_rag_application.text_splitter.markdown_splitter import MarkdownDocumentSplitter
+from scratch_rag_application.text_splitter.near_duplicates import NearDuplicateFilter
+
+
+def _edited(rng: random.Random, words: List[str], edits: int) -> str:
+    words = list(words)
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = f"edit{rng.randrange(1000)}"
+    return " ".join(words)
+
+
+def with_boilerplate(documents: List[Document], seed: int = 3) -> List[Document]:
+    """Pages with a shared navigation block and a callout, lightly edited per page."""
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(3000)]
+    navigation = [rng.choice(vocabulary) for _ in range(150)]
+    callouts = [[rng.choice(vocabulary) for _ in range(120)] for _ in range(4)]
+    pages = []
+    for doc in documents:
+        navigation_text = _edited(rng, navigation, rng.randint(0, 2))
+        callout_text = _edited(rng, rng.choice(callouts), rng.randint(0, 2))
+        pages.append(Document(
+            page_content=(f"## Navigation\n{navigation_text}\n\n{doc.page_content}\n\n"
+                          f"## Note\n{callout_text}"),
+            metadata=doc.metadata))
+    return pages
+
+
+def _shingles(dedup: NearDuplicateFilter, text: str) -> Set[int]:
+    return set(dedup._shingles(text).tolist())
+
+
+def _jaccard(a: Set[int], b: Set[int]) -> float:
+    return len(a & b) / len(a | b)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100)
+    parser.add_argument("--thresholds", default="0.7,0.85,0.95")
+    parser.add_argument("--exact-max", type=int, default=3000,
+                        help="Most chunks compared pairwise for recall")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    config = BenchConfig()
+    documents, origin = sample_documents(config, args.docs)
+    chunks = MarkdownDocumentSplitter(config).split_documents(with_boilerplate(documents))
+    ids = [str(i) for i in range(len(chunks))]
+    total_chars = sum(len(chunk.page_content) for chunk in chunks)
+    print(f"{len(chunks)} chunks ({total_chars / 1e6:.1f}MB) from {origin} with boilerplate\n")
+
+    thresholds = [float(value) for value in args.thresholds.split(",")]
+    exact = len(chunks) <= args.exact_max
+    if exact:
+        # Shingles do not depend on the threshold
+        shingles = [_shingles(NearDuplicateFilter(config), chunk.page_content) for chunk in chunks]
+        similar = [(i, j, similarity) for i, j in combinations(range(len(chunks)), 2)
+                   if (similarity := _jaccard(shingles[i], shingles[j])) >= min(thresholds)]
+
+    rows = []
+    for threshold in thresholds:
+        dedup = NearDuplicateFilter(config.with_overrides(text_splitter__dedup__threshold=threshold))
+        seconds, (kept_ids, kept) = best_of(lambda: dedup.deduplicate(ids, chunks), args.repeat)
+        saved_chars = total_chars - sum(len(doc.page_content) for doc in kept)
+        row = [threshold, f"{dedup.bands}x{dedup.rows}", len(kept),
+               f"{1 - len(kept) / len(chunks):.1%}", f"{saved_chars / total_chars:.1%}",
+               f"{seconds:.2f}", f"{len(chunks) / seconds:,.0f}"]
+
+        if exact:
+            canonical = dedup.groups(dedup.signatures([chunk.page_content for chunk in chunks]))
+            pairs = [(i, j) for i, j, similarity in similar if similarity >= threshold]
+            found = sum(canonical[i] == canonical[j] for i, j in pairs)
+            false_merges = sum(_jaccard(shingles[i], shingles[root]) < threshold
+                               for i, root in enumerate(canonical) if root != i)
+            row += [f"{found / len(pairs):.1%}" if pairs else "-", false_merges]
+        rows.append(row)
+
+    headers = ["threshold", "bands", "kept", "chunks saved", "chars saved", "seconds", "chunks/s"]
+    print_table(headers + (["recall", "false merges"] if exact else []), rows)
+
+
+if __name__ == "__main__":
+    main()
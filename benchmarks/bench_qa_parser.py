@@ -0,0 +1,99 @@
+# benchmarks/bench_qa_parser.py
+"""
+Q&A section parsing on growing page sizes: the span parser against the old
+per-pattern DOTALL scan followed by string replacement.
+
+    python -m benchmarks.bench_qa_parser --sizes-kb 100,400,1600
+
+Exits with status 1 when the time per MB of the span parser on the largest
+page exceeds --max-growth times that of the smallest page, which catches a
+return to quadratic behaviour.
+"""
+import argparse
+import logging
+import random
+import re
+import sys
+from typing import List, Tuple
+from benchmarks.common import BenchConfig, best_of, print_table, synthetic_markdown
+from scratch_rag_application.content_parser.base_parser import remaining_text
+from scratch_rag_application.content_parser.qa_parser import QAContentParser
+from scratch_rag_application.utils.text_cleaner import TextCleaner
+
+
+def cleaned_page(size_kb: int, seed: int = 5) -> str:
+    """Generated markdown of about size_kb, cleaned as URLLoader cleans pages."""
+    rng = random.Random(seed)
+    parts, size = [], 0
+    while size < size_kb * 1024:
+        parts.append(synthetic_markdown(rng))
+        size += len(parts[-1])
+    return TextCleaner().clean("\n\n".join(parts))
+
+
+def span_parse(parser: QAContentParser, text: str) -> Tuple[int, int]:
+    sections = parser.parse(text)
+    return len(sections), len(remaining_text(text, sections).strip())
+
+
+def replace_parse(config: BenchConfig, text: str) -> Tuple[int, int]:
+    """The previous parser: one lazy DOTALL pattern per entry, then str.replace."""
+    patterns = []
+    for pattern in config.get("content_parser.qa.patterns", []):
+        if pattern["type"] == "explicit":
+            patterns.append(re.compile(
+                f"(?:{pattern['question_pattern']})\\s*(.+?)\\s*(?:{pattern['answer_pattern']})"
+                f"\\s*(.+?)(?=(?:{pattern['question_pattern']})|$)", re.DOTALL | re.IGNORECASE))
+        elif pattern["type"] == "header":
+            patterns.append(re.compile(
+                f"({pattern['header_pattern']})\\s*(.+?)(?=(?:{pattern['header_pattern']})|$)",
+                re.DOTALL))
+
+    sections: List[str] = []
+    for pattern in patterns:
+        for match in pattern.finditer(text):
+            question, answer = match.group(1).strip(), match.group(2).strip()
+            if question and answer:
+                sections.append(f"Q: {question}\nA: {answer}")
+    remaining = text
+    for section in sections:
+        remaining = remaining.replace(section, "")
+    return len(sections), len(remaining.strip())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes-kb", default="100,400,1600")
+    parser.add_argument("--replace-max-kb", type=int, default=1600,
+                        help="Largest page the old parser is timed on")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-growth", type=float, default=3.0)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    config = BenchConfig()
+    qa_parser = QAContentParser(config)
+    rows, per_mb = [], []
+    for size_kb in (int(size) for size in args.sizes_kb.split(",")):
+        text = cleaned_page(size_kb)
+        megabytes = len(text) / 1e6
+        seconds, (sections, remaining) = best_of(lambda: span_parse(qa_parser, text), args.repeat)
+        per_mb.append(seconds / megabytes)
+        rows.append([f"{size_kb}KB", "spans", sections, remaining, f"{seconds:.3f}",
+                     f"{megabytes / seconds:.1f}"])
+        if size_kb <= args.replace_max_kb:
+            seconds, (sections, remaining) = best_of(lambda: replace_parse(config, text), 1)
+            rows.append([f"{size_kb}KB", "replace", sections, remaining, f"{seconds:.3f}",
+                         f"{megabytes / seconds:.1f}"])
+    print_table(["page", "parser", "sections", "remaining chars", "seconds", "MB/s"], rows)
+
+    growth = per_mb[-1] / per_mb[0]
+    print(f"\nSpan parser time per MB, largest page vs smallest: {growth:.2f}x")
+    if growth > args.max_growth:
+        print(f"Regression: growth exceeds {args.max_growth:.1f}x")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# benchmarks/bench_search_memory.py
+"""
+Resident memory and query time of the BM25 search side: the compact
+corpus and postings against the previous Document list, text-to-Document
+mapping, rank_bm25 scorer and per-value metadata bitsets.
+
+    python -m benchmarks.bench_search_memory --docs 1000 --queries 200
+
+Memory is what tracemalloc sees retained after the index is built from
+the rows a store returns, with the rows themselves released. Peak is the
+most held while building, reading the rows in one get() or in pages of
+--page-size rows.
+"""
+import argparse
+import gc
+import logging
+import random
+import tracemalloc
+import uuid
+from typing import Any, Callable, Dict, List
+import numpy as np
+from langchain_core.documents import Document
+from benchmarks.common import BenchConfig, best_of, print_table, sample_documents
+from scratch_rag_application.search.bm25_search import BM25Index
+from scratch_rag_application.search.corpus_store import CorpusBuilder, CorpusStore
+from scratch_rag_application.utils.paging import iter_pages
+from scratch_rag_application.text_splitter.markdown_splitter import MarkdownDocumentSplitter
+
+
+class PreviousIndex:
+    """The structures BM25Index held before the compact corpus."""
+
+    def __init__(self, contents: List[str], metadatas: List[Dict[str, Any]]):
+        from rank_bm25 import BM25Okapi
+        documents = [Document(page_content=content, metadata=metadata)
+                     for content, metadata in zip(contents, metadatas)]
+        self.documents = tuple(doc.page_content for doc in documents)
+        self.doc_mapping = {doc.page_content: doc for doc in documents}
+        rows: Dict[str, Dict[Any, List[int]]] = {}
+        for row, metadata in enumerate(metadatas):
+            for field, value in metadata.items():
+                rows.setdefault(field, {}).setdefault(value, []).append(row)
+        self.bitsets = {}
+        for field, values in rows.items():
+            self.bitsets[field] = {}
+            for value, value_rows in values.items():
+                mask = np.zeros(len(metadatas), dtype=bool)
+                mask[value_rows] = True
+                self.bitsets[field][value] = np.packbits(mask)
+        self.scorer = BM25Okapi([doc.lower().split() for doc in self.documents])
+
+    def search(self, query: str, k: int) -> List[Document]:
+        scores = np.asarray(self.scorer.get_scores(query.lower().split()))
+        top = np.argsort(-scores, kind="stable")[:k]
+        return [self.doc_mapping[self.documents[row]] for row in top]
+
+
+def compact_search(index: BM25Index, query: str, k: int) -> List[Document]:
+    scores = index.scores(query.lower().split())
+    top = np.argsort(-scores, kind="stable")[:k]
+    return [index.corpus.document(row) for row in top]
+
+
+def store_rows(chunks: List[Document]):
+    """Texts and metadata as a store's get() returns them, in fresh objects."""
+    return ([chunk.page_content.encode("utf-8").decode("utf-8") for chunk in chunks],
+            [dict(chunk.metadata) for chunk in chunks])
+
+
+def retained(build: Callable[[], Any], chunks: List[Document]):
+    """Build an index from fresh store rows; return it and the bytes it keeps."""
+    contents, metadatas = store_rows(chunks)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    index = build(contents, metadatas)
+    del contents, metadatas
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return index, size
+
+
+class RowStore:
+    """A store's get(): every call returns fresh rows, as Chroma does."""
+
+    def __init__(self, chunks: List[Document]):
+        self.chunks = chunks
+
+    def get(self, limit=None, offset=None, include=None, where=None) -> Dict[str, Any]:
+        start = offset or 0
+        chunks = self.chunks[start:None if limit is None else start + limit]
+        contents, metadatas = store_rows(chunks)
+        return {"ids": [str(start + i) for i in range(len(chunks))],
+                "documents": contents, "metadatas": metadatas}
+
+
+def paged_index(store: RowStore, page_size: int) -> BM25Index:
+    builder = CorpusBuilder()
+    for page in iter_pages(store.get, page_size):
+        builder.add(page["documents"], page["metadatas"])
+    return BM25Index(builder.build())
+
+
+def single_get_index(store: RowStore) -> BM25Index:
+    results = store.get()
+    return BM25Index(CorpusStore(results["documents"], results["metadatas"]))
+
+
+def peak(build: Callable[[], Any]) -> int:
+    """Most bytes held while build() runs."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    build()
+    size = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    config = BenchConfig()
+    documents, origin = sample_documents(config, args.docs)
+    chunks = MarkdownDocumentSplitter(config).split_documents(documents)
+    # Metadata as URLLoader and the splitter set it, one section id per few chunks
+    section_ids = [str(uuid.UUID(int=random.Random(i // 3).getrandbits(128)))
+                   for i in range(len(chunks))]
+    for chunk, section_id in zip(chunks, section_ids):
+        chunk.metadata.update(content_type="general", section_id=section_id)
+    text_mb = sum(len(chunk.page_content.encode("utf-8")) for chunk in chunks) / 1e6
+    print(f"{len(chunks)} chunks ({text_mb:.1f}MB of text) from {origin}\n")
+
+    rng = random.Random(1)
+    words = [word for chunk in chunks[:200] for word in chunk.page_content.split()]
+    queries = [" ".join(rng.choice(words) for _ in range(3)) for _ in range(args.queries)]
+
+    rows = []
+    previous, size = retained(PreviousIndex, chunks)
+    seconds, _ = best_of(lambda: [previous.search(q, args.k) for q in queries], args.repeat)
+    rows.append(["previous", f"{size / 1e6:.1f}", f"{seconds / len(queries) * 1e3:.2f}"])
+    del previous
+
+    compact, size = retained(lambda c, m: BM25Index(CorpusStore(c, m)), chunks)
+    seconds, _ = best_of(lambda: [compact_search(compact, q, args.k) for q in queries], args.repeat)
+    rows.append(["compact", f"{size / 1e6:.1f}", f"{seconds / len(queries) * 1e3:.2f}"])
+    print_table(["index", "retained MB", "ms/query"], rows)
+    print(f"\nCorpus {compact.corpus.nbytes / 1e6:.1f}MB, postings "
+          f"{(compact.rows.nbytes + compact.frequencies.nbytes) / 1e6:.1f}MB")
+
+    store = RowStore(chunks)
+    rows = [["single get()", f"{peak(lambda: single_get_index(store)) / 1e6:.1f}"],
+            [f"pages of {args.page_size}",
+             f"{peak(lambda: paged_index(store, args.page_size)) / 1e6:.1f}"]]
+    print()
+    print_table(["build", "peak MB"], rows)
+
+
+if __name__ == "__main__":
+    main()
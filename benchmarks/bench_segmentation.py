@@ -0,0 +1,56 @@
+# benchmarks/bench_segmentation.py
+"""
+Segmentation cost as page size and the number of enabled parsers grow.
+
+    python -m benchmarks.bench_segmentation --sizes-kb 100,400,1600
+
+Each parser set is timed through SegmentationEngine, which parses the page
+into blocks once, and by running every parser's parse() over the whole
+page. Exits with status 1 when the engine's time per MB with all parsers
+on the largest page exceeds --max-growth times that on the smallest page.
+"""
+import argparse
+import logging
+import sys
+from benchmarks.bench_qa_parser import cleaned_page
+from benchmarks.common import BenchConfig, best_of, print_table
+from scratch_rag_application.content_parser.segmentation_engine import SegmentationEngine
+
+PARSER_SETS = [["qa"], ["qa", "table"], ["qa", "table", "code"]]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes-kb", default="100,400,1600")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-growth", type=float, default=3.0)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    config = BenchConfig()
+    rows, per_mb = [], []
+    for size_kb in (int(size) for size in args.sizes_kb.split(",")):
+        text = cleaned_page(size_kb)
+        megabytes = len(text) / 1e6
+        for parser_types in PARSER_SETS:
+            engine = SegmentationEngine(config, parser_types)
+            seconds, sections = best_of(lambda: engine.segment(text), args.repeat)
+            rescan, _ = best_of(
+                lambda: [p.parse(text) for p in engine.parsers], args.repeat)
+            rows.append([f"{size_kb}KB", "+".join(parser_types), len(sections),
+                         f"{seconds:.3f}", f"{megabytes / seconds:.1f}",
+                         f"{rescan:.3f}", f"{megabytes / rescan:.1f}"])
+        per_mb.append(seconds / megabytes)
+    print_table(["page", "parsers", "sections", "engine s", "engine MB/s",
+                 "per-parser s", "per-parser MB/s"], rows)
+
+    growth = per_mb[-1] / per_mb[0]
+    print(f"\nEngine time per MB with all parsers, largest page vs smallest: {growth:.2f}x")
+    if growth > args.max_growth:
+        print(f"Regression: growth exceeds {args.max_growth:.1f}x")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/bench_spacy_splitter.py
+"""
+Chunks/sec of the spaCy splitter modes.
+
+    python -m benchmarks.bench_spacy_splitter --docs 300 --n-process 4
+"""
+import argparse
+import os
+import time
+from benchmarks.common import BenchConfig, best_of, print_table, sample_documents
+from scratch_rag_application.text_splitter.spacy_splitter import SpacyDocumentSplitter
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=300)
+    parser.add_argument("--pipeline", default=None,
+                        help="Trained pipeline (defaults to text_splitter.spacy.pipeline)")
+    parser.add_argument("--n-process", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    config = BenchConfig()
+    pipeline = args.pipeline or config.get("text_splitter.spacy.pipeline", "en_core_web_sm")
+    documents, origin = sample_documents(config, args.docs)
+    characters = sum(len(doc.page_content) for doc in documents)
+    print(f"Splitting {origin}, {characters / 1e6:.1f}M characters\n")
+
+    variants = [
+        ("full SpacyTextSplitter", dict(lean=False, pipeline=pipeline)),
+        ("lean (senter or parser)", dict(lean=True, pipeline=pipeline, n_process=1)),
+        (f"lean, n_process={args.n_process}",
+         dict(lean=True, pipeline=pipeline, n_process=args.n_process)),
+        ("sentencizer", dict(lean=True, pipeline="sentencizer", n_process=1)),
+        (f"sentencizer, n_process={args.n_process}",
+         dict(lean=True, pipeline="sentencizer", n_process=args.n_process)),
+    ]
+
+    rows, baseline = [], None
+    for name, overrides in variants:
+        variant_config = config.with_overrides(**{
+            f"text_splitter__spacy__{key}": value for key, value in overrides.items()})
+        start = time.perf_counter()
+        splitter = SpacyDocumentSplitter(variant_config)
+        load_seconds = time.perf_counter() - start
+
+        seconds, chunks = best_of(lambda: splitter.split_documents(documents), args.repeat)
+        rate = len(chunks) / seconds
+        baseline = baseline or rate
+        rows.append([name, f"{load_seconds:.2f}", len(chunks), f"{seconds:.2f}",
+                     f"{rate:,.0f}", f"{rate / baseline:.1f}x"])
+
+    print_table(["mode", "load s", "chunks", "split s", "chunks/s", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# benchmarks/common.py
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import yaml
+from langchain_core.documents import Document
+from scratch_rag_application.config.config_handler import lookup
+from scratch_rag_application.loader.artifact_cache import ArtifactCache
+
+
+class BenchConfig:
+    """Dot-path view of ./config.yaml with per-benchmark overrides."""
+
+    def __init__(self, overrides: Optional[Dict[str, Any]] = None,
+                 path: str = "config.yaml"):
+        with open(path) as f:
+            self.config = yaml.safe_load(f)
+        self.overrides = dict(overrides or {})
+
+    def get(self, path: str, default: Any = None) -> Any:
+        if path in self.overrides:
+            return self.overrides[path]
+        try:
+            return lookup(self.config, path)
+        except (KeyError, TypeError):
+            return default
+
+    def with_overrides(self, **overrides: Any) -> "BenchConfig":
+        """Copy with dotted keys (written with __ for .) overridden."""
+        config = BenchConfig.__new__(BenchConfig)
+        config.config = self.config
+        config.overrides = {**self.overrides,
+                            **{key.replace("__", "."): value for key, value in overrides.items()}}
+        return config
+
+
+_WORDS = ("gateway control plane data plane node service route plugin consumer "
+          "certificate token request upstream latency region cluster proxy api "
+          "configure deploy secure monitor scale policy").split()
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(6, 18))]
+    return " ".join(words).capitalize() + "."
+
+
+def synthetic_markdown(rng: random.Random, sections: int = 12) -> str:
+    """Docs-like markdown with headings, Q&A, lists, code blocks and tables."""
+    parts = [f"# {_sentence(rng)[:-1]}"]
+    for i in range(sections):
+        kind = i % 4
+        if kind == 0:
+            parts.append(f"## {_sentence(rng)[:-1]}")
+            parts.append(" ".join(_sentence(rng) for _ in range(rng.randint(3, 8))))
+        elif kind == 1:
+            parts.append(f"## How do I {rng.choice(_WORDS)} the {rng.choice(_WORDS)}?")
+            parts.append(" ".join(_sentence(rng) for _ in range(rng.randint(2, 5))))
+            parts.append("Q: " + _sentence(rng)[:-1] + "?")
+            parts.append("A: " + " ".join(_sentence(rng) for _ in range(2)))
+        elif kind == 2:
+            parts.append(f"### {_sentence(rng)[:-1]}")
+            parts.append("```yaml\n" + "\n".join(
+                f"{rng.choice(_WORDS)}: {rng.randint(1, 999)}" for _ in range(6)) + "\n```")
+            parts.append("\n".join(f"- {_sentence(rng)}" for _ in range(4)))
+        else:
+            parts.append(f"### {_sentence(rng)[:-1]}")
+            rows = ["| Name | Value | Description |", "| --- | --- | --- |"]
+            rows += [f"| {rng.choice(_WORDS)} | {rng.randint(1, 99)} | {_sentence(rng)} |"
+                     for _ in range(5)]
+            parts.append("\n".join(rows))
+    return "\n\n".join(parts)
+
+
+def sample_documents(config: BenchConfig, count: int = 200,
+                     seed: int = 7) -> Tuple[List[Document], str]:
+    """
+    Parsed sections to benchmark with.
+
+    Uses the cached artifacts of the configured sources when they exist,
+    otherwise generates deterministic docs-like markdown.
+
+    Returns:
+        (documents, description of where they came from)
+    """
+    if config.get("pipeline.artifacts.enabled", False):
+        cache = ArtifactCache(config.get("pipeline.artifacts.directory", "./artifacts/parsed"),
+                              ArtifactCache.parser_fingerprint(config))
+        documents, missing = cache.load_many(
+            config.get("pipeline.sources.website.urls", []))
+        if documents and not missing:
+            repeated = (documents * (count // len(documents) + 1))[:max(count, len(documents))]
+            return repeated, f"{len(documents)} cached sections (repeated to {len(repeated)})"
+
+    rng = random.Random(seed)
+    documents = [
+        Document(page_content=synthetic_markdown(rng),
+                 metadata={"source": f"https://docs.example.com/page-{i}"})
+        for i in range(count)
+    ]
+    return documents, f"{count} synthetic pages"
+
+
+def best_of(func: Callable[[], Any], repeat: int = 3) -> Tuple[float, Any]:
+    """Fastest wall time of several runs, and the last result."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def print_table(headers: List[str], rows: List[List[Any]]) -> None:
+    """Print rows as an aligned plain-text table."""
+    cells = [[str(cell) for cell in row] for row in [headers] + rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    for n, row in enumerate(cells):
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+        if n == 0:
+            print("  ".join("-" * width for width in widths))
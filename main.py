@@ -1,33 +1,97 @@
 import asyncio
+import signal
 from scratch_rag_application.utils.logging_config import setup_logging
 from scratch_rag_application.utils.cli_handler import parse_arguments
 import logging
 from scratch_rag_application.loader.url_loader import URLLoader
+from scratch_rag_application.loader.ingest_journal import IngestJournal
+from scratch_rag_application.loader.reindex import delete_sources, reindex_sources
 from scratch_rag_application.text_splitter.splitter_factory import TextSplitterFactory
+from scratch_rag_application.text_splitter.near_duplicates import NearDuplicateFilter
 from scratch_rag_application.embedding.embedding_factory import EmbeddingFactory
+from scratch_rag_application.embedding.projection import ProjectedEmbedding
 from scratch_rag_application.config.config_handler import ConfigHandler
+from scratch_rag_application.utils.executor import configure_executor, run_blocking
 from scratch_rag_application.vector_store.vector_store_factory import VectorStoreFactory
+from scratch_rag_application.vector_store.versioned_chroma import VersionedChromaVectorStore
 from scratch_rag_application.visualization.visualization_factory import VisualizationFactory
-from typing import Optional
+from typing import Any, Dict, Optional
 
 # Initialize logging with explicit main module name
 setup_logging(main_module_name='scratch_rag_application.main')
 logger = logging.getLogger('scratch_rag_application.main')
 
 
-async def load_data(config: ConfigHandler) -> None:
-    """Load and process documents into the vector store."""
-    # Load documents
+async def fit_projection(embedder: Any, documents: list) -> None:
+    """
+    Fit a PCA projection on the chunks about to be embedded, unless fitted.
+
+    Args:
+        embedder: Embedder created for the ingest
+        documents: Chunks the projection is sampled from
+    """
+    if isinstance(embedder, ProjectedEmbedding) and documents:
+        await run_blocking(embedder.fit_texts, [doc.page_content for doc in documents])
+
+
+async def load_data(config: ConfigHandler, resume: bool = True,
+                    from_artifacts: bool = False) -> None:
+    """
+    Load and process documents into the vector store.
+
+    Completed fetch/parse, split and store batches are recorded in the
+    ingest journal; an interrupted run resumes from the last committed
+    batch instead of starting over.
+
+    Args:
+        config: Configuration handler instance
+        resume: Resume an interrupted run if the journal holds one
+        from_artifacts: Start from cached parsed sections instead of
+            fetching and parsing the sources again
+    """
+    journal = IngestJournal(config.get("ingest.journal_file", "./ingest_journal.jsonl"))
+    batch_size = config.get("ingest.batch_size", 256)
+    resuming = resume and journal.resumable
+    if resuming:
+        logger.info(
+            f"Resuming interrupted ingest: {len(journal.parsed)} sources parsed, "
+            f"{len(journal.split)} split, {len(journal.stored)} chunks stored")
+    else:
+        journal.reset()
+
+    # Load documents not parsed by an earlier attempt
     url_loader = URLLoader()
-    docs = await url_loader.load_urls()
-    logger.info(f"Documents retrieved: {len(docs)}")
+    missing = [url for url in url_loader.urls if url not in journal.parsed]
+    if missing:
+        docs = await url_loader.load_urls(missing, from_artifacts=from_artifacts)
+        logger.info(f"Documents retrieved: {len(docs)}")
+        by_source: Dict[str, list] = {}
+        for doc in docs:
+            by_source.setdefault(doc.metadata.get("source"), []).append(doc)
+        for source, source_docs in by_source.items():
+            journal.record_parsed(source, source_docs)
 
     # Split documents
     t_factory = TextSplitterFactory(config)
     splitter = t_factory.create_splitter()
-    split_docs = splitter.split_documents(docs)
+    unsplit = [source for source in journal.parsed if source not in journal.split]
+    # Each source is committed as soon as its chunks stream back
+    for source, chunks in zip(unsplit, splitter.iter_split_batches(
+            journal.parsed[source] for source in unsplit)):
+        journal.record_split(source, chunks)
+    ids = [doc_id for source_ids in journal.split_ids.values() for doc_id in source_ids]
+    split_docs = [doc for source_docs in journal.split.values() for doc in source_docs]
     logger.info(f"Documents split into {len(split_docs)} chunks")
 
+    # Drop near-duplicate chunks before they are embedded. The result only
+    # depends on the journaled chunks, so a resumed run keeps the same ones.
+    near_duplicates = NearDuplicateFilter(config)
+    if near_duplicates.enabled:
+        ids, split_docs = near_duplicates.deduplicate(ids, split_docs)
+    pending = [(doc_id, doc) for doc_id, doc in zip(ids, split_docs)
+               if doc_id not in journal.stored]
+    logger.info(f"{len(pending)} chunks still to be stored")
+
     # Create embeddings
     embedding_factory = EmbeddingFactory(config)
     embedder = embedding_factory.create_embedder()
@@ -36,19 +100,56 @@ async def load_data(config: ConfigHandler) -> None:
     vector_factory = VectorStoreFactory(config)
     vector_store = vector_factory.create_store(embedder)
 
-    # Clear existing data if reload flag is set
-    vector_store.delete()
+    if isinstance(vector_store, VersionedChromaVectorStore):
+        await fit_projection(embedder, split_docs)
+        # Build a new version alongside the live one and swap it in; the
+        # old version is retired and dropped by a later alias check or
+        # rebuild. The version is built in one go, so only fetch and split
+        # resume.
+        if await vector_store.arebuild(split_docs, ids=ids):
+            journal.record_complete()
+            logger.info("Successfully rebuilt vector store")
+        else:
+            logger.error("Rebuild failed; the previous version stays live")
+        return vector_store
 
-    # Add documents to vector store
-    if vector_store.add_documents(split_docs):
-        logger.info("Successfully added documents to vector store")
-    else:
-        logger.error("Failed to add documents to vector store")
+    if not journal.cleared:
+        # Clear existing data if reload flag is set
+        await vector_store.adelete()
+        if isinstance(embedder, ProjectedEmbedding):
+            # Refit the projection on the reloaded collection
+            embedder.reset()
+        journal.record_cleared()
+    elif pending:
+        # A batch may have reached the store before its journal line did
+        await vector_store.adelete([doc_id for doc_id, _ in pending])
+
+    # Fit the projection on a sample of the whole corpus before any batch
+    await fit_projection(embedder, split_docs)
+
+    # Add documents to vector store, committing each batch to the journal
+    for start in range(0, len(pending), batch_size):
+        batch_ids = [doc_id for doc_id, _ in pending[start:start + batch_size]]
+        batch_docs = [doc for _, doc in pending[start:start + batch_size]]
+        if not await vector_store.aadd_documents(batch_docs, batch_ids):
+            logger.error(
+                f"Failed to add documents to vector store after "
+                f"{len(journal.stored)} chunks; rerun --reload-data to resume")
+            return vector_store
+        journal.record_stored(batch_ids)
+        logger.info(f"Stored {min(start + batch_size, len(pending))}/{len(pending)} chunks")
+
+    journal.record_complete()
+    logger.info("Successfully added documents to vector store")
+    if hasattr(vector_store, 'quantization_report'):
+        vector_store.quantization_report()
 
     return vector_store
 
 
-async def query_store(query: str, config: ConfigHandler, viz_type: Optional[str] = None) -> None:
+async def query_store(query: str, config: ConfigHandler, viz_type: Optional[str] = None,
+                      k: Optional[int] = None,
+                      filter: Optional[Dict[str, Any]] = None) -> None:
     """
     Execute a query against the vector store using hybrid search and show results sorted by relevance.
 
@@ -56,6 +157,8 @@ async def query_store(query: str, config: ConfigHandler, viz_type: Optional[str]
         query: Search query string
         config: Configuration handler instance
         viz_type: Type of visualization to generate
+        k: Number of results to return, defaults to scoring.parameters.k
+        filter: Optional metadata where clause pushed down to the search
     """
     # Initialize embeddings and vector store
     embedding_factory = EmbeddingFactory(config)
@@ -64,7 +167,8 @@ async def query_store(query: str, config: ConfigHandler, viz_type: Optional[str]
     vector_store = vector_factory.create_store(embedder)
 
     # Use hybrid search through vector store interface
-    results = vector_store.similarity_search_with_score(query, k=4)
+    k = k or config.get("scoring.parameters.k", 4)
+    results = await vector_store.asimilarity_search_with_score(query, k=k, filter=filter)
 
     # Note: In hybrid search, higher scores indicate better matches
     # but for consistency with existing visualizations, we'll keep displaying
@@ -97,21 +201,58 @@ async def query_store(query: str, config: ConfigHandler, viz_type: Optional[str]
             logger.info(f"Generated {viz_type} visualization")
 
 
+async def run_daemon(config: ConfigHandler) -> None:
+    """Keep the index in sync with the configured sources until SIGINT/SIGTERM."""
+    from scratch_rag_application.loader.refresh_daemon import RefreshDaemon
+    # The model is loaded once; the store once, and again if the alias moves
+    embedder = EmbeddingFactory(config).create_embedder()
+    daemon = RefreshDaemon(
+        config, lambda: VectorStoreFactory(config).create_store(embedder))
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, daemon.stop)
+    try:
+        await daemon.run_forever()
+    finally:
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(sig)
+
+
 async def main():
     # Load configuration
     config = ConfigHandler("config.yaml")
+    configure_executor(config.get("executor.max_workers"))
 
     # Parse command line arguments
-    reload_data_flag, query, visualize, inspect = parse_arguments()
+    args = parse_arguments()
 
     try:
-        if reload_data_flag:
-            await load_data(config)
+        if args.reload_data:
+            await load_data(config, resume=not args.no_resume,
+                            from_artifacts=args.from_artifacts)
+
+        if args.delete_source or args.reindex_source:
+            vector_store = VectorStoreFactory(config).create_store(
+                EmbeddingFactory(config).create_embedder())
+            if args.delete_source:
+                deleted = await delete_sources(vector_store, args.delete_source)
+                logger.info(f"Deleted {deleted} chunks")
+            if args.reindex_source:
+                await reindex_sources(config, vector_store, args.reindex_source)
+
+        if args.daemon:
+            await run_daemon(config)
+
+        if args.query:
+            await query_store(args.query, config, args.visualize,
+                              k=args.k, filter=args.filter)
 
-        if query:
-            await query_store(query, config, visualize)
+        if args.serve:
+            from scratch_rag_application.server.query_server import serve
+            await serve(config, args.host, args.port, args.workers)
 
-        if inspect:
+        if args.inspect:
             from scratch_rag_application.utils.chroma_inspector import inspect_chroma
             inspect_chroma()
     except Exception as e:
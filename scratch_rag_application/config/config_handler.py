@@ -6,6 +6,16 @@ from functools import reduce
 import os
 
 
+def lookup(config: dict, path: str) -> Any:
+    """
+    Resolve a dot-notation path in a nested config dict.
+
+    Raises:
+        KeyError or TypeError: If the path does not exist
+    """
+    return reduce(lambda d, key: d[key], path.split('.'), config)
+
+
 class ConfigHandler:
     def __init__(self, yaml_file: Union[str, Path]):
         """
@@ -47,11 +57,7 @@ class ConfigHandler:
             Any: The value at the specified path, or default if not found
         """
         try:
-            return reduce(
-                lambda d, key: d[key],
-                path.split('.'),
-                self.config
-            )
+            return lookup(self.config, path)
         except (KeyError, TypeError):
             self.logger.error(f"KeyError or TypeError {path} ")
             return default
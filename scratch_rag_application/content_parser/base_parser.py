@@ -1,8 +1,9 @@
 # content_parser/base_parser.py
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import List, Dict, Any
+from dataclasses import dataclass, replace
+from typing import List, Dict, Any, Tuple
 import logging
+from .markdown_ast import Block
 
 
 @dataclass
@@ -11,11 +12,38 @@ class ParsedContent:
     content: str
     content_type: str
     section_id: str
+    # Character offsets of the section in the parsed text, end exclusive
+    start: int
+    end: int
+
+
+def remaining_text(content: str, sections: List[ParsedContent]) -> str:
+    """
+    Join the text between parsed sections in one pass.
+
+    Args:
+        content: Text the sections were parsed from
+        sections: Parsed sections; overlapping spans are allowed
+
+    Returns:
+        Text not covered by any section
+    """
+    gaps = []
+    position = 0
+    for section in sorted(sections, key=lambda section: section.start):
+        if section.start > position:
+            gaps.append(content[position:section.start])
+        position = max(position, section.end)
+    gaps.append(content[position:])
+    return "".join(gaps)
 
 
 class BaseContentParser(ABC):
     """Abstract base class for content parsers"""
 
+    # Kinds of markdown blocks SegmentationEngine hands to this parser
+    block_kinds: Tuple[str, ...] = ()
+
     def __init__(self, params: Dict[str, Any]):
         """
         Initialize parser with configuration parameters.
@@ -35,10 +63,28 @@ class BaseContentParser(ABC):
             content: Raw content to parse
 
         Returns:
-            List of ParsedContent objects
+            List of ParsedContent objects in order of their spans
         """
         pass
 
+    def parse_run(self, content: str, blocks: List[Block]) -> List[ParsedContent]:
+        """
+        Parse a run of consecutive blocks of the kinds this parser handles.
+
+        The default parses the text the run spans and shifts the section
+        spans back to offsets in content.
+
+        Args:
+            content: Full text the blocks were parsed from
+            blocks: Consecutive blocks, in document order
+
+        Returns:
+            List of ParsedContent objects with spans in content
+        """
+        start = blocks[0].start
+        return [replace(section, start=section.start + start, end=section.end + start)
+                for section in self.parse(content[start:blocks[-1].end])]
+
     def _validate_content(self, content: str) -> bool:
         """
         Validate content is parseable.
@@ -0,0 +1,58 @@
+# content_parser/code_parser.py
+import re
+import uuid
+from typing import List
+from .base_parser import BaseContentParser, ParsedContent
+from .markdown_ast import Block, parse_blocks
+
+_FENCE = re.compile(r"`{3,}|~{3,}")
+
+
+class CodeContentParser(BaseContentParser):
+    """Parser for extracting fenced code blocks with their language."""
+
+    block_kinds = ("code",)
+
+    def parse(self, content: str) -> List[ParsedContent]:
+        """
+        Parse content to extract fenced code blocks.
+
+        Args:
+            content: Content to parse
+
+        Returns:
+            List of ParsedContent objects containing code blocks
+        """
+        if not self._validate_content(content):
+            return []
+        return self.parse_run(content, [block for block in parse_blocks(content)
+                                        if block.kind == "code"])
+
+    def parse_run(self, content: str, blocks: List[Block]) -> List[ParsedContent]:
+        try:
+            parsed_sections = []
+            for block in blocks:
+                fence = _FENCE.match(content, block.start).group(0)
+                body_start = block.start + len(fence) + len(block.info)
+                body_end = block.end
+                # An unclosed block runs to the end of the text
+                if block.end - len(fence) >= body_start and \
+                        content.startswith(fence, block.end - len(fence)):
+                    body_end -= len(fence)
+                body = content[body_start:body_end].strip()
+                if not body:
+                    continue
+                parsed_sections.append(
+                    ParsedContent(
+                        content=f"{fence}{block.info}\n{body}\n{fence}",
+                        content_type="code",
+                        section_id=str(uuid.uuid4()),
+                        start=block.start,
+                        end=block.end
+                    )
+                )
+            return parsed_sections
+
+        except Exception as e:
+            self.logger.error(f"Error parsing code blocks: {str(e)}")
+            return []
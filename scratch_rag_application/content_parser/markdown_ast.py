@@ -0,0 +1,153 @@
+# content_parser/markdown_ast.py
+import re
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+# Openings of blocks that may start mid-line: TextCleaner folds every
+# newline inside code and tables into a space, so a fence or a table often
+# follows a heading on the same line. Branches written as literals let the
+# regex engine skip ahead on their first characters.
+_OPENING = re.compile(r"```+|~~~+|\|")
+# Cell text; TextCleaner breaks the line after every ". " followed by a
+# capital, including inside table cells, so such breaks stay in the cell
+_CELL = r"[^|\n]*(?:(?<=\.)\n(?=[A-Z])[^|\n]*)*"
+# A run of pipe-delimited cells, over one line or several
+_PIPE_RUN = re.compile(rf"\|(?:{_CELL}\|)+(?:[ \t]*\n[ \t]*\|(?:{_CELL}\|)+)*")
+_PIPE = re.compile(r"\|")
+_DELIMITER_CELL = re.compile(r"[ \t]*:?-{3,}:?[ \t]*")
+_FENCE_INFO = re.compile(r"[\w+#.-]*")
+_HEADING_LINE = re.compile(r"[ ]{0,3}(#{1,6})[ \t]")
+_NEXT_HEADING = re.compile(r"\n[ ]{0,3}(#{1,6})[ \t]")
+
+# Widest table recognised; bounds the search for the header row
+_MAX_COLUMNS = 64
+
+
+class Block(NamedTuple):
+    """A top-level markdown block, as a span of the parsed text."""
+    kind: str  # "heading", "paragraph", "code" or "table"
+    start: int
+    end: int
+    level: int = 0  # heading level
+    info: str = ""  # code block language
+
+
+def _table(run: str, offset: int) -> Optional[Tuple[List[List[str]], int, int]]:
+    """
+    Rows and span of the first table in a pipe run.
+
+    A table is found by its delimiter row: a run of delimiter cells, a row
+    break before it and as many header cells before that. Rows are told
+    apart by that column count, so tables whose newlines were folded into
+    spaces split the same way as line-based ones, and pipes in prose
+    earlier on a folded line do not hide the table. The delimiter row is
+    left out of the rows.
+
+    Returns:
+        (rows of raw cells, start and end of the table in the text), or
+        None if the run holds no header and delimiter row
+    """
+    pipes = [match.start() for match in _PIPE.finditer(run)]
+    cells = [run[a + 1:b] for a, b in zip(pipes, pipes[1:])]
+
+    first = 0
+    while first < len(cells):
+        if not _DELIMITER_CELL.fullmatch(cells[first]):
+            first += 1
+            continue
+        # Index of the cell after the delimiter run: the next row break
+        position = first
+        while position < len(cells) and _DELIMITER_CELL.fullmatch(cells[position]):
+            position += 1
+        columns = position - first
+        header = first - 1 - columns
+        if header < 0 or columns > _MAX_COLUMNS or cells[first - 1].strip():
+            first = position
+            continue
+        rows = [cells[header:first - 1]]
+        # pipes[position] closes the last row taken
+        while position + columns < len(cells) and not cells[position].strip():
+            rows.append(cells[position + 1:position + 1 + columns])
+            position += columns + 1
+        return rows, offset + pipes[header], offset + pipes[position] + 1
+    return None
+
+
+def table_rows(text: str, block: Block) -> List[List[str]]:
+    """Stripped cells of each row of a table block, delimiter row excluded."""
+    table = _table(text[block.start:block.end], block.start)
+    rows = table[0] if table else []
+    # Sentence breaks the cleaner put inside a cell would split its row
+    return [[cell.strip().replace("\n", " ") for cell in row] for row in rows]
+
+
+def _code_end(text: str, opening: re.Match) -> int:
+    """End of a fenced block; the closing fence repeats the opening one."""
+    closing = text.find(opening.group(0), opening.end())
+    return len(text) if closing == -1 else closing + len(opening.group(0))
+
+
+def _headings(text: str, start: int, end: int) -> Iterator[re.Match]:
+    """Heading lines starting within text[start:end]."""
+    if start == 0 or text[start - 1] == "\n":
+        match = _HEADING_LINE.match(text, start, end)
+        if match:
+            yield match
+    for match in _NEXT_HEADING.finditer(text, start, end):
+        yield match
+
+
+def _text_blocks(text: str, start: int, end: int) -> Iterator[Block]:
+    """Heading and paragraph blocks of text[start:end], which holds no code or table."""
+    position = start
+    for match in _headings(text, start, end):
+        line_start = match.start() if text[match.start()] != "\n" else match.start() + 1
+        if text[position:line_start].strip():
+            yield Block("paragraph", position, line_start)
+        line_end = text.find("\n", match.end(), end)
+        line_end = end if line_end == -1 else line_end
+        yield Block("heading", line_start, line_end, level=len(match.group(1)))
+        position = line_end
+    if text[position:end].strip():
+        yield Block("paragraph", position, end)
+
+
+def parse_blocks(text: str) -> List[Block]:
+    """
+    Parse markdown into its top-level blocks in linear time.
+
+    Fenced code and pipe tables are found first, wherever they start. The
+    text between them is split into heading lines and paragraphs, where a
+    paragraph is everything up to the next heading or block. Stretches of
+    whitespace alone form no block.
+
+    Args:
+        text: Markdown, cleaned or not
+
+    Returns:
+        Blocks in document order
+    """
+    blocks: List[Block] = []
+    text_start = position = 0
+    while True:
+        opening = _OPENING.search(text, position)
+        if opening is None:
+            break
+
+        if opening.group(0) == "|":
+            run = _PIPE_RUN.match(text, opening.start())
+            table = _table(run.group(0), run.start()) if run else None
+            if table is None:
+                # Pipes in prose; the run holds no table anywhere
+                position = run.end() if run else opening.end()
+                continue
+            block = Block("table", table[1], table[2])
+        else:
+            info = _FENCE_INFO.match(text, opening.end()).group(0)
+            block = Block("code", opening.start(), _code_end(text, opening), info=info)
+
+        blocks.extend(_text_blocks(text, text_start, block.start))
+        blocks.append(block)
+        text_start = position = block.end
+
+    blocks.extend(_text_blocks(text, text_start, len(text)))
+    return blocks
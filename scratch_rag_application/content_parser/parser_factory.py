@@ -2,13 +2,17 @@
 from typing import Dict, Type
 from .base_parser import BaseContentParser
 from .qa_parser import QAContentParser
+from .table_parser import TableContentParser
+from .code_parser import CodeContentParser
 
 
 class ContentParserFactory:
     """Factory for creating content parser instances."""
 
     _parsers: Dict[str, Type[BaseContentParser]] = {
-        "qa": QAContentParser
+        "qa": QAContentParser,
+        "table": TableContentParser,
+        "code": CodeContentParser
     }
 
     def __init__(self, config: dict):
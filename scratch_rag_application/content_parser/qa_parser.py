@@ -1,43 +1,109 @@
 # content_parser/qa_parser.py
+import heapq
 import re
 import uuid
-from typing import List, Pattern
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple
 from .base_parser import BaseContentParser, ParsedContent
 
+# Any markdown heading ends the Q&A section before it. The match stops at
+# the "#", so a question header on the same line starts right after it.
+_HEADING = re.compile(r"\n[ \t]*(?=#{1,6}[ \t])")
+# A question may not run across a paragraph break
+_BLANK_LINE = re.compile(r"\n[ \t]*\n")
+
 
 class QAContentParser(BaseContentParser):
-    """Parser for identifying and extracting Q&A content."""
+    """
+    Parser for identifying and extracting Q&A content.
+
+    Each question marker or question header opens a section that runs to
+    the next marker or heading; an explicit section also needs an answer
+    marker inside it. Every pattern is scanned once and the markers are
+    merged in page order, so a page is parsed in linear time.
+    """
+
+    block_kinds = ("heading", "paragraph")
 
     def __init__(self, params: dict):
         super().__init__(params)
         self.patterns = self._compile_patterns()
 
-    def _compile_patterns(self) -> List[Pattern]:
-        """Compile regex patterns from configuration."""
+    def _compile_patterns(self) -> Dict[str, Tuple[Pattern, Optional[Pattern]]]:
+        """
+        Compile regex patterns from configuration.
+
+        Returns:
+            Mapping of pattern name to (opening pattern, answer pattern),
+            where header patterns have no answer pattern
+        """
         try:
             qa_config = self.params.get("content_parser", {}).get("qa", {})
             patterns = qa_config.get("patterns", [])
 
-            compiled_patterns = []
-            for pattern in patterns:
+            compiled_patterns = {}
+            for i, pattern in enumerate(patterns):
                 if pattern["type"] == "explicit":
-                    # Pattern for explicit Q&A format
-                    pattern_str = f"(?:{pattern['question_pattern']})\\s*(.+?)\\s*(?:{
-                        pattern['answer_pattern']})\\s*(.+?)(?=(?:{pattern['question_pattern']})|$)"
-                    compiled_patterns.append(re.compile(
-                        pattern_str, re.DOTALL | re.IGNORECASE))
+                    compiled_patterns[f"explicit{i}"] = (
+                        re.compile(f"(?:{pattern['question_pattern']})", re.IGNORECASE),
+                        re.compile(f"(?:{pattern['answer_pattern']})", re.IGNORECASE))
                 elif pattern["type"] == "header":
-                    # Pattern for header-based Q&A format
-                    pattern_str = f"({
-                        pattern['header_pattern']})\\s*(.+?)(?=(?:{pattern['header_pattern']})|$)"
-                    compiled_patterns.append(
-                        re.compile(pattern_str, re.DOTALL))
+                    # Without DOTALL a header question stays on its line
+                    compiled_patterns[f"header{i}"] = (
+                        re.compile(pattern["header_pattern"]), None)
 
             return compiled_patterns
 
         except Exception as e:
             self.logger.error(f"Error compiling patterns: {str(e)}")
-            return []
+            return {}
+
+    @staticmethod
+    def _starts_word(content: str, position: int) -> bool:
+        """Whether position is not inside a word, so "faq:" is no marker."""
+        return position == 0 or not (content[position - 1].isalnum()
+                                     or content[position - 1] == "_")
+
+    def _scan(self, content: str, name: str) -> Iterator[Tuple[int, str, re.Match]]:
+        """Yield (start, name, match) for each opening marker of one pattern."""
+        opening, answer = self.patterns[name]
+        for match in opening.finditer(content):
+            if answer is None or self._starts_word(content, match.start()):
+                yield match.start(), name, match
+
+    def _markers(self, content: str) -> Iterator[Tuple[int, str, re.Match]]:
+        """Yield (start, pattern name, match) for every marker in page order."""
+        headings = ((match.start(), "heading", match) for match in _HEADING.finditer(content))
+        # The merge is stable, so a heading sorts before a header at its offset
+        return heapq.merge(headings, *(self._scan(content, name) for name in self.patterns),
+                           key=lambda marker: marker[0])
+
+    def _qa_section(self, content: str, name: str, opening: re.Match,
+                    end: int) -> Optional[ParsedContent]:
+        """The section from an opening marker to end, if it holds a Q&A."""
+        answer_pattern = self.patterns[name][1]
+        if answer_pattern is None:
+            question = opening.group(0).strip()
+            answer = content[opening.end():end].strip()
+        else:
+            position = opening.end()
+            answer_marker = answer_pattern.search(content, position, end)
+            while answer_marker and not self._starts_word(content, answer_marker.start()):
+                answer_marker = answer_pattern.search(content, answer_marker.start() + 1, end)
+            if answer_marker is None or \
+                    _BLANK_LINE.search(content, position, answer_marker.start()):
+                return None
+            question = content[position:answer_marker.start()].strip()
+            answer = content[answer_marker.end():end].strip()
+
+        if not (question and answer):
+            return None
+        return ParsedContent(
+            content=f"Q: {question}\nA: {answer}",
+            content_type="qa",
+            section_id=str(uuid.uuid4()),
+            start=opening.start(),
+            end=end
+        )
 
     def parse(self, content: str) -> List[ParsedContent]:
         """
@@ -54,23 +120,20 @@ class QAContentParser(BaseContentParser):
 
         try:
             parsed_sections = []
+            opening, name, consumed = None, None, 0
+
+            for start, kind, match in self._markers(content):
+                if start < consumed:
+                    # Inside the previous marker, e.g. "Q:" in a header
+                    continue
+                if opening is not None:
+                    parsed_sections.append(self._qa_section(content, name, opening, start))
+                opening, name = (None, None) if kind == "heading" else (match, kind)
+                consumed = match.end()
+            if opening is not None:
+                parsed_sections.append(self._qa_section(content, name, opening, len(content)))
 
-            for pattern in self.patterns:
-                matches = pattern.finditer(content)
-                for match in matches:
-                    question = match.group(1).strip()
-                    answer = match.group(2).strip()
-
-                    if question and answer:
-                        parsed_sections.append(
-                            ParsedContent(
-                                content=f"Q: {question}\nA: {answer}",
-                                content_type="qa",
-                                section_id=str(uuid.uuid4())
-                            )
-                        )
-
-            return parsed_sections
+            return [section for section in parsed_sections if section is not None]
 
         except Exception as e:
             self.logger.error(f"Error parsing content: {str(e)}")
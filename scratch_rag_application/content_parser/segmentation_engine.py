@@ -0,0 +1,64 @@
+# content_parser/segmentation_engine.py
+import logging
+from typing import Any, Dict, List
+from .base_parser import BaseContentParser, ParsedContent
+from .markdown_ast import parse_blocks
+from .parser_factory import ContentParserFactory
+
+
+class SegmentationEngine:
+    """
+    Splits a page into typed sections with one markdown parse.
+
+    The page is parsed into blocks once. Every block goes to the first
+    enabled parser that handles its kind, and consecutive blocks for the
+    same parser go as one run, so each character is read by at most one
+    parser however many are enabled. Blocks no parser handles are left for
+    the remaining text.
+    """
+
+    def __init__(self, params: Dict[str, Any], parser_types: List[str]):
+        """
+        Initialize the engine with the parsers to dispatch to.
+
+        Args:
+            params: Configuration parameters for the parsers
+            parser_types: Registered parser types, in order of precedence
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        factory = ContentParserFactory(params)
+        self.parsers = [factory.create_parser(parser_type) for parser_type in parser_types]
+
+        self.owners: Dict[str, BaseContentParser] = {}
+        for parser in self.parsers:
+            for kind in parser.block_kinds:
+                self.owners.setdefault(kind, parser)
+
+    def segment(self, content: str) -> List[ParsedContent]:
+        """
+        Parse content into sections with the enabled parsers.
+
+        Args:
+            content: Cleaned markdown of one page
+
+        Returns:
+            Non-overlapping sections in document order
+        """
+        if not content:
+            return []
+
+        sections: List[ParsedContent] = []
+        run, owner = [], None
+        for block in parse_blocks(content):
+            parser = self.owners.get(block.kind)
+            if parser is not owner:
+                if run:
+                    sections.extend(owner.parse_run(content, run))
+                run, owner = [], parser
+            if parser is not None:
+                run.append(block)
+        if run:
+            sections.extend(owner.parse_run(content, run))
+
+        self.logger.debug(f"Segmented {len(content)} characters into {len(sections)} sections")
+        return sections
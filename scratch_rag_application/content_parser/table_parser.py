@@ -0,0 +1,51 @@
+# content_parser/table_parser.py
+import uuid
+from typing import List
+from .base_parser import BaseContentParser, ParsedContent
+from .markdown_ast import Block, parse_blocks, table_rows
+
+
+class TableContentParser(BaseContentParser):
+    """Parser for extracting markdown tables, written back one row per line."""
+
+    block_kinds = ("table",)
+
+    def parse(self, content: str) -> List[ParsedContent]:
+        """
+        Parse content to extract tables.
+
+        Args:
+            content: Content to parse
+
+        Returns:
+            List of ParsedContent objects containing tables
+        """
+        if not self._validate_content(content):
+            return []
+        return self.parse_run(content, [block for block in parse_blocks(content)
+                                        if block.kind == "table"])
+
+    def parse_run(self, content: str, blocks: List[Block]) -> List[ParsedContent]:
+        try:
+            parsed_sections = []
+            for block in blocks:
+                rows = table_rows(content, block)
+                if not rows:
+                    continue
+                # Cleaned text folds a table onto one line; restore its rows
+                lines = ["| " + " | ".join(row) + " |" for row in rows]
+                lines.insert(1, "|" + "---|" * len(rows[0]))
+                parsed_sections.append(
+                    ParsedContent(
+                        content="\n".join(lines),
+                        content_type="table",
+                        section_id=str(uuid.uuid4()),
+                        start=block.start,
+                        end=block.end
+                    )
+                )
+            return parsed_sections
+
+        except Exception as e:
+            self.logger.error(f"Error parsing tables: {str(e)}")
+            return []
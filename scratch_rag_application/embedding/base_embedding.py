@@ -3,6 +3,7 @@ from abc import ABC, abstractmethod
 from typing import List, Dict, Any
 from langchain_core.embeddings import Embeddings
 import logging
+from ..utils.executor import run_blocking
 
 
 class BaseEmbedding(ABC):
@@ -37,3 +38,26 @@ class BaseEmbedding(ABC):
         except Exception as e:
             self.logger.error(f"Error embedding query: {str(e)}")
             return []
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed several queries; subclasses override this to use one forward pass."""
+        if not self._embedder:
+            self.logger.error("Embedder not initialized")
+            return []
+        try:
+            return [self._embedder.embed_query(text) for text in texts]
+        except Exception as e:
+            self.logger.error(f"Error embedding queries: {str(e)}")
+            return []
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents on the shared executor."""
+        return await run_blocking(self.embed_documents, texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Embed a query on the shared executor."""
+        return await run_blocking(self.embed_query, text)
+
+    async def aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed several queries on the shared executor."""
+        return await run_blocking(self.embed_queries, texts)
@@ -0,0 +1,151 @@
+# embeddings/batching.py
+from concurrent.futures import Future
+import asyncio
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.embeddings import Embeddings
+from .base_embedding import BaseEmbedding
+from ..utils.metrics import Histogram
+
+# (text, future, enqueue time)
+_Request = Tuple[str, Future, float]
+
+
+class QueryEmbeddingError(RuntimeError):
+    """Raised to every caller of a query batch the embedder failed on."""
+
+
+class BatchingEmbedding(BaseEmbedding):
+    """
+    Coalesces concurrent embed_query calls into batched forward passes.
+
+    Callers block while a collector thread gathers queries that arrive within
+    a short window (or until the batch is full), embeds them in one call to
+    embed_queries and hands each caller its own vector. If the batch fails,
+    each caller gets a QueryEmbeddingError instead.
+    """
+
+    def __init__(self, params: Dict[str, Any], base: BaseEmbedding):
+        self.base = base
+        super().__init__(params)
+        self.window = params.get("server.batching.window_ms", 3) / 1000.0
+        self.max_batch_size = params.get("server.batching.max_batch_size", 32)
+
+        self.batch_sizes = Histogram(
+            "embedding_batch_size", [1, 2, 4, 8, 16, 32, 64, 128])
+        self.wait_times_ms = Histogram(
+            "embedding_queue_wait_ms", [0.5, 1, 2, 5, 10, 20, 50, 100, 250])
+
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+    def _create_embedder(self) -> Embeddings:
+        return self.base
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="query-batcher", daemon=True)
+                self._worker.start()
+
+    def _collect(self, first: _Request) -> Tuple[List[_Request], bool]:
+        """Gather requests until the window closes or the batch is full."""
+        batch = [first]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 \
+                    else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                return batch, True
+            batch.append(request)
+        return batch, False
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, stopping = self._collect(first)
+            # Drop callers that gave up while queued; the rest can no longer
+            # be cancelled, so setting their results cannot fail
+            batch = [request for request in batch
+                     if request[1].set_running_or_notify_cancel()]
+            if not batch:
+                if stopping:
+                    return
+                continue
+
+            started = time.perf_counter()
+            self.batch_sizes.observe(len(batch))
+            for _, _, enqueued in batch:
+                self.wait_times_ms.observe((started - enqueued) * 1000)
+
+            try:
+                vectors = self.base.embed_queries([text for text, _, _ in batch])
+                if len(vectors) != len(batch):
+                    raise RuntimeError("Embedder returned no vectors for batch")
+                for (_, future, _), vector in zip(batch, vectors):
+                    future.set_result(vector)
+            except Exception as e:
+                self.logger.error(f"Error embedding query batch: {str(e)}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        error = QueryEmbeddingError(f"Query embedding failed: {str(e)}")
+                        error.__cause__ = e
+                        future.set_exception(error)
+
+            if stopping:
+                return
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.base.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((text, future, time.perf_counter()))
+        return future.result()
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Queue a query and await its vector without occupying an executor thread."""
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((text, future, time.perf_counter()))
+        return await asyncio.wrap_future(future)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        return self.base.embed_queries(texts)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Batch size and queue wait histograms."""
+        return {
+            "window_ms": self.window * 1000,
+            "max_batch_size": self.max_batch_size,
+            "batch_size": self.batch_sizes.snapshot(),
+            "wait_ms": self.wait_times_ms.snapshot()
+        }
+
+    def after_fork(self) -> None:
+        """Reset the queue, collector thread and histograms in a forked worker."""
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self.batch_sizes = Histogram(self.batch_sizes.name, self.batch_sizes.buckets)
+        self.wait_times_ms = Histogram(self.wait_times_ms.name, self.wait_times_ms.buckets)
+
+    def close(self) -> None:
+        """Stop the collector thread after it drains queued requests."""
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
@@ -0,0 +1,47 @@
+# embeddings/deferred.py
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from langchain_core.embeddings import Embeddings
+from .base_embedding import BaseEmbedding
+
+
+class DeferredEmbedding(BaseEmbedding):
+    """
+    Embedder whose model is created on first use instead of at construction.
+
+    The pre-fork server builds its store and search indexes with one, so
+    torch (or onnxruntime) never starts its thread pools in the parent:
+    those do not survive fork. Each worker loads its own model after
+    forking, which costs one copy of the weights per worker.
+    """
+
+    def __init__(self, params: Dict[str, Any], create: Callable[[], BaseEmbedding]):
+        self._create = create
+        self._base: Optional[BaseEmbedding] = None
+        self._load_lock = threading.Lock()
+        super().__init__(params)
+
+    def _create_embedder(self) -> Optional[Embeddings]:
+        return None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._base is not None
+
+    def load(self) -> BaseEmbedding:
+        """Create the wrapped embedder, and so load its model, if not done yet."""
+        if self._base is None:
+            with self._load_lock:
+                if self._base is None:
+                    self.logger.info("Loading embedding model")
+                    self._base = self._create()
+        return self._base
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.load().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.load().embed_query(text)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        return self.load().embed_queries(texts)
@@ -3,6 +3,7 @@ from typing import Dict, Type
 from .base_embedding import BaseEmbedding
 from .huggingface import HuggingFaceEmbedding
 from .fastembed import FastEmbedEmbedding
+from .projection import ProjectedEmbedding
 
 
 class EmbeddingFactory:
@@ -21,4 +22,9 @@ class EmbeddingFactory:
         if not embedder_class:
             raise ValueError(f"Unsupported embedder type: {embedder_type}")
 
-        return embedder_class(self.config)
+        embedder = embedder_class(self.config)
+
+        projection_type = self.config.get("embeddings.projection.type", "none")
+        if projection_type and projection_type != "none":
+            return ProjectedEmbedding(self.config, embedder)
+        return embedder
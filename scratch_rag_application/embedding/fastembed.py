@@ -1,4 +1,5 @@
 # embeddings/fastembed.py
+from typing import List
 from langchain_community.embeddings import FastEmbedEmbeddings
 from .base_embedding import BaseEmbedding
 
@@ -26,3 +27,14 @@ class FastEmbedEmbedding(BaseEmbedding):
             self.logger.error(
                 f"Error initializing FastEmbed embeddings: {str(e)}")
             return None
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of queries with FastEmbed's batched query_embed."""
+        model = getattr(self._embedder, "_model", None)
+        if model is None:
+            return super().embed_queries(texts)
+        try:
+            return [vector.tolist() for vector in model.query_embed(texts)]
+        except Exception as e:
+            self.logger.error(f"Error embedding queries: {str(e)}")
+            return []
@@ -1,13 +1,16 @@
-from langchain_huggingface import HuggingFaceEmbeddings
+from typing import List
 from .base_embedding import BaseEmbedding
+from .model_registry import SharedSentenceTransformerEmbeddings
 
 
 class HuggingFaceEmbedding(BaseEmbedding):
-    """Implementation using LangChain's HuggingFaceEmbeddings."""
+    """Implementation using the shared sentence-transformers model registry."""
 
-    def _create_embedder(self) -> HuggingFaceEmbeddings:
+    def _create_embedder(self) -> SharedSentenceTransformerEmbeddings:
         try:
-            return HuggingFaceEmbeddings(
+            # The registry hands out one model per name, so a splitter using
+            # the same model does not load a second copy
+            return SharedSentenceTransformerEmbeddings(
                 model_name=self.params.get(
                     "embeddings.huggingface.model_name",
                     "sentence-transformers/all-mpnet-base-v2"
@@ -25,3 +28,14 @@ class HuggingFaceEmbedding(BaseEmbedding):
             self.logger.error(
                 f"Error initializing HuggingFace embeddings: {str(e)}")
             return None
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of queries in a single encode call."""
+        # Queries only differ from documents when query_encode_kwargs is set
+        if self._embedder and not getattr(self._embedder, "query_encode_kwargs", None):
+            try:
+                return self._embedder.embed_documents(texts)
+            except Exception as e:
+                self.logger.error(f"Error embedding queries: {str(e)}")
+                return []
+        return super().embed_queries(texts)
@@ -0,0 +1,143 @@
+# embedding/model_registry.py
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+# Loaded once per process and shared by the splitters and embedders
+_models: Dict[Tuple[str, str], Any] = {}
+_tokenizers: Dict[str, Any] = {}
+_max_lengths: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def resolve_model_name(model_name: str) -> str:
+    """Expand short sentence-transformers names the way SentenceTransformer does."""
+    if "/" in model_name or os.path.exists(model_name):
+        return model_name
+    return f"sentence-transformers/{model_name}"
+
+
+def get_sentence_transformer(model_name: str, **model_kwargs: Any) -> Any:
+    """
+    Return the SentenceTransformer for a model, loading it on first use.
+
+    Args:
+        model_name: Model name or path
+        **model_kwargs: SentenceTransformer arguments such as device
+
+    Returns:
+        The shared SentenceTransformer instance
+    """
+    # Imported here so tokenizer-only callers never import torch
+    from sentence_transformers import SentenceTransformer
+
+    model_name = resolve_model_name(model_name)
+    key = (model_name, json.dumps(model_kwargs, sort_keys=True, default=str))
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            logger.info(f"Loading model {model_name}")
+            model = SentenceTransformer(model_name, **model_kwargs)
+            _models[key] = model
+            _max_lengths[model_name] = model.max_seq_length
+        return model
+
+
+def loaded_model(model_name: str) -> Optional[Any]:
+    """Any already loaded SentenceTransformer for a model name, or None."""
+    model_name = resolve_model_name(model_name)
+    with _lock:
+        for (name, _), model in _models.items():
+            if name == model_name:
+                return model
+    return None
+
+
+def get_tokenizer(model_name: str) -> Any:
+    """
+    Return the fast tokenizer of a model without loading its weights.
+
+    A tokenizer belonging to an already loaded model is reused.
+
+    Args:
+        model_name: Model name or path
+    """
+    model = loaded_model(model_name)
+    if model is not None:
+        return model.tokenizer
+
+    from transformers import AutoTokenizer
+
+    model_name = resolve_model_name(model_name)
+    with _lock:
+        tokenizer = _tokenizers.get(model_name)
+        if tokenizer is None:
+            logger.info(f"Loading tokenizer {model_name}")
+            tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+            _tokenizers[model_name] = tokenizer
+        return tokenizer
+
+
+def max_sequence_length(model_name: str) -> int:
+    """
+    Longest input in tokens, including special tokens, the model embeds.
+
+    Reads sentence_bert_config.json when the model is not loaded, since
+    sentence-transformers truncates below the tokenizer's own limit
+    (384 vs. 512 for all-mpnet-base-v2).
+    """
+    model_name = resolve_model_name(model_name)
+    if model_name in _max_lengths:
+        return _max_lengths[model_name]
+
+    max_length = None
+    try:
+        if os.path.isdir(model_name):
+            config_path = os.path.join(model_name, "sentence_bert_config.json")
+        else:
+            from huggingface_hub import hf_hub_download
+            config_path = hf_hub_download(model_name, "sentence_bert_config.json")
+        with open(config_path) as f:
+            max_length = json.load(f).get("max_seq_length")
+    except Exception as e:
+        logger.debug(f"No sentence-transformers config for {model_name}: {str(e)}")
+    if not max_length:
+        max_length = get_tokenizer(model_name).model_max_length
+    _max_lengths[model_name] = max_length
+    return max_length
+
+
+def clear() -> None:
+    """Drop every loaded model and tokenizer."""
+    with _lock:
+        _models.clear()
+        _tokenizers.clear()
+        _max_lengths.clear()
+
+
+class SharedSentenceTransformerEmbeddings(Embeddings):
+    """LangChain embeddings backed by the shared SentenceTransformer of a model."""
+
+    def __init__(self, model_name: str, model_kwargs: Optional[Dict[str, Any]] = None,
+                 encode_kwargs: Optional[Dict[str, Any]] = None,
+                 query_encode_kwargs: Optional[Dict[str, Any]] = None):
+        self.model_name = model_name
+        self.client = get_sentence_transformer(model_name, **(model_kwargs or {}))
+        self.encode_kwargs = encode_kwargs or {}
+        self.query_encode_kwargs = query_encode_kwargs or {}
+
+    def _encode(self, texts: List[str], encode_kwargs: Dict[str, Any]) -> List[List[float]]:
+        texts = [text.replace("\n", " ") for text in texts]
+        kwargs = {"show_progress_bar": False, **encode_kwargs}
+        return self.client.encode(texts, **kwargs).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._encode(texts, self.encode_kwargs)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._encode([text], self.query_encode_kwargs or self.encode_kwargs)[0]
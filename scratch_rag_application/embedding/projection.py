@@ -0,0 +1,341 @@
+# embeddings/projection.py
+from abc import ABC, abstractmethod
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from .base_embedding import BaseEmbedding
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class BaseProjection(ABC):
+    """Abstract base class for embedding dimensionality reduction."""
+
+    method: str = ""
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+
+    @property
+    @abstractmethod
+    def is_fitted(self) -> bool:
+        pass
+
+    @abstractmethod
+    def fit(self, vectors: np.ndarray) -> None:
+        """Fit the projection on full-dimensional vectors."""
+        pass
+
+    @abstractmethod
+    def _project(self, vectors: np.ndarray) -> np.ndarray:
+        pass
+
+    def transform(self, vectors: np.ndarray) -> np.ndarray:
+        """Project vectors and re-normalize them for cosine similarity."""
+        return _normalize(self._project(np.asarray(vectors, dtype=np.float32)))
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {}
+
+    def load_state(self, state: Dict[str, np.ndarray]) -> None:
+        pass
+
+
+class PCAProjection(BaseProjection):
+    """PCA projection fitted on the collection's document embeddings."""
+
+    method = "pca"
+
+    def __init__(self, dimensions: int):
+        super().__init__(dimensions)
+        self.mean: Optional[np.ndarray] = None
+        self.components: Optional[np.ndarray] = None
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.components is not None
+
+    def fit(self, vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.shape[0] < 2:
+            raise ValueError("PCA needs at least two vectors to fit")
+        self.mean = vectors.mean(axis=0)
+        # Rows of vt are principal directions, ordered by explained variance
+        _, _, vt = np.linalg.svd(vectors - self.mean, full_matrices=False)
+        self.components = vt[:self.dimensions].astype(np.float32)
+        self.dimensions = self.components.shape[0]
+
+    def _project(self, vectors: np.ndarray) -> np.ndarray:
+        return (vectors - self.mean) @ self.components.T
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {"mean": self.mean, "components": self.components}
+
+    def load_state(self, state: Dict[str, np.ndarray]) -> None:
+        self.mean = state["mean"]
+        self.components = state["components"]
+        self.dimensions = self.components.shape[0]
+
+
+class TruncationProjection(BaseProjection):
+    """Prefix truncation for Matryoshka-trained embedding models."""
+
+    method = "truncate"
+
+    @property
+    def is_fitted(self) -> bool:
+        return True
+
+    def fit(self, vectors: np.ndarray) -> None:
+        pass
+
+    def _project(self, vectors: np.ndarray) -> np.ndarray:
+        return vectors[..., :self.dimensions]
+
+
+_PROJECTIONS = {
+    "pca": PCAProjection,
+    "truncate": TruncationProjection
+}
+
+
+def create_projection(method: str, dimensions: int) -> BaseProjection:
+    """Create a projection instance for the configured method."""
+    projection_class = _PROJECTIONS.get(method)
+    if not projection_class:
+        raise ValueError(f"Unsupported projection type: {method}")
+    return projection_class(dimensions)
+
+
+def dimension_report(vectors: np.ndarray, method: str, dimensions: Sequence[int],
+                     k: int = 10, sample_size: int = 200,
+                     seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Measure retrieval quality against dimension count.
+
+    Sampled document vectors are used as queries; recall@k compares the
+    neighbours found in the projected space with the full-dimensional ones.
+
+    Args:
+        vectors: Full-dimensional document embeddings
+        method: Projection method ("pca" or "truncate")
+        dimensions: Dimension counts to evaluate
+        k: Number of neighbours compared per query
+        sample_size: Number of vectors used as queries
+        seed: Seed for query sampling
+
+    Returns:
+        One dict per dimension count with recall and bytes per vector
+    """
+    vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+    n = vectors.shape[0]
+    k = min(k, n - 1)
+    if k < 1:
+        return []
+    rng = np.random.default_rng(seed)
+    queries = rng.choice(n, min(sample_size, n), replace=False)
+
+    def neighbours(matrix: np.ndarray) -> np.ndarray:
+        scores = matrix[queries] @ matrix.T
+        scores[np.arange(len(queries)), queries] = -np.inf
+        return np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+    exact = neighbours(vectors)
+    report = []
+    for dims in sorted(set(dimensions)):
+        if dims > vectors.shape[1]:
+            continue
+        projection = create_projection(method, dims)
+        projection.fit(vectors)
+        approx = neighbours(projection.transform(vectors))
+        overlap = sum(len(set(a) & set(e)) for a, e in zip(approx, exact))
+        report.append({
+            "dimensions": dims,
+            "recall_at_k": overlap / (len(queries) * k),
+            "bytes_per_vector": dims * 4
+        })
+    return report
+
+
+class ProjectedEmbedding(BaseEmbedding):
+    """
+    Embedding wrapper that applies a fitted projection to documents and queries.
+
+    The projection is persisted next to the vector store collection so that
+    ingest and query processes project into the same space. PCA is fitted
+    explicitly on a sample of the corpus before ingest (see fit_texts);
+    documents and queries are refused until a projection is fitted.
+    """
+
+    def __init__(self, params: Dict[str, Any], base: BaseEmbedding):
+        self.base = base
+        super().__init__(params)
+        self.dimensions = params.get("embeddings.projection.dimensions", 256)
+        self.projection = create_projection(
+            params.get("embeddings.projection.type", "pca"), self.dimensions)
+        self.fit_sample_size = params.get(
+            "embeddings.projection.fit_sample_size", 20000)
+        self.report_dimensions = params.get(
+            "embeddings.projection.report_dimensions", [])
+        self.path = self._projection_path()
+        # Serialises fits; readers take the projection reference once per call
+        self._fit_lock = threading.Lock()
+        self._load()
+
+    def _create_embedder(self) -> Embeddings:
+        return self.base
+
+    def _projection_path(self) -> str:
+        """Locate the projection file alongside the configured collection."""
+        store_type = self.params.get("vectorstore.type", "chroma")
+        persist_directory = self.params.get(
+            f"vectorstore.{store_type}.persist_directory", ".")
+        collection_name = self.params.get(
+            f"vectorstore.{store_type}.collection_name", "default")
+        return os.path.join(persist_directory, f"{collection_name}.projection.npz")
+
+    def _model_name(self) -> str:
+        embedder_type = self.params.get("embeddings.type")
+        return str(self.params.get(f"embeddings.{embedder_type}.model_name", ""))
+
+    def _load(self) -> None:
+        """Load a persisted projection if it matches the configured model."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path) as data:
+                meta = json.loads(str(data["meta"]))
+                state = {key: data[key] for key in data.files if key != "meta"}
+            if meta["model_name"] != self._model_name() or meta["method"] != self.projection.method:
+                self.logger.warning(
+                    f"Ignoring projection at {self.path}: fitted for "
+                    f"{meta['method']} on {meta['model_name']}")
+                return
+            self.projection.load_state(state)
+            self.logger.info(
+                f"Loaded {meta['method']} projection to {meta['dimensions']} dimensions")
+        except Exception as e:
+            self.logger.error(f"Error loading projection: {str(e)}")
+
+    def _save(self, report: List[Dict[str, Any]]) -> None:
+        meta = {
+            "method": self.projection.method,
+            "dimensions": self.projection.dimensions,
+            "model_name": self._model_name(),
+            "report": report
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        np.savez(self.path, meta=json.dumps(meta), **self.projection.state())
+
+    def reset(self) -> None:
+        """Forget the fitted projection so the next ingest refits it."""
+        with self._fit_lock:
+            if self.projection.method == "pca":
+                self.projection = create_projection("pca", self.dimensions)
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def fit_texts(self, texts: Sequence[str], refit: bool = False) -> List[Dict[str, Any]]:
+        """
+        Fit the projection on a sample of the corpus about to be ingested.
+
+        Concurrent callers are serialised; unless refit is set, only the
+        first one fits and the others return once it is done.
+
+        Args:
+            texts: Every document text of the corpus
+            refit: Fit again even if a projection is already fitted
+
+        Returns:
+            Retrieval quality against dimension count, if configured
+        """
+        with self._fit_lock:
+            if self.projection.is_fitted and not refit:
+                return []
+            texts = list(texts)
+            if len(texts) > self.fit_sample_size:
+                rng = np.random.default_rng(0)
+                rows = np.sort(rng.choice(len(texts), self.fit_sample_size, replace=False))
+                texts = [texts[row] for row in rows]
+            self.logger.info(
+                f"Fitting {self.projection.method} projection on {len(texts)} documents")
+            vectors = self.base.embed_documents(texts)
+            if not vectors:
+                raise ValueError("Embedder returned no vectors to fit the projection")
+            return self._fit(vectors)
+
+    def fit(self, vectors: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Fit and persist the projection on full-dimensional document vectors.
+
+        Args:
+            vectors: Full-dimensional document embeddings
+
+        Returns:
+            Retrieval quality against dimension count, if configured
+        """
+        with self._fit_lock:
+            return self._fit(vectors)
+
+    def _fit(self, vectors: np.ndarray) -> List[Dict[str, Any]]:
+        """Fit a new projection and swap it in; the caller holds the fit lock."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        sample = vectors
+        if len(vectors) > self.fit_sample_size:
+            rng = np.random.default_rng(0)
+            sample = vectors[rng.choice(len(vectors), self.fit_sample_size, replace=False)]
+        projection = create_projection(self.projection.method, self.dimensions)
+        projection.fit(sample)
+
+        report = []
+        if self.report_dimensions:
+            report = dimension_report(
+                sample, self.projection.method, self.report_dimensions)
+            for row in report:
+                self.logger.info(
+                    f"Projection to {row['dimensions']} dims: "
+                    f"recall@10={row['recall_at_k']:.3f}, "
+                    f"{row['bytes_per_vector']} bytes/vector")
+        self.projection = projection
+        self._save(report)
+        return report
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        projection = self.projection
+        if not projection.is_fitted:
+            self.logger.error("Projection not fitted; call fit_texts before ingesting")
+            return []
+        vectors = self.base.embed_documents(texts)
+        if not vectors:
+            return []
+        try:
+            return projection.transform(vectors).tolist()
+        except Exception as e:
+            self.logger.error(f"Error projecting documents: {str(e)}")
+            return []
+
+    def embed_query(self, text: str) -> List[float]:
+        projection = self.projection
+        if not projection.is_fitted:
+            self.logger.error("Projection not fitted; ingest documents first")
+            return []
+        vector = self.base.embed_query(text)
+        if not vector:
+            return []
+        return projection.transform(vector).tolist()
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        projection = self.projection
+        if not projection.is_fitted:
+            self.logger.error("Projection not fitted; ingest documents first")
+            return []
+        vectors = self.base.embed_queries(texts)
+        if not vectors:
+            return []
+        return projection.transform(vectors).tolist()
@@ -0,0 +1,165 @@
+# loader/artifact_cache.py
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.documents import Document
+
+# Bumped whenever the file layout or the shape of the parsed sections changes
+FORMAT_VERSION = 1
+
+
+class ArtifactCache:
+    """
+    Persists the parsed sections of each source as a compressed columnar file.
+
+    One ``<sha256(source)[:16]>.json.gz`` file is written per source. The
+    file holds the source, the hash of the cleaned markdown the sections
+    were parsed from, and one column per field: ``page_content`` plus
+    one column per metadata key. The source itself is stored once rather
+    than per row. Splitter and embedding experiments can restart from
+    these files without fetching or parsing again.
+
+    Each file also records a fingerprint of the format version and the
+    parser settings it was written with. A file with another fingerprint
+    is treated as missing, so changing the parsers never reuses sections
+    they would no longer produce.
+    """
+
+    def __init__(self, directory: str, fingerprint: str):
+        """
+        Args:
+            directory: Directory of the artifact files
+            fingerprint: Fingerprint of the current parser settings, see
+                parser_fingerprint()
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.directory = directory
+        self.fingerprint = fingerprint
+
+    @staticmethod
+    def parser_fingerprint(config: Any) -> str:
+        """
+        Fingerprint of the settings that decide what a page parses into.
+
+        Args:
+            config: Configuration handler instance
+
+        Returns:
+            Hash of the format version, the content HTML class and the
+            content_parser settings
+        """
+        settings = {
+            "format_version": FORMAT_VERSION,
+            "content_class": config.get("pipeline.sources.website.content_class",
+                                        "page-content"),
+            "content_parser": config.get("content_parser", {}),
+        }
+        encoded = json.dumps(settings, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """Hash of cleaned markdown, used to tell whether a page changed."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def path(self, source: str) -> str:
+        """Artifact file of a source."""
+        name = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"{name}.json.gz")
+
+    def save(self, source: str, content_hash: str, documents: List[Document]) -> bool:
+        """
+        Write the parsed sections of one source.
+
+        Args:
+            source: Source URL
+            content_hash: Hash of the cleaned markdown the sections came from
+            documents: Parsed sections of the source
+
+        Returns:
+            bool: True if the artifact was written
+        """
+        keys = sorted({key for doc in documents for key in doc.metadata if key != "source"})
+        artifact = {
+            "source": source,
+            "format_version": FORMAT_VERSION,
+            "fingerprint": self.fingerprint,
+            "content_hash": content_hash,
+            "created_at": time.time(),
+            "rows": len(documents),
+            "columns": {
+                "page_content": [doc.page_content for doc in documents],
+                "metadata": {key: [doc.metadata.get(key) for doc in documents]
+                             for key in keys},
+            },
+        }
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self.path(source)
+            tmp_path = f"{path}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(artifact, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error writing artifact for {source}: {str(e)}")
+            return False
+
+    def load(self, source: str) -> Optional[Tuple[str, List[Document]]]:
+        """
+        Read the parsed sections of one source.
+
+        Args:
+            source: Source URL
+
+        Returns:
+            (content_hash, documents), or None if there is no artifact
+            written with the current format and parser settings
+        """
+        path = self.path(source)
+        if not os.path.exists(path):
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                artifact = json.load(f)
+            if artifact["source"] != source:
+                return None
+            if artifact.get("fingerprint") != self.fingerprint:
+                self.logger.info(f"Artifact for {source} was parsed with other settings")
+                return None
+            columns = artifact["columns"]
+            metadata_columns: Dict[str, List[Any]] = columns["metadata"]
+            documents = []
+            for row, content in enumerate(columns["page_content"]):
+                metadata = {"source": source}
+                for key, values in metadata_columns.items():
+                    if values[row] is not None:
+                        metadata[key] = values[row]
+                documents.append(Document(page_content=content, metadata=metadata))
+            return artifact["content_hash"], documents
+        except Exception as e:
+            self.logger.error(f"Error reading artifact for {source}: {str(e)}")
+            return None
+
+    def load_many(self, sources: List[str]) -> Tuple[List[Document], List[str]]:
+        """
+        Read the artifacts of several sources.
+
+        Args:
+            sources: Source URLs
+
+        Returns:
+            Documents of the cached sources, and the sources without an artifact
+        """
+        documents, missing = [], []
+        for source in sources:
+            cached = self.load(source)
+            if cached is None:
+                missing.append(source)
+            else:
+                documents.extend(cached[1])
+        return documents, missing
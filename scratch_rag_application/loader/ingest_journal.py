@@ -0,0 +1,159 @@
+# loader/ingest_journal.py
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from langchain_core.documents import Document
+
+
+def chunk_id(source: str, index: int, content: str) -> str:
+    """
+    Deterministic id of a chunk, so a resumed run writes the same ids.
+
+    Args:
+        source: Source URL of the chunk
+        index: Position of the chunk within its source
+        content: Chunk text
+    """
+    key = f"{source}\x00{index}\x00{content}".encode("utf-8")
+    return hashlib.sha256(key).hexdigest()
+
+
+def _dump_documents(documents: Iterable[Document]) -> List[Dict[str, Any]]:
+    return [{"page_content": doc.page_content, "metadata": doc.metadata}
+            for doc in documents]
+
+
+def _load_documents(records: List[Dict[str, Any]]) -> List[Document]:
+    return [Document(page_content=record["page_content"], metadata=record["metadata"])
+            for record in records]
+
+
+class IngestJournal:
+    """
+    Append-only JSONL journal of completed ingest work.
+
+    Each line records one committed unit of work:
+
+    - ``parsed``: the parsed sections of one source
+    - ``cleared``: the previous contents of the store were deleted
+    - ``split``: the chunks of one source with their deterministic ids
+    - ``stored``: the ids of one batch written to the vector store
+    - ``complete``: the run finished
+
+    Lines are flushed and fsynced as they are written, so after a crash
+    the journal holds every unit that completed. A torn last line is
+    ignored on replay.
+    """
+
+    def __init__(self, path: str):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.path = path
+        self.parsed: Dict[str, List[Document]] = {}
+        self.split: Dict[str, List[Document]] = {}
+        self.split_ids: Dict[str, List[str]] = {}
+        self.stored: Set[str] = set()
+        self.cleared = False
+        self.complete = False
+        self.started = False
+        self._replay()
+
+    def _replay(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    self.logger.warning(
+                        f"Ignoring unreadable journal line {line_no} in {self.path}")
+                    continue
+                self.started = True
+                stage = record.get("stage")
+                if stage == "parsed":
+                    self.parsed[record["source"]] = _load_documents(record["documents"])
+                elif stage == "split":
+                    self.split[record["source"]] = _load_documents(record["documents"])
+                    self.split_ids[record["source"]] = record["ids"]
+                elif stage == "cleared":
+                    self.cleared = True
+                elif stage == "stored":
+                    self.stored.update(record["ids"])
+                elif stage == "complete":
+                    self.complete = True
+
+    @property
+    def resumable(self) -> bool:
+        """Whether the journal holds an interrupted run."""
+        return self.started and not self.complete
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        record["at"] = time.time()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.started = True
+
+    def reset(self) -> None:
+        """Discard the journal and start a new run."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.parsed, self.split, self.split_ids = {}, {}, {}
+        self.stored = set()
+        self.cleared = False
+        self.complete = False
+        self.started = False
+        self._append({"stage": "start"})
+
+    def record_parsed(self, source: str, documents: List[Document]) -> None:
+        self._append({"stage": "parsed", "source": source,
+                      "documents": _dump_documents(documents)})
+        self.parsed[source] = documents
+
+    def record_split(self, source: str, documents: List[Document],
+                     ids: Optional[List[str]] = None) -> List[str]:
+        """
+        Record the chunks of one source.
+
+        Args:
+            source: Source URL
+            documents: Chunks of the source, in order
+            ids: Chunk ids, derived from the content if not given
+
+        Returns:
+            List[str]: The recorded chunk ids
+        """
+        if ids is None:
+            ids = [chunk_id(source, i, doc.page_content)
+                   for i, doc in enumerate(documents)]
+        self._append({"stage": "split", "source": source, "ids": ids,
+                      "documents": _dump_documents(documents)})
+        self.split[source] = documents
+        self.split_ids[source] = ids
+        return ids
+
+    def record_cleared(self) -> None:
+        self._append({"stage": "cleared"})
+        self.cleared = True
+
+    def record_stored(self, ids: List[str]) -> None:
+        self._append({"stage": "stored", "ids": ids})
+        self.stored.update(ids)
+
+    def record_complete(self) -> None:
+        self._append({"stage": "complete"})
+        self.complete = True
+
+    def pending(self) -> List[Tuple[str, Document]]:
+        """Split chunks not yet written to the store, as (id, document) pairs."""
+        return [
+            (doc_id, doc)
+            for source, docs in self.split.items()
+            for doc_id, doc in zip(self.split_ids[source], docs)
+            if doc_id not in self.stored
+        ]
@@ -0,0 +1,254 @@
+# loader/refresh_daemon.py
+import asyncio
+from dataclasses import asdict, dataclass, field
+import json
+import logging
+import os
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional
+import aiohttp
+from langchain_core.documents import Document
+from scratch_rag_application.config.config_handler import ConfigHandler
+from scratch_rag_application.utils.executor import run_blocking
+from scratch_rag_application.vector_store.base_vector_store import BaseVectorStore
+from scratch_rag_application.vector_store.collection_alias import read_alias
+from .artifact_cache import ArtifactCache
+from .reindex import replace_sources
+from .url_loader import URLLoader
+
+
+@dataclass
+class PageState:
+    """What was seen the last time a page was checked."""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    checked_at: float = 0.0
+
+
+@dataclass
+class RefreshReport:
+    """Outcome of one refresh run."""
+    started_at: float
+    duration_seconds: float = 0.0
+    checked: int = 0
+    not_modified: int = 0      # Answered 304 to the stored validators
+    unchanged: int = 0         # Fetched, but the cleaned markdown hash matched
+    changed: int = 0
+    failed: int = 0
+    reindexed: int = 0         # Changed pages whose chunks were replaced
+    chunks_deleted: int = 0
+    chunks_added: int = 0
+    changed_sources: List[str] = field(default_factory=list)
+
+
+class RefreshDaemon:
+    """
+    Re-checks configured sources on a schedule and reindexes changed pages.
+
+    Each run sends conditional requests with the stored ETag and
+    Last-Modified validators. Pages answering 200 are converted to cleaned
+    markdown and hashed, so template-only changes that do not survive
+    cleaning are not reindexed. Only changed pages go through split, embed
+    and the per-source replace in the store and BM25.
+
+    Opening the store builds its in-memory indexes over the whole corpus,
+    so it is opened once, on the first run with changes. With blue/green
+    rebuilds it is reopened when the collection alias has moved, so a
+    reload made by another process is written to rather than the retired
+    version.
+    """
+
+    def __init__(self, config: ConfigHandler,
+                 open_store: Callable[[], BaseVectorStore]):
+        """
+        Args:
+            config: Configuration handler instance
+            open_store: Opens the vector store; called on the first run
+                with changed pages and again when the alias moves
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.config = config
+        self.open_store = open_store
+        self.loader = URLLoader()
+        self.interval = config.get("refresh.interval_seconds", 3600)
+        self.jitter = config.get("refresh.jitter_seconds", 300)
+        self.concurrency = config.get("refresh.concurrency", 4)
+        self.timeout = config.get("refresh.timeout_seconds", 30)
+        self.state_file = config.get("refresh.state_file", "./refresh_state.json")
+        self.status_file = config.get("refresh.status_file", "./refresh_status.json")
+        self.state: Dict[str, PageState] = self._load_state()
+        self.last_report: Optional[RefreshReport] = None
+        # Page states of changed pages, committed once they are reindexed
+        self._pending: Dict[str, PageState] = {}
+        self._vector_store: Optional[BaseVectorStore] = None
+        self._store_version: Optional[int] = None
+        self._stop = asyncio.Event()
+
+    def _load_state(self) -> Dict[str, PageState]:
+        if not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file) as f:
+                return {url: PageState(**page) for url, page in json.load(f).items()}
+        except Exception as e:
+            self.logger.error(f"Error loading refresh state: {str(e)}")
+            return {}
+
+    def _write_json(self, path: str, data: Any) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def _save_state(self) -> None:
+        self._write_json(self.state_file,
+                         {url: asdict(page) for url, page in self.state.items()})
+
+    def _alias_version(self) -> Optional[int]:
+        """Version the blue/green collection alias points at; None for other stores."""
+        if self.config.get("vectorstore.type", "chroma") != "chroma" or \
+                self.config.get("vectorstore.chroma.rebuild_mode", "in_place") != "blue_green":
+            return None
+        _, version = read_alias(
+            self.config.get("vectorstore.chroma.persist_directory", "./chroma_db"),
+            self.config.get("vectorstore.chroma.collection_name", "default"))
+        return version
+
+    async def _get_store(self) -> BaseVectorStore:
+        """Return the open store, opening it first or again if the alias moved."""
+        version = self._alias_version()
+        if self._vector_store is None or version != self._store_version:
+            self._vector_store = await run_blocking(self.open_store)
+            self._store_version = version
+        return self._vector_store
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        return ArtifactCache.content_hash(text)
+
+    async def _check_page(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                          url: str, report: RefreshReport) -> List[Document]:
+        """
+        Conditionally fetch one page.
+
+        Returns:
+            Parsed sections if the page changed, otherwise an empty list
+        """
+        previous = self.state.get(url, PageState())
+        headers = {}
+        if previous.etag:
+            headers["If-None-Match"] = previous.etag
+        if previous.last_modified:
+            headers["If-Modified-Since"] = previous.last_modified
+
+        async with semaphore:
+            report.checked += 1
+            try:
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 304:
+                        report.not_modified += 1
+                        previous.checked_at = time.time()
+                        self.state[url] = previous
+                        return []
+                    response.raise_for_status()
+                    html = await response.text()
+                    etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
+            except Exception as e:
+                report.failed += 1
+                self.logger.error(f"Error checking {url}: {str(e)}")
+                return []
+
+        # Markdown conversion and parsing are CPU-bound; keep the loop responsive
+        cleaned_text = await run_blocking(self.loader.html_to_markdown, html, url)
+        digest = self.content_hash(cleaned_text or "")
+        page = PageState(etag, last_modified, digest, time.time())
+        if digest == previous.content_hash:
+            report.unchanged += 1
+            self.state[url] = page
+            return []
+
+        docs = await run_blocking(
+            self.loader.parse_sections, cleaned_text, url) if cleaned_text else []
+        if not docs:
+            # Keep the old chunks; the hash is not stored so the page is retried
+            report.failed += 1
+            self.logger.warning(f"{url} changed but produced no content; skipping")
+            return []
+
+        if self.loader.artifacts:
+            self.loader.artifacts.save(url, digest, docs)
+        report.changed += 1
+        report.changed_sources.append(url)
+        # Stored once the page has been reindexed
+        self._pending[url] = page
+        return docs
+
+    async def run_once(self, urls: Optional[List[str]] = None) -> RefreshReport:
+        """
+        Check every source once and reindex the pages that changed.
+
+        Args:
+            urls: Optional subset of sources, defaults to the configured ones
+
+        Returns:
+            RefreshReport: Counts of pages checked, changed and reindexed
+        """
+        urls = self.loader.urls if urls is None else urls
+        report = RefreshReport(started_at=time.time())
+        start = time.perf_counter()
+        self._pending = {}
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            results = await asyncio.gather(*(
+                self._check_page(session, semaphore, url, report) for url in urls))
+
+        docs = [doc for page_docs in results for doc in page_docs]
+        if report.changed_sources:
+            try:
+                vector_store = await self._get_store()
+                result = await replace_sources(
+                    self.config, vector_store, report.changed_sources, docs)
+                report.chunks_deleted = result["deleted"]
+                report.chunks_added = result["added"]
+                if result["added"]:
+                    report.reindexed = len(report.changed_sources)
+                    self.state.update(self._pending)
+            except Exception as e:
+                self.logger.error(f"Error reindexing changed pages: {str(e)}")
+
+        self._save_state()
+        report.duration_seconds = round(time.perf_counter() - start, 3)
+        self.last_report = report
+        self._write_json(self.status_file, asdict(report))
+        self.logger.info(
+            f"Refresh run: {report.checked} checked, {report.not_modified} not modified, "
+            f"{report.unchanged} unchanged, {report.changed} changed, "
+            f"{report.reindexed} reindexed, {report.failed} failed "
+            f"in {report.duration_seconds}s")
+        return report
+
+    def stop(self) -> None:
+        """Request the daemon to stop after the current run."""
+        self._stop.set()
+
+    async def run_forever(self) -> None:
+        """Run refreshes every interval (plus random jitter) until stopped."""
+        while not self._stop.is_set():
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.logger.error(f"Refresh run failed: {str(e)}")
+
+            # Jitter spreads runs of several daemons over the site's capacity
+            delay = self.interval + random.uniform(0, self.jitter)
+            self.logger.info(f"Next refresh in {delay:.0f}s")
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
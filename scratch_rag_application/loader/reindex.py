@@ -0,0 +1,143 @@
+# loader/reindex.py
+import logging
+from typing import Any, Dict, List, Set, Tuple
+from uuid import uuid4
+from langchain_core.documents import Document
+from scratch_rag_application.config.config_handler import ConfigHandler
+from scratch_rag_application.text_splitter.near_duplicates import NearDuplicateFilter, rehome
+from scratch_rag_application.text_splitter.splitter_factory import TextSplitterFactory
+from scratch_rag_application.utils.executor import run_blocking
+from scratch_rag_application.vector_store.base_vector_store import BaseVectorStore
+from .url_loader import URLLoader
+
+logger = logging.getLogger(__name__)
+
+
+def source_filter(sources: List[str]) -> Dict[str, Any]:
+    """Where clause matching the chunks of one or more sources."""
+    if len(sources) == 1:
+        return {"source": sources[0]}
+    return {"source": {"$in": list(sources)}}
+
+
+def _rehomed_chunks(vector_store: BaseVectorStore,
+                    sources: List[str]) -> Tuple[List[str], List[Document]]:
+    """
+    Canonical chunks of the given sources that other sources still share.
+
+    Args:
+        vector_store: Store to read from
+        sources: Sources being removed
+
+    Returns:
+        The ids of those chunks and their copies owned by a surviving source
+    """
+    removed: Set[str] = set(sources)
+    presence: Dict[str, bool] = {}
+
+    def present(source: str) -> bool:
+        if source not in presence:
+            pages = vector_store.iter_documents(batch_size=1, include=[],
+                                                where={"source": source})
+            presence[source] = bool(next(pages, {}).get("ids"))
+        return presence[source]
+
+    ids, documents = [], []
+    for page in vector_store.iter_documents(where=source_filter(sources)):
+        for doc_id, text, metadata in zip(page["ids"], page["documents"], page["metadatas"]):
+            if not (metadata or {}).get("duplicate_sources"):
+                continue
+            document = rehome(Document(page_content=text, metadata=metadata),
+                              removed, present)
+            if document is not None:
+                ids.append(doc_id)
+                documents.append(document)
+    return ids, documents
+
+
+async def delete_sources(vector_store: BaseVectorStore,
+                         sources: List[str]) -> int:
+    """
+    Remove every chunk of the given sources from the store and search indexes.
+
+    A near-duplicate chunk that other sources' copies were dropped in favour
+    of is kept and moved to one of those sources instead.
+
+    Args:
+        vector_store: Store to delete from
+        sources: Source URLs
+
+    Returns:
+        int: Number of chunks deleted
+    """
+    if not sources:
+        return 0
+    ids, rehomed = await run_blocking(_rehomed_chunks, vector_store, sources)
+    deleted = await vector_store.adelete_by_metadata(source_filter(sources))
+    if rehomed and await vector_store.aadd_documents(rehomed, ids):
+        logger.info(f"Moved {len(rehomed)} shared chunks to their remaining sources")
+        deleted -= len(rehomed)
+    return deleted
+
+
+async def reindex_sources(config: ConfigHandler, vector_store: BaseVectorStore,
+                          sources: List[str]) -> Dict[str, int]:
+    """
+    Re-run fetch, parse, split and embed for just the given sources.
+
+    Pages are fetched and split before anything is deleted, so a source
+    that fails to load keeps its existing chunks.
+
+    Args:
+        config: Configuration handler instance
+        vector_store: Store to update
+        sources: Source URLs to reindex
+
+    Returns:
+        Dict with the number of chunks deleted and added per source
+    """
+    docs = await URLLoader().load_urls(sources)
+    loaded = {doc.metadata.get("source") for doc in docs}
+    failed = [source for source in sources if source not in loaded]
+    for source in failed:
+        logger.warning(f"Could not load {source}; keeping its existing chunks")
+
+    reloaded = [source for source in sources if source in loaded]
+    result = await replace_sources(config, vector_store, reloaded, docs)
+    result["failed"] = len(failed)
+    return result
+
+
+async def replace_sources(config: ConfigHandler, vector_store: BaseVectorStore,
+                          sources: List[str], docs: List[Document]) -> Dict[str, int]:
+    """
+    Replace the chunks of already loaded sources with freshly split ones.
+
+    Args:
+        config: Configuration handler instance
+        vector_store: Store to update
+        sources: Sources whose existing chunks are removed
+        docs: Parsed (unsplit) documents of those sources
+
+    Returns:
+        Dict with the number of chunks deleted and added
+    """
+    if not sources:
+        return {"deleted": 0, "added": 0}
+
+    splitter = TextSplitterFactory(config).create_splitter()
+    split_docs = splitter.split_documents(docs)
+    ids = [str(uuid4()) for _ in split_docs]
+    near_duplicates = NearDuplicateFilter(config)
+    if near_duplicates.enabled and split_docs:
+        # Only the reloaded chunks are grouped; content moved to another source
+        # when these were deleted is stored again under this one if still present
+        ids, split_docs = near_duplicates.deduplicate(ids, split_docs)
+
+    deleted = await delete_sources(vector_store, sources)
+    added = 0
+    if split_docs and await vector_store.aadd_documents(split_docs, ids):
+        added = len(split_docs)
+    logger.info(
+        f"Reindexed {len(sources)} sources: {deleted} chunks removed, {added} added")
+    return {"deleted": deleted, "added": added}
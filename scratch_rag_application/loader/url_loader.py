@@ -1,5 +1,5 @@
 # loader/url_loader.py
-from typing import List
+from typing import List, Optional
 import aiohttp
 import asyncio
 import logging
@@ -8,7 +8,9 @@ from langchain_core.documents import Document
 from langchain_community.document_transformers import MarkdownifyTransformer
 from scratch_rag_application.config.config_handler import ConfigHandler
 from scratch_rag_application.utils.text_cleaner import TextCleaner
-from scratch_rag_application.content_parser.parser_factory import ContentParserFactory
+from scratch_rag_application.content_parser.base_parser import remaining_text
+from scratch_rag_application.content_parser.segmentation_engine import SegmentationEngine
+from .artifact_cache import ArtifactCache
 import re
 
 
@@ -20,14 +22,10 @@ class URLLoader:
         self.config_handler = ConfigHandler("config.yaml")
         self.transformer = MarkdownifyTransformer()
         self.text_cleaner = TextCleaner()
-        self.parser_factory = ContentParserFactory(self.config_handler)
-
-        # Initialize parsers
-        self.parsers = {
-            parser_type: self.parser_factory.create_parser(parser_type)
-            # Add "table", "code" as we implement them
-            for parser_type in ["qa"]
-        }
+        # Pages are parsed into markdown blocks once and dispatched to parsers
+        self.segmenter = SegmentationEngine(
+            self.config_handler,
+            self.config_handler.get("content_parser.enabled", ["qa", "table", "code"]))
 
         # Get configuration
         self.urls = self.config_handler.get(
@@ -35,6 +33,89 @@ class URLLoader:
         self.content_class = self.config_handler.get(
             "pipeline.sources.website.content_class", "page-content")
 
+        # Parsed sections are persisted per source for later restarts
+        self.artifacts = None
+        if self.config_handler.get("pipeline.artifacts.enabled", False):
+            self.artifacts = ArtifactCache(
+                self.config_handler.get("pipeline.artifacts.directory", "./artifacts/parsed"),
+                ArtifactCache.parser_fingerprint(self.config_handler))
+
+    def html_to_markdown(self, html: str, url: str) -> Optional[str]:
+        """
+        Extract the content block of a page as cleaned markdown.
+
+        Args:
+            html: Raw page HTML
+            url: Page URL, kept as the document source
+
+        Returns:
+            Cleaned markdown, or None if nothing could be extracted
+        """
+        # Parse only the content we need
+        soup = BeautifulSoup(
+            html,
+            'html.parser',
+            parse_only=SoupStrainer(class_=self.content_class)
+        )
+
+        # Convert to markdown and clean
+        markdown_text = str(soup)
+        transformed_docs = self.transformer.transform_documents(
+            [Document(page_content=markdown_text,
+                      metadata={'source': url})]
+        )
+
+        if not transformed_docs:
+            return None
+
+        # Clean the transformed text
+        return self.text_cleaner.clean(transformed_docs[0].page_content)
+
+    def parse_sections(self, cleaned_text: str, url: str) -> List[Document]:
+        """
+        Split cleaned markdown into typed sections with the configured parsers.
+
+        Args:
+            cleaned_text: Cleaned markdown of one page
+            url: Page URL, kept as the document source
+
+        Returns:
+            List of Document objects containing parsed content sections
+        """
+        # Parse content using all configured parsers
+        documents = []
+        sections = self.segmenter.segment(cleaned_text)
+
+        for section in sections:
+            documents.append(
+                Document(
+                    page_content=section.content,
+                    metadata={
+                        'source': url,
+                        'content_type': section.content_type,
+                        'section_id': section.section_id
+                    }
+                )
+            )
+
+        # Text between the parsed sections, built once from their spans
+        remaining_content = remaining_text(cleaned_text, sections)
+
+        # Create document for any remaining content
+        if remaining_content.strip():
+            documents.append(
+                Document(
+                    page_content=remaining_content.strip(),
+                    metadata={
+                        'source': url,
+                        'content_type': 'general',
+                        'section_id': 'default'
+                    }
+                )
+            )
+
+        return documents
+
     async def _fetch_url(self, session: aiohttp.ClientSession, url: str) -> List[Document]:
         """
         Fetch and process a single URL.
@@ -51,81 +132,51 @@ class URLLoader:
                 response.raise_for_status()
                 html = await response.text()
 
-                # Parse only the content we need
-                soup = BeautifulSoup(
-                    html,
-                    'html.parser',
-                    parse_only=SoupStrainer(class_=self.content_class)
-                )
-
-                # Convert to markdown and clean
-                markdown_text = str(soup)
-                transformed_docs = self.transformer.transform_documents(
-                    [Document(page_content=markdown_text,
-                              metadata={'source': url})]
-                )
-
-                if not transformed_docs:
+                cleaned_text = self.html_to_markdown(html, url)
+                if not cleaned_text:
                     return []
-
-                # Clean the transformed text
-                cleaned_text = self.text_cleaner.clean(
-                    transformed_docs[0].page_content)
-
-                # Parse content using all configured parsers
-                documents = []
-                remaining_content = cleaned_text
-
-                for parser_type, parser in self.parsers.items():
-                    parsed_sections = parser.parse(remaining_content)
-
-                    # Create documents for parsed sections
-                    for section in parsed_sections:
-                        documents.append(
-                            Document(
-                                page_content=section.content,
-                                metadata={
-                                    'source': url,
-                                    'content_type': section.content_type,
-                                    'section_id': section.section_id
-                                }
-                            )
-                        )
-
-                        # Remove parsed content from remaining text
-                        remaining_content = remaining_content.replace(
-                            section.content, '')
-
-                # Create document for any remaining content
-                if remaining_content.strip():
-                    documents.append(
-                        Document(
-                            page_content=remaining_content.strip(),
-                            metadata={
-                                'source': url,
-                                'content_type': 'general',
-                                'section_id': 'default'
-                            }
-                        )
-                    )
-
+                documents = self.parse_sections(cleaned_text, url)
+                if self.artifacts and documents:
+                    self.artifacts.save(
+                        url, ArtifactCache.content_hash(cleaned_text), documents)
                 return documents
 
         except Exception as e:
             self.logger.error(f"Error processing {url}: {str(e)}")
             return []
 
-    async def load_urls(self) -> List[Document]:
-        """Load and process URLs concurrently."""
-        if not self.urls:
+    async def load_urls(self, urls: Optional[List[str]] = None,
+                        from_artifacts: bool = False) -> List[Document]:
+        """
+        Load and process URLs concurrently.
+
+        Args:
+            urls: Optional subset of URLs to load, defaults to the configured ones
+            from_artifacts: Reuse cached parsed sections, fetching only
+                sources without an artifact
+
+        Returns:
+            List of Document objects for every parsed section
+        """
+        urls = self.urls if urls is None else urls
+        if not urls:
             self.logger.warning("No URLs configured")
             return []
 
-        self.logger.info(f"Processing {len(self.urls)} URLs")
+        cached: List[Document] = []
+        if from_artifacts and self.artifacts:
+            cached, urls = self.artifacts.load_many(urls)
+            self.logger.info(
+                f"Loaded {len(cached)} document sections from artifacts, "
+                f"{len(urls)} URLs left to fetch")
+            if not urls:
+                return cached
+
+        self.logger.info(f"Processing {len(urls)} URLs")
 
         async with aiohttp.ClientSession() as session:
             # Create tasks for all URLs
-            tasks = [self._fetch_url(session, url) for url in self.urls]
+            tasks = [self._fetch_url(session, url) for url in urls]
             all_documents = await asyncio.gather(*tasks, return_exceptions=False)
 
             # Flatten the list of document lists
@@ -133,7 +184,7 @@ class URLLoader:
 
             self.logger.info(
                 f"Successfully processed {len(documents)} document sections")
-            return documents
+            return cached + documents
 
     def load(self) -> List[Document]:
         """Synchronous wrapper for async load_urls method."""
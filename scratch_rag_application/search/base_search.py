@@ -3,6 +3,7 @@ from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Tuple, Optional
 from langchain_core.documents import Document
 import logging
+from ..utils.executor import run_blocking
 
 
 class BaseSearch(ABC):
@@ -28,19 +29,48 @@ class BaseSearch(ABC):
         pass
 
     @abstractmethod
-    def search(self, query: str, k: Optional[int] = None) -> List[Tuple[Document, float]]:
+    def search(self, query: str, k: Optional[int] = None,
+               filter: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
         """
         Search for documents matching the query.
 
         Args:
             query: Search query string
             k: Optional number of results to return, defaults to config value
+            filter: Optional Chroma-style metadata where clause restricting
+                the documents that are scored
 
         Returns:
             List of tuples containing (document, score)
         """
         pass
 
+    async def asearch(self, query: str, k: Optional[int] = None,
+                      filter: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
+        """
+        Search without blocking the event loop.
+
+        Scoring is CPU-bound, so by default it runs on the shared bounded
+        executor; strategies with independent parts override this.
+
+        Args:
+            query: Search query string
+            k: Optional number of results to return, defaults to config value
+            filter: Optional Chroma-style metadata where clause
+
+        Returns:
+            List of tuples containing (document, score)
+        """
+        return await run_blocking(self.search, query, k, filter)
+
+    def bind_store(self, store: Any) -> None:
+        """Point the strategy at a reopened store, keeping its indexes."""
+        self.store = store
+
+    def warm(self) -> None:
+        """Build any lazily built indexes now; a no-op by default."""
+        pass
+
     def _validate_and_log_results(
         self, results: List[Tuple[Document, float]], query: str
     ) -> None:
@@ -0,0 +1,82 @@
+# scoring/binary_index.py
+from typing import List, Tuple
+import numpy as np
+
+# Popcount lookup for NumPy versions without np.bitwise_count
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def pack_signs(vectors: np.ndarray) -> np.ndarray:
+    """
+    Binarize vectors by sign and pack them into 64-bit words.
+
+    Args:
+        vectors: Array of shape (n, d) or (d,)
+
+    Returns:
+        Array of shape (n, ceil(d / 64)) of uint64 words
+    """
+    vectors = np.atleast_2d(vectors)
+    packed = np.packbits(vectors > 0, axis=1)
+    padding = (-packed.shape[1]) % 8
+    if padding:
+        packed = np.pad(packed, ((0, 0), (0, padding)))
+    return np.ascontiguousarray(packed).view(np.uint64)
+
+
+def hamming_distances(codes: np.ndarray, query_code: np.ndarray) -> np.ndarray:
+    """Hamming distance between every packed row and a packed query."""
+    xor = np.bitwise_xor(codes, query_code)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(xor).sum(axis=1, dtype=np.int32)
+    return _POPCOUNT_TABLE[xor.view(np.uint8)].sum(axis=1, dtype=np.int32)
+
+
+class BinaryIndex:
+    """
+    Sign-bit index for a Hamming first pass with exact cosine re-scoring.
+
+    With normalized embeddings the Hamming distance between sign bits tracks
+    the angle between vectors, so scanning 1 bit per dimension instead of 32
+    finds a candidate set that the full-precision vectors then re-rank.
+    """
+
+    def __init__(self, vectors: np.ndarray):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        self.vectors = vectors / np.maximum(norms, 1e-12)
+        self.codes = pack_signs(self.vectors)
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def search(self, query: np.ndarray, k: int, candidates: int,
+               rows: np.ndarray = None) -> List[Tuple[int, float]]:
+        """
+        Two-stage search over the index.
+
+        Args:
+            query: Query embedding
+            k: Number of results to return
+            candidates: Size of the Hamming candidate set re-scored exactly
+            rows: Optional subset of rows to search
+
+        Returns:
+            List of (row, cosine similarity) tuples, best first
+        """
+        query = np.asarray(query, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        if rows is None:
+            rows = np.arange(len(self.vectors))
+        if len(rows) == 0:
+            return []
+
+        # Stage 1: popcount Hamming scan over the packed sign bits
+        distances = hamming_distances(self.codes[rows], pack_signs(query)[0])
+        n_candidates = min(max(candidates, k), len(rows))
+        candidate_rows = rows[np.argpartition(distances, n_candidates - 1)[:n_candidates]]
+
+        # Stage 2: exact cosine on the candidate set only
+        similarities = self.vectors[candidate_rows] @ query
+        best = np.argsort(-similarities)[:k]
+        return [(int(candidate_rows[i]), float(similarities[i])) for i in best]
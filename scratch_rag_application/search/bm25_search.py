@@ -1,8 +1,152 @@
 # scoring/bm25_search.py
-from typing import List, Tuple, Optional
-from rank_bm25 import BM25Okapi
+from array import array
+from collections import Counter
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Tuple, Optional, Union
+import numpy as np
 from langchain_core.documents import Document
 from .base_search import BaseSearch
+from .corpus_store import CorpusStore
+from .metadata_filter import MetadataFilterIndex
+
+
+def _postings(texts: Iterable[str], vocabulary: Dict[str, int], first_row: int = 0
+              ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Tokenize texts into (term, row, frequency) postings and document lengths.
+
+    New terms are added to vocabulary.
+    """
+    # Packed arrays keep a large build at 4 bytes per posting
+    terms, rows, frequencies, lengths = array("i"), array("i"), array("i"), array("i")
+    for row, text in enumerate(texts, first_row):
+        tokens = text.lower().split()
+        counts = Counter(tokens)
+        terms.extend(vocabulary.setdefault(word, len(vocabulary)) for word in counts)
+        rows.extend([row] * len(counts))
+        frequencies.extend(counts.values())
+        lengths.append(len(tokens))
+    return tuple(np.frombuffer(values, dtype=np.int32)
+                 for values in (terms, rows, frequencies, lengths))
+
+
+class BM25Index:
+    """
+    Immutable BM25 index snapshot.
+
+    Every structure a query reads is built before the snapshot is
+    published, so a search holding one snapshot always sees postings, a
+    corpus and filter columns that belong together.
+
+    Postings are stored column-wise, sorted by term: the rows and term
+    frequencies of term t are rows[indptr[t]:indptr[t + 1]]. A query only
+    touches the postings of its terms. Scores follow BM25Okapi from
+    rank_bm25, including its idf floor of epsilon times the average idf.
+    """
+
+    __slots__ = ("corpus", "filter_index", "vocabulary", "indptr", "rows", "frequencies",
+                 "doc_len", "term_counts", "idf", "_norm", "k1", "b", "epsilon")
+
+    def __init__(self, documents: Union[CorpusStore, List[Document]],
+                 k1: float = 1.5, b: float = 0.75, epsilon: float = 0.25):
+        corpus = documents if isinstance(documents, CorpusStore) \
+            else CorpusStore.from_documents(documents)
+        vocabulary: Dict[str, int] = {}
+        terms, rows, frequencies, doc_len = _postings(corpus.texts(), vocabulary)
+        self._publish(corpus, vocabulary, terms, rows, frequencies, doc_len, k1, b, epsilon)
+
+    @classmethod
+    def _from_postings(cls, *parts) -> "BM25Index":
+        index = cls.__new__(cls)
+        index._publish(*parts)
+        return index
+
+    def _publish(self, corpus: CorpusStore, vocabulary: Dict[str, int],
+                 terms: np.ndarray, rows: np.ndarray, frequencies: np.ndarray,
+                 doc_len: np.ndarray, k1: float, b: float, epsilon: float) -> None:
+        """Sort the postings by term and precompute everything a query reads."""
+        self.corpus = corpus
+        # Filter columns are the corpus's own interned metadata
+        self.filter_index = MetadataFilterIndex(corpus.metadata)
+        self.vocabulary = MappingProxyType(vocabulary)
+        self.k1, self.b, self.epsilon = k1, b, epsilon
+
+        # A stable sort keeps each term's rows ascending
+        order = np.argsort(terms, kind="stable")
+        self.rows, self.frequencies = rows[order], frequencies[order]
+        # Per-term document counts, kept so updates can adjust idf incrementally
+        self.term_counts = np.bincount(terms, minlength=len(vocabulary))
+        self.indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(self.term_counts, out=self.indptr[1:])
+        self.doc_len = doc_len
+
+        # Same idf and its floor as BM25Okapi; terms no document holds score 0
+        size = len(doc_len)
+        present = self.term_counts > 0
+        counts = self.term_counts[present]
+        idf = np.log(size - counts + 0.5) - np.log(counts + 0.5)
+        floor = epsilon * idf.mean() if len(idf) else 0.0
+        self.idf = np.zeros(len(vocabulary))
+        self.idf[present] = np.where(idf < 0, floor, idf)
+        self._norm = k1 * (1 - b + b * doc_len / doc_len.mean()) if size else doc_len
+
+    def __len__(self) -> int:
+        return len(self.doc_len)
+
+    def scores(self, tokens: List[str]) -> np.ndarray:
+        """BM25 score of every row for a tokenized query."""
+        scores = np.zeros(len(self))
+        for token in tokens:
+            term = self.vocabulary.get(token)
+            if term is None or not self.idf[term]:
+                continue
+            start, end = self.indptr[term], self.indptr[term + 1]
+            rows, frequency = self.rows[start:end], self.frequencies[start:end]
+            scores[rows] += self.idf[term] * (
+                frequency * (self.k1 + 1) / (frequency + self._norm[rows]))
+        return scores
+
+    def updated(self, where: Optional[Dict[str, Any]],
+                added: List[Document]) -> Optional["BM25Index"]:
+        """
+        Derive a new snapshot without the documents matching where, plus added ones.
+
+        Only added documents are tokenized; the postings of kept documents
+        are renumbered in a few array operations, so the cost of an update
+        follows the size of the change plus a linear pass over the postings
+        rather than re-reading the corpus.
+
+        Args:
+            where: Metadata clause selecting documents to remove, or None
+            added: Documents to add
+
+        Returns:
+            The new snapshot, or None if it would be empty
+        """
+        removed = self.filter_index.select(where) if where else np.array([], dtype=int)
+        keep = np.ones(len(self), dtype=bool)
+        keep[removed] = False
+        kept_rows = np.flatnonzero(keep)
+        if not len(kept_rows) and not added:
+            return None
+
+        # Renumber the postings of kept rows, still grouped by term
+        renumbered = np.full(len(self), -1, dtype=np.int32)
+        renumbered[kept_rows] = np.arange(len(kept_rows), dtype=np.int32)
+        terms = np.repeat(np.arange(len(self.vocabulary), dtype=np.int32), self.term_counts)
+        kept = keep[self.rows]
+
+        vocabulary = dict(self.vocabulary)
+        added_terms, added_rows, added_frequencies, added_len = _postings(
+            (doc.page_content for doc in added), vocabulary, first_row=len(kept_rows))
+        return BM25Index._from_postings(
+            self.corpus.take(kept_rows).extend(added), vocabulary,
+            np.concatenate([terms[kept], added_terms]),
+            np.concatenate([renumbered[self.rows[kept]], added_rows]),
+            np.concatenate([self.frequencies[kept], added_frequencies]),
+            np.concatenate([self.doc_len[kept_rows], added_len]),
+            self.k1, self.b, self.epsilon)
 
 
 class BM25Search(BaseSearch):
@@ -10,16 +154,30 @@ class BM25Search(BaseSearch):
 
     def _initialize_search(self) -> None:
         """Initialize BM25 with empty index."""
-        self._scorer = None
-        self.documents = []
-        self.doc_mapping = {}  # Maps content to Document objects
+        # Readers take this reference once per query; writers replace it whole
+        self._index: Optional[BM25Index] = None
+        self._write_lock = threading.Lock()
+
+    @property
+    def corpus(self) -> Optional[CorpusStore]:
+        index = self._index
+        return index.corpus if index is not None else None
 
-    def initialize_documents(self, documents: List[Document]) -> bool:
+    @property
+    def documents(self) -> Tuple[str, ...]:
+        """Texts of the indexed documents, decoded from the corpus on each call."""
+        index = self._index
+        return tuple(index.corpus.texts()) if index is not None else ()
+
+    def initialize_documents(self, documents: Union[CorpusStore, List[Document]]) -> bool:
         """
         Initialize or update BM25 with documents.
 
+        The new index is built off to the side and published with a single
+        reference assignment; queries never wait for it.
+
         Args:
-            documents: List of Documents to index
+            documents: Documents to index, or a corpus already in compact form
 
         Returns:
             bool: True if initialization successful
@@ -28,15 +186,9 @@ class BM25Search(BaseSearch):
             self.logger.info(f"Initializing BM25 with {
                              len(documents)} documents")
 
-            # Store documents and create mapping
-            self.documents = [doc.page_content for doc in documents]
-            self.doc_mapping = {doc.page_content: doc for doc in documents}
-
-            # Tokenize documents for BM25
-            tokenized_docs = [doc.lower().split() for doc in self.documents]
-
-            # Create BM25 instance
-            self._scorer = BM25Okapi(tokenized_docs)
+            # Writers are serialized so an older build cannot overwrite a newer one
+            with self._write_lock:
+                self._index = BM25Index(documents)
 
             self.logger.info("BM25 initialization successful")
             return True
@@ -44,18 +196,49 @@ class BM25Search(BaseSearch):
             self.logger.error(f"Error initializing BM25: {str(e)}")
             return False
 
-    def search(self, query: str, k: Optional[int] = None) -> List[Tuple[Document, float]]:
+    def update_documents(self, where: Optional[Dict[str, Any]],
+                         documents: List[Document]) -> bool:
+        """
+        Remove documents matching a metadata clause and add new ones.
+
+        Args:
+            where: Metadata clause selecting documents to remove, or None
+            documents: Documents to add
+
+        Returns:
+            bool: True if the update was applied
+        """
+        try:
+            with self._write_lock:
+                index = self._index
+                if index is None:
+                    self._index = BM25Index(documents) if documents else None
+                else:
+                    self._index = index.updated(where, documents)
+            self.logger.info(
+                f"BM25 updated: {len(documents)} documents added, "
+                f"{len(self._index) if self._index is not None else 0} indexed")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error updating BM25: {str(e)}")
+            return False
+
+    def search(self, query: str, k: Optional[int] = None,
+               filter: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
         """
         Search documents using BM25 scoring.
 
         Args:
             query: Search query string
             k: Optional number of results to return
+            filter: Optional metadata where clause; only matching documents
+                are scored
 
         Returns:
             List of (Document, score) tuples sorted by relevance
         """
-        if not self._scorer:
+        index = self._index
+        if index is None:
             self.logger.error("BM25 not initialized")
             return []
 
@@ -63,18 +246,23 @@ class BM25Search(BaseSearch):
             k = k or self.k
             self.logger.info(f"Executing BM25 search for query: '{query}'")
 
-            # Tokenize query and get scores
+            # Tokenize query and get scores, restricted to filtered rows
             tokenized_query = query.lower().split()
-            scores = self._scorer.get_scores(tokenized_query)
+            rows = index.filter_index.select(filter)
+            if rows is None:
+                rows = np.arange(len(index))
+                scores = index.scores(tokenized_query)
+            elif len(rows) == 0:
+                return []
+            else:
+                scores = index.scores(tokenized_query)[rows]
 
-            # Create document-score pairs and sort
-            doc_scores = list(zip(self.documents, scores))
-            sorted_docs = sorted(
-                doc_scores, key=lambda x: x[1], reverse=True)[:k]
+            # Select the top k without sorting every document
+            top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+            top = top[np.argsort(-scores[top], kind='stable')]
 
-            # Convert to Document objects with scores
-            results = [(self.doc_mapping[doc], score)
-                       for doc, score in sorted_docs]
+            # Only the top k rows become Document objects
+            results = [(index.corpus.document(rows[i]), scores[i]) for i in top]
 
             self._validate_and_log_results(results, query)
             return results
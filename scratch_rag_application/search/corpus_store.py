@@ -0,0 +1,240 @@
+# scoring/corpus_store.py
+from array import array
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from langchain_core.documents import Document
+
+
+class MetadataColumns:
+    """
+    Document metadata as one integer column per field.
+
+    Every distinct value of a field is stored once; each row holds the
+    code of its value, or -1 where the field is missing. Rows are
+    immutable; take() and extend() return new columns, and only builders
+    grow columns in place, through encode() and append_encoded().
+    """
+
+    __slots__ = ("size", "_values", "_codes", "_columns")
+
+    def __init__(self, metadatas: Sequence[Optional[Dict[str, Any]]] = ()):
+        self.size = 0
+        self._values: Dict[str, List[Any]] = {}
+        self._codes: Dict[str, Dict[Hashable, int]] = {}
+        self._columns: Dict[str, np.ndarray] = {}
+        self.append_encoded(len(metadatas), self.encode(metadatas))
+
+    def encode(self, metadatas: Sequence[Optional[Dict[str, Any]]],
+               start: Optional[int] = None) -> Dict[str, Tuple[List[int], List[int]]]:
+        """
+        Intern the values of rows numbered from start, without adding the rows.
+
+        Args:
+            metadatas: Metadata of consecutive rows
+            start: Number of the first row, defaults to the next row
+
+        Returns:
+            (rows, codes) per field, for append_encoded()
+        """
+        start = self.size if start is None else start
+        added: Dict[str, Tuple[List[int], List[int]]] = {}
+        for row, metadata in enumerate(metadatas, start):
+            for field, value in (metadata or {}).items():
+                codes = self._codes.setdefault(field, {})
+                code = codes.get(value)
+                if code is None:
+                    code = codes[value] = len(codes)
+                    self._values.setdefault(field, []).append(value)
+                rows_codes = added.setdefault(field, ([], []))
+                rows_codes[0].append(row)
+                rows_codes[1].append(code)
+        return added
+
+    def append_encoded(self, size: int,
+                       encoded: Dict[str, Tuple[Sequence[int], Sequence[int]]]) -> None:
+        """
+        Grow the columns to size rows in place, in one pass.
+
+        Lets a builder encode() many pages and append them all at once
+        instead of copying every column per page. Only for columns no
+        reader holds yet; extend() is the copying form.
+
+        Args:
+            size: Row count after the append
+            encoded: (rows, codes) per field from encode(); fields missing
+                from a new row are left at -1
+        """
+        start = self.size
+        self.size = size
+        for field in self._codes:
+            column = np.full(size, -1, dtype=np.int32)
+            if field in self._columns:
+                column[:start] = self._columns[field]
+            if field in encoded:
+                rows, codes = encoded[field]
+                column[np.asarray(rows, dtype=np.intp)] = np.asarray(codes)
+            self._columns[field] = column
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the code columns."""
+        return sum(column.nbytes for column in self._columns.values())
+
+    def row(self, row: int) -> Dict[str, Any]:
+        """Metadata dict of one row."""
+        return {field: self._values[field][code]
+                for field, column in self._columns.items()
+                if (code := column[row]) >= 0}
+
+    def present(self, field: str) -> np.ndarray:
+        """Boolean mask of the rows that have field."""
+        if field not in self._columns:
+            return np.zeros(self.size, dtype=bool)
+        return self._columns[field] >= 0
+
+    def equals(self, field: str, value: Any) -> np.ndarray:
+        """Boolean mask of the rows whose field holds value."""
+        code = self._codes.get(field, {}).get(value)
+        if code is None:
+            return np.zeros(self.size, dtype=bool)
+        return self._columns[field] == code
+
+    def _copy(self, columns: Dict[str, np.ndarray], size: int) -> "MetadataColumns":
+        copy = MetadataColumns.__new__(MetadataColumns)
+        copy.size = size
+        # Readers may hold this instance, so the value tables are copied
+        # rather than appended to; values no row uses any more are harmless
+        copy._values = {field: list(values) for field, values in self._values.items()}
+        copy._codes = {field: dict(codes) for field, codes in self._codes.items()}
+        copy._columns = columns
+        return copy
+
+    def take(self, rows: np.ndarray) -> "MetadataColumns":
+        """Columns of the given rows, in that order."""
+        rows = np.asarray(rows, dtype=np.intp)
+        return self._copy({field: column[rows] for field, column in self._columns.items()},
+                          len(rows))
+
+    def extend(self, metadatas: Sequence[Optional[Dict[str, Any]]]) -> "MetadataColumns":
+        """New columns with rows appended for the given metadata."""
+        extended = self._copy(dict(self._columns), self.size)
+        extended.append_encoded(self.size + len(metadatas), extended.encode(metadatas))
+        return extended
+
+
+class CorpusStore:
+    """
+    Compact, immutable corpus for in-memory search structures.
+
+    Texts live in one contiguous UTF-8 buffer addressed by an offsets
+    array, and metadata in interned integer columns, so a corpus costs
+    about its encoded size instead of a string, a Document and a metadata
+    dict per row. Rows are integer ids; Document objects are only built
+    for the rows a search returns.
+    """
+
+    __slots__ = ("_buffer", "_offsets", "metadata")
+
+    def __init__(self, texts: Iterable[str],
+                 metadatas: Sequence[Optional[Dict[str, Any]]]):
+        encoded = [text.encode("utf-8") for text in texts]
+        self._buffer = b"".join(encoded)
+        self._offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(text) for text in encoded], out=self._offsets[1:])
+        self.metadata = metadatas if isinstance(metadatas, MetadataColumns) \
+            else MetadataColumns(metadatas)
+
+    @classmethod
+    def from_documents(cls, documents: Sequence[Document]) -> "CorpusStore":
+        return cls((doc.page_content for doc in documents),
+                   [doc.metadata for doc in documents])
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the text buffer, the offsets and the metadata columns."""
+        return len(self._buffer) + self._offsets.nbytes + self.metadata.nbytes
+
+    def text(self, row: int) -> str:
+        return self._buffer[self._offsets[row]:self._offsets[row + 1]].decode("utf-8")
+
+    def texts(self) -> Iterator[str]:
+        """Every text, in row order."""
+        for row in range(len(self)):
+            yield self.text(row)
+
+    def document(self, row: int) -> Document:
+        """A new Document for one row."""
+        return Document(page_content=self.text(row), metadata=self.metadata.row(row))
+
+    def take(self, rows: np.ndarray) -> "CorpusStore":
+        """Corpus of the given rows, in that order."""
+        rows = np.asarray(rows, dtype=np.intp)
+        taken = CorpusStore.__new__(CorpusStore)
+        starts, ends = self._offsets[rows], self._offsets[rows + 1]
+        view = memoryview(self._buffer)
+        taken._buffer = b"".join(view[start:end] for start, end in zip(starts, ends))
+        taken._offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(ends - starts, out=taken._offsets[1:])
+        taken.metadata = self.metadata.take(rows)
+        return taken
+
+    def extend(self, documents: Sequence[Document]) -> "CorpusStore":
+        """New corpus with the documents appended."""
+        added = CorpusStore.from_documents(documents)
+        extended = CorpusStore.__new__(CorpusStore)
+        extended._buffer = self._buffer + added._buffer
+        extended._offsets = np.concatenate([self._offsets, added._offsets[1:] + len(self._buffer)])
+        extended.metadata = self.metadata.extend([doc.metadata for doc in documents])
+        return extended
+
+
+class CorpusBuilder:
+    """
+    Accumulate pages of store rows into a CorpusStore.
+
+    Each page is encoded and interned as it arrives, so only one page of
+    strings and metadata dicts is alive at a time.
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self) -> None:
+        self._buffer = bytearray()
+        self._offsets = array("q", [0])
+        self._metadata = MetadataColumns()
+        # Row numbers and codes per field, packed to bound the memory of large builds
+        self._coded: Dict[str, Tuple[array, array]] = {}
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def add(self, texts: Iterable[str],
+            metadatas: Sequence[Optional[Dict[str, Any]]]) -> None:
+        """Append one page of texts and their metadata."""
+        start = len(self)
+        for text in texts:
+            self._buffer += text.encode("utf-8")
+            self._offsets.append(len(self._buffer))
+        for field, (rows, codes) in self._metadata.encode(metadatas, start).items():
+            coded = self._coded.setdefault(field, (array("q"), array("i")))
+            coded[0].extend(rows)
+            coded[1].extend(codes)
+
+    def build(self) -> CorpusStore:
+        """Hand the accumulated rows to a CorpusStore and empty the builder."""
+        corpus = CorpusStore.__new__(CorpusStore)
+        # The buffers move to the corpus without a copy; the builder drops
+        # its references, so nothing can append to them afterwards
+        corpus._buffer = self._buffer
+        corpus._offsets = np.frombuffer(self._offsets, dtype=np.int64)
+        self._metadata.append_encoded(len(self), self._coded)
+        corpus.metadata = self._metadata
+        self._reset()
+        return corpus
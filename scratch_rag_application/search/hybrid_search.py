@@ -1,13 +1,29 @@
 # scoring/hybrid_search.py
-from typing import List, Tuple, Optional
+import asyncio
+from typing import Any, Dict, List, Tuple, Optional, Union
 from langchain_core.documents import Document
+from ..embedding.batching import QueryEmbeddingError
 from .base_search import BaseSearch
 from .bm25_search import BM25Search
+from .corpus_store import CorpusStore
 from .vector_search import VectorSearch
 
 
 class HybridSearch(BaseSearch):
-    """Hybrid search combining BM25 and vector similarity."""
+    """
+    Hybrid search combining BM25 and vector similarity.
+
+    The BM25 and vector searchers may be passed in to share the indexes of
+    strategies the store already maintains; a hybrid search sharing them
+    leaves index maintenance to their owner.
+    """
+
+    def __init__(self, params: Dict[str, Any], store: Any = None,
+                 bm25_searcher: Optional[BM25Search] = None,
+                 vector_searcher: Optional[VectorSearch] = None):
+        self.shares_components = bm25_searcher is not None and vector_searcher is not None
+        self._components = (bm25_searcher, vector_searcher)
+        super().__init__(params, store)
 
     def _initialize_search(self) -> None:
         """Initialize both BM25 and vector search components."""
@@ -19,21 +35,42 @@ class HybridSearch(BaseSearch):
         self.vector_weight = self.params.get(
             "scoring.hybrid.vector_weight", 0.7)
 
-        # Initialize individual searchers
-        self.bm25_searcher = BM25Search(self.params)
-        self.vector_searcher = VectorSearch(self.params, self.store)
+        # Initialize individual searchers unless shared ones were given
+        bm25_searcher, vector_searcher = self._components
+        self.bm25_searcher = bm25_searcher or BM25Search(self.params)
+        self.vector_searcher = vector_searcher or VectorSearch(self.params, self.store)
 
-    def initialize_documents(self, documents: List[Document]) -> bool:
-        """Initialize BM25 with documents."""
+    def initialize_documents(self, documents: Union[CorpusStore, List[Document]]) -> bool:
+        """Initialize BM25 with documents and rebuild a published vector index."""
+        if self.shares_components:
+            return True
+        self.vector_searcher.reset_index()
         return self.bm25_searcher.initialize_documents(documents)
 
-    def search(self, query: str, k: Optional[int] = None) -> List[Tuple[Document, float]]:
+    def update_documents(self, where: Optional[Dict[str, Any]],
+                         documents: List[Document]) -> bool:
+        """Apply an incremental change to BM25 and rebuild a published vector index."""
+        if self.shares_components:
+            return True
+        self.vector_searcher.reset_index()
+        return self.bm25_searcher.update_documents(where, documents)
+
+    def bind_store(self, store: Any) -> None:
+        super().bind_store(store)
+        self.vector_searcher.bind_store(store)
+
+    def warm(self) -> None:
+        self.vector_searcher.warm()
+
+    def search(self, query: str, k: Optional[int] = None,
+               filter: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
         """
         Execute hybrid search combining BM25 and vector similarity.
 
         Args:
             query: Search query string
             k: Optional number of results to return
+            filter: Optional metadata where clause applied to both legs
 
         Returns:
             List of (Document, score) tuples sorted by relevance
@@ -43,8 +80,8 @@ class HybridSearch(BaseSearch):
             self.logger.info(f"Executing hybrid search for query: '{query}'")
 
             # Get results from both searches
-            vector_results = self.vector_searcher.search(query, k=k)
-            bm25_results = self.bm25_searcher.search(query, k=k)
+            vector_results = self.vector_searcher.search(query, k=k, filter=filter)
+            bm25_results = self.bm25_searcher.search(query, k=k, filter=filter)
 
             # Combine results
             combined_results = self._combine_results(
@@ -57,6 +94,30 @@ class HybridSearch(BaseSearch):
             self.logger.error(f"Error in hybrid search: {str(e)}")
             return []
 
+    async def asearch(self, query: str, k: Optional[int] = None,
+                      filter: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
+        """Run the vector and BM25 legs concurrently, then combine them."""
+        try:
+            k = k or self.k
+            self.logger.info(f"Executing hybrid search for query: '{query}'")
+
+            vector_results, bm25_results = await asyncio.gather(
+                self.vector_searcher.asearch(query, k=k, filter=filter),
+                self.bm25_searcher.asearch(query, k=k, filter=filter)
+            )
+
+            combined_results = self._combine_results(
+                vector_results, bm25_results)
+
+            self._validate_and_log_results(combined_results[:k], query)
+            return combined_results[:k]
+
+        except QueryEmbeddingError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error in hybrid search: {str(e)}")
+            return []
+
     def _combine_results(
         self,
         vector_results: List[Tuple[Document, float]],
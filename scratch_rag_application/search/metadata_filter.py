@@ -0,0 +1,124 @@
+# scoring/metadata_filter.py
+from typing import Any, Dict, Optional, Sequence, Union
+import numpy as np
+from .corpus_store import MetadataColumns
+
+# Stands in for the value of a field a document does not have
+_MISSING = object()
+
+
+def matches_filter(metadata: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """
+    Evaluate a Chroma-style where clause against a single metadata dict.
+
+    Supports field equality, $eq, $ne, $in, $nin, $and and $or. As in
+    Chroma, a condition on a field never matches documents without it,
+    not even $ne or $nin.
+
+    Args:
+        metadata: Document metadata
+        where: Filter clause, or None to match everything
+
+    Returns:
+        bool: True if the metadata satisfies the filter
+    """
+    if not where:
+        return True
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif not _matches_condition(metadata.get(key, _MISSING), condition):
+            return False
+    return True
+
+
+def _matches_condition(value: Any, condition: Any) -> bool:
+    if not isinstance(condition, dict):
+        return value == condition
+    for operator, operand in condition.items():
+        if operator not in ("$eq", "$ne", "$in", "$nin"):
+            raise ValueError(f"Unsupported filter operator: {operator}")
+        if value is _MISSING:
+            # A missing field matches no operator, not even $ne or $nin
+            return False
+        if operator == "$eq" and value != operand:
+            return False
+        if operator == "$ne" and value == operand:
+            return False
+        if operator == "$in" and value not in operand:
+            return False
+        if operator == "$nin" and value in operand:
+            return False
+    return True
+
+
+class MetadataFilterIndex:
+    """
+    Filter index over interned metadata columns.
+
+    Each field is a column of integer value codes, so a (field, value)
+    condition resolves to a row mask with one vectorized comparison and a
+    filter to candidate rows with a few bitwise operations, instead of a
+    scan over every metadata dict. Nothing is stored per (field, value)
+    pair, so fields with a distinct value per chunk cost no more memory
+    than any other.
+    """
+
+    def __init__(self, metadatas: Union[MetadataColumns, Sequence[Optional[Dict[str, Any]]]]):
+        self.columns = metadatas if isinstance(metadatas, MetadataColumns) \
+            else MetadataColumns(metadatas)
+        self.size = len(self.columns)
+
+    def _condition_mask(self, field: str, condition: Any) -> np.ndarray:
+        if not isinstance(condition, dict):
+            return self.columns.equals(field, condition)
+
+        # Rows without the field match no condition on it, as in Chroma
+        mask = self.columns.present(field)
+        for operator, operand in condition.items():
+            if operator == "$eq":
+                mask &= self.columns.equals(field, operand)
+            elif operator == "$ne":
+                mask &= ~self.columns.equals(field, operand)
+            elif operator in ("$in", "$nin"):
+                union = np.zeros(self.size, dtype=bool)
+                for value in operand:
+                    union |= self.columns.equals(field, value)
+                mask &= union if operator == "$in" else ~union
+            else:
+                raise ValueError(f"Unsupported filter operator: {operator}")
+        return mask
+
+    def mask(self, where: Dict[str, Any]) -> np.ndarray:
+        """Resolve a where clause to a boolean mask of matching rows."""
+        mask = np.ones(self.size, dtype=bool)
+        for key, condition in where.items():
+            if key == "$and":
+                for clause in condition:
+                    mask &= self.mask(clause)
+            elif key == "$or":
+                union = np.zeros(self.size, dtype=bool)
+                for clause in condition:
+                    union |= self.mask(clause)
+                mask &= union
+            else:
+                mask &= self._condition_mask(key, condition)
+        return mask
+
+    def select(self, where: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """
+        Resolve a where clause to the sorted row indices that match it.
+
+        Args:
+            where: Filter clause
+
+        Returns:
+            Array of matching rows, or None when there is no filter
+        """
+        if not where:
+            return None
+        return np.flatnonzero(self.mask(where))
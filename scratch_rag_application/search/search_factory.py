@@ -1,5 +1,5 @@
 # scoring/search_factory.py
-from typing import Dict, Type, Any
+from typing import Dict, Type, Any, List, Optional
 from .base_search import BaseSearch
 from .bm25_search import BM25Search
 from .vector_search import VectorSearch
@@ -18,20 +18,30 @@ class SearchFactory:
     def __init__(self, config: dict):
         self.config = config
 
-    def create_searcher(self, store: Any = None) -> BaseSearch:
+    @classmethod
+    def search_types(cls) -> List[str]:
+        """Return the names of the registered search strategies."""
+        return list(cls._searchers)
+
+    def create_searcher(self, store: Any = None,
+                        search_type: Optional[str] = None,
+                        **components: BaseSearch) -> BaseSearch:
         """
         Create and return a search implementation.
 
         Args:
             store: Optional vector store instance for strategies that need it
+            search_type: Optional strategy name overriding scoring.type
+            **components: Already built searchers a composite strategy
+                reuses, e.g. bm25_searcher and vector_searcher for hybrid
 
         Returns:
             BaseSearch: Instance of the configured search implementation
         """
-        search_type = self.config.get("scoring.type", "hybrid")
+        search_type = search_type or self.config.get("scoring.type", "hybrid")
         search_class = self._searchers.get(search_type)
 
         if not search_class:
             raise ValueError(f"Unsupported search type: {search_type}")
 
-        return search_class(self.config, store)
+        return search_class(self.config, store, **components)
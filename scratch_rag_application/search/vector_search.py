@@ -1,24 +1,159 @@
 # scoring/vector_search.py
-from typing import List, Tuple, Optional
+import threading
+from typing import Any, Dict, List, Tuple, Optional
+import numpy as np
 from langchain_core.documents import Document
 from .base_search import BaseSearch
+from .binary_index import BinaryIndex
+from .corpus_store import CorpusBuilder, CorpusStore
+from .metadata_filter import MetadataFilterIndex
+from ..utils.executor import run_blocking
+from ..utils.paging import iter_pages
+
+
+class BinarySnapshot:
+    """Immutable binary index with the corpus and filter columns it was built from."""
+
+    __slots__ = ("index", "corpus", "filter_index")
+
+    def __init__(self, index: BinaryIndex, corpus: CorpusStore):
+        self.index = index
+        self.corpus = corpus
+        self.filter_index = MetadataFilterIndex(corpus.metadata)
 
 
 class VectorSearch(BaseSearch):
     """Pure vector-based search implementation."""
 
     def _initialize_search(self) -> None:
-        """No additional initialization needed for vector search."""
+        """Read the search mode; the binary index is built on first use or warm()."""
         if not self.store:
             raise ValueError("Vector store is required for vector search")
 
-    def search(self, query: str, k: Optional[int] = None) -> List[Tuple[Document, float]]:
+        self.mode = self.params.get("scoring.vector.mode", "exact")
+        if self.mode not in ("exact", "binary"):
+            raise ValueError(f"Unsupported vector search mode: {self.mode}")
+        self.candidates = self.params.get(
+            "scoring.vector.binary.candidates", 100)
+        # Readers take this reference once per query; rebuilds replace it whole
+        self._binary: Optional[BinarySnapshot] = None
+        self._write_lock = threading.Lock()
+
+    def reset_index(self) -> None:
+        """
+        Rebuild a published binary index after the store changed.
+
+        Runs on the writer's thread: queries keep reading the previous
+        snapshot until the new one is swapped in, and never rebuild it
+        themselves.
+        """
+        if self.mode == "binary" and self._binary is not None:
+            with self._write_lock:
+                self._build_binary_index()
+
+    def warm(self) -> None:
+        """Build the binary index up front instead of on the first query."""
+        if self.mode == "binary":
+            self._snapshot()
+
+    def _snapshot(self) -> Optional[BinarySnapshot]:
+        """Current snapshot, built once if none has been published yet."""
+        snapshot = self._binary
+        if snapshot is None:
+            # Concurrent first queries wait for a single build
+            with self._write_lock:
+                snapshot = self._binary or self._build_binary_index()
+        return snapshot
+
+    def _build_binary_index(self) -> Optional[BinarySnapshot]:
+        """
+        Load embeddings from the store, pack their sign bits and publish the snapshot.
+
+        Callers hold the write lock, so an older build cannot overwrite a
+        newer one.
+        """
+        # Pages are converted as they arrive, so only one page of embedding
+        # lists and texts is alive alongside the float32 matrix
+        blocks: List[np.ndarray] = []
+        corpus = CorpusBuilder()
+        for page in iter_pages(self.store.get, self.params.get("vectorstore.page_size", 1000),
+                               include=["embeddings", "documents", "metadatas"]):
+            if page['embeddings'] is None or len(page['embeddings']) == 0:
+                continue
+            blocks.append(np.asarray(page['embeddings'], dtype=np.float32))
+            corpus.add(page['documents'], page['metadatas'])
+        if not blocks:
+            self.logger.warning("No embeddings available for binary index")
+            # An emptied store must not keep serving the previous snapshot
+            self._binary = None
+            return None
+
+        snapshot = BinarySnapshot(BinaryIndex(np.concatenate(blocks)), corpus.build())
+        self._binary = snapshot
+        self.logger.info(
+            f"Built binary index over {len(snapshot.index)} vectors "
+            f"({snapshot.index.codes.nbytes} bytes of sign bits)")
+        return snapshot
+
+    def _binary_search(self, query_vector: List[float], k: int,
+                       filter: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
+        """Hamming first pass over sign bits, then exact cosine re-scoring."""
+        snapshot = self._snapshot()
+        if snapshot is None:
+            return []
+
+        # Only rows passing the filter are scanned
+        rows = snapshot.filter_index.select(filter)
+        return [
+            (snapshot.corpus.document(row), 1.0 - similarity)
+            for row, similarity in snapshot.index.search(
+                query_vector, k, self.candidates, rows)
+        ]
+
+    def search(self, query: str, k: Optional[int] = None,
+               filter: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
         """
         Search documents using vector similarity.
 
         Args:
             query: Search query string
             k: Optional number of results to return
+            filter: Optional metadata where clause pushed down to the store
+
+        Returns:
+            List of (Document, score) tuples sorted by relevance
+        """
+        try:
+            k = k or self.k
+            self.logger.info(f"Executing vector search for query: '{query}'")
+
+            if self.mode == "binary":
+                results = self._binary_search(
+                    self.store.embeddings.embed_query(query), k, filter)
+            else:
+                # Use the vector store's similarity search with a where clause
+                results = self.store.similarity_search_with_score(
+                    query, k=k, filter=filter)
+
+            self._validate_and_log_results(results, query)
+            return results
+
+        except Exception as e:
+            self.logger.error(f"Error in vector search: {str(e)}")
+            return []
+
+    def search_by_vector(self, query: str, query_vector: List[float],
+                         k: Optional[int] = None,
+                         filter: Optional[Dict[str, Any]] = None
+                         ) -> List[Tuple[Document, float]]:
+        """
+        Search with a query that has already been embedded.
+
+        Args:
+            query: Search query string, used for logging
+            query_vector: Embedding of the query
+            k: Optional number of results to return
+            filter: Optional metadata where clause pushed down to the store
 
         Returns:
             List of (Document, score) tuples sorted by relevance
@@ -27,8 +162,11 @@ class VectorSearch(BaseSearch):
             k = k or self.k
             self.logger.info(f"Executing vector search for query: '{query}'")
 
-            # Use the vector store's similarity search
-            results = self.store.similarity_search_with_score(query, k=k)
+            if self.mode == "binary":
+                results = self._binary_search(query_vector, k, filter)
+            else:
+                results = self.store.similarity_search_by_vector_with_relevance_scores(
+                    query_vector, k=k, filter=filter)
 
             self._validate_and_log_results(results, query)
             return results
@@ -36,3 +174,28 @@ class VectorSearch(BaseSearch):
         except Exception as e:
             self.logger.error(f"Error in vector search: {str(e)}")
             return []
+
+    async def asearch(self, query: str, k: Optional[int] = None,
+                      filter: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
+        """
+        Await the query embedding on the event loop, then score on the executor.
+
+        An embedder with its own aembed_query (the batching embedder) is
+        awaited without holding an executor thread while its batch fills;
+        only the scoring runs on the shared executor. Stores that cannot
+        search by vector fall back to running search() there.
+        """
+        embeddings = getattr(self.store, "embeddings", None)
+        by_vector = self.mode == "binary" or hasattr(
+            self.store, "similarity_search_by_vector_with_relevance_scores")
+        if not by_vector or not hasattr(embeddings, "aembed_query"):
+            return await super().asearch(query, k, filter)
+
+        try:
+            query_vector = await embeddings.aembed_query(query)
+        except Exception as e:
+            # Searching without a vector would look like "no results";
+            # the caller reports the failure instead
+            self.logger.error(f"Error embedding query: {str(e)}")
+            raise
+        return await run_blocking(self.search_by_vector, query, query_vector, k, filter)
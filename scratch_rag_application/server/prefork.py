@@ -0,0 +1,256 @@
+# server/prefork.py
+import asyncio
+import gc
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from functools import partial
+from typing import Any, Dict, List, Optional
+from scratch_rag_application.config.config_handler import ConfigHandler
+from .query_server import QueryServer
+
+# Fields summed from /proc/<pid>/smaps_rollup into each memory figure
+_MEMORY_FIELDS = {
+    "rss_mb": ("Rss",),
+    "pss_mb": ("Pss",),
+    "shared_mb": ("Shared_Clean", "Shared_Dirty"),
+    "private_mb": ("Private_Clean", "Private_Dirty")
+}
+
+
+def read_memory(pid: int) -> Dict[str, float]:
+    """
+    Read a process's memory usage from /proc.
+
+    PSS (proportional set size) splits each shared page between the
+    processes mapping it, so summing PSS over the workers gives the real
+    footprint of the pool, while summing RSS counts shared indexes N times.
+
+    Args:
+        pid: Process id
+
+    Returns:
+        Dict of rss_mb, pss_mb, shared_mb and private_mb, or {} if unavailable
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            values = {}
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                    values[parts[0][:-1]] = int(parts[1])
+    except OSError:
+        return {}
+    return {
+        name: round(sum(values.get(field, 0) for field in fields) / 1024, 1)
+        for name, fields in _MEMORY_FIELDS.items()
+    }
+
+
+class WorkerStats:
+    """Per-worker request counters in shared memory, one writer per slot."""
+
+    _FIELDS = 4  # pid, start time, requests, busy seconds
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._values = multiprocessing.RawArray('d', workers * self._FIELDS)
+
+    def reset(self, slot: int, pid: int) -> None:
+        """Claim a slot for a (re)started worker process."""
+        base = slot * self._FIELDS
+        self._values[base:base + self._FIELDS] = [pid, time.time(), 0, 0]
+
+    def record(self, slot: int, seconds: float) -> None:
+        """Count a finished query for a worker slot."""
+        base = slot * self._FIELDS
+        self._values[base + 2] += 1
+        self._values[base + 3] += seconds
+
+    def snapshot(self, slot: int) -> Dict[str, Any]:
+        base = slot * self._FIELDS
+        pid, started, requests, busy = self._values[base:base + self._FIELDS]
+        uptime = max(time.time() - started, 1e-9) if started else 0.0
+        return {
+            "worker": slot,
+            "pid": int(pid),
+            "requests": int(requests),
+            "requests_per_second": round(requests / uptime, 2) if uptime else 0.0,
+            "mean_latency_ms": round(busy / requests * 1000, 2) if requests else 0.0
+        }
+
+
+class PreforkServer:
+    """
+    Multi-process query server sharing read-only indexes between workers.
+
+    The parent opens the vector store and builds every search index (BM25,
+    binary codes, metadata filter index) once, freezes the heap out of the
+    garbage collector and forks the workers, which inherit the indexes
+    copy-on-write and accept connections on one shared socket.
+    Memory-mapped vectors (numpy store) are shared through the page cache.
+
+    The embedding model is not loaded in the parent: torch and onnxruntime
+    thread pools started before fork deadlock or misbehave in the
+    children. Each worker caps torch's intra-op threads at its share of
+    the cores, then loads its own model, reopens its store client and
+    starts its embedding thread.
+    """
+
+    def __init__(self, config: ConfigHandler, host: Optional[str] = None,
+                 port: Optional[int] = None, workers: Optional[int] = None):
+        self.logger = logging.getLogger(__name__)
+        self.config = config
+        self.workers = workers or config.get("server.workers.count", 1)
+        self.report_interval = config.get("server.workers.report_interval", 60)
+
+        self.server = QueryServer(config, host, port, defer_model=True)
+        self.logger.info("Building search indexes before forking workers")
+        self.server.vector_store.warm_search_indexes()
+
+        self.stats = WorkerStats(self.workers)
+        self._parent_pid = os.getpid()
+        self.sock: Optional[socket.socket] = None
+        self._children: Dict[int, int] = {}  # pid -> slot
+        self._stopping = False
+
+    def _limit_torch_threads(self) -> None:
+        """Give each worker's torch intra-op pool its share of the cores."""
+        threads = self.config.get("server.workers.torch_threads") or \
+            max(1, (os.cpu_count() or 1) // self.workers)
+        try:
+            import torch
+        except ImportError:
+            return
+        torch.set_num_threads(threads)
+
+    def _bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.server.host, self.server.port))
+        sock.listen(self.config.get("server.workers.backlog", 1024))
+        sock.setblocking(False)
+        return sock
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Per-worker throughput and memory, plus pool totals for node sizing.
+
+        Returns:
+            Dict with one entry per worker, the parent's memory and totals
+        """
+        workers: List[Dict[str, Any]] = []
+        for slot in range(self.workers):
+            row = self.stats.snapshot(slot)
+            row.update(read_memory(row["pid"]) if row["pid"] else {})
+            workers.append(row)
+
+        parent = read_memory(self._parent_pid)
+        processes = workers + [parent]
+        return {
+            "workers": workers,
+            "parent": parent,
+            "total": {
+                "requests_per_second": round(
+                    sum(row["requests_per_second"] for row in workers), 2),
+                # Real footprint of the pool; RSS double-counts shared pages
+                "pss_mb": round(sum(row.get("pss_mb", 0) for row in processes), 1),
+                "rss_mb": round(sum(row.get("rss_mb", 0) for row in processes), 1)
+            }
+        }
+
+    def _log_report(self) -> None:
+        report = self.report()
+        for row in report["workers"]:
+            self.logger.info(
+                f"Worker {row['worker']} (pid {row['pid']}): "
+                f"{row['requests']} requests, {row['requests_per_second']} req/s, "
+                f"{row['mean_latency_ms']} ms mean, "
+                f"PSS {row.get('pss_mb', 0)} MB "
+                f"(shared {row.get('shared_mb', 0)} MB, "
+                f"private {row.get('private_mb', 0)} MB)")
+        total = report["total"]
+        self.logger.info(
+            f"Pool: {total['requests_per_second']} req/s, "
+            f"PSS {total['pss_mb']} MB vs RSS {total['rss_mb']} MB")
+
+    def _spawn(self, slot: int) -> None:
+        pid = os.fork()
+        if pid:
+            self._children[pid] = slot
+            return
+
+        # Worker process: never return into the parent's control flow
+        code = 0
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            self.stats.reset(slot, os.getpid())
+            self._limit_torch_threads()
+            self.server.after_fork()
+            self.server.query_observers.append(partial(self.stats.record, slot))
+            self.server.metric_sources["workers"] = self.report
+            asyncio.run(self.server.run(self.sock))
+        except Exception as e:
+            self.logger.error(f"Worker {slot} failed: {str(e)}")
+            code = 1
+        finally:
+            os._exit(code)
+
+    def _handle_signal(self, signum: int, frame: Any) -> None:
+        self._stopping = True
+
+    def _reap(self) -> None:
+        """Collect exited workers and replace them unless shutting down."""
+        while self._children:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                return
+            slot = self._children.pop(pid, None)
+            if slot is not None and not self._stopping:
+                self.logger.warning(
+                    f"Worker {slot} (pid {pid}) exited with status {status}, restarting")
+                self._spawn(slot)
+
+    def run(self) -> None:
+        """Fork the workers and supervise them until SIGINT/SIGTERM."""
+        self.sock = self._bind()
+
+        # Keep the GC from writing to (and so un-sharing) pre-fork objects
+        gc.collect()
+        gc.freeze()
+
+        previous = {sig: signal.signal(sig, self._handle_signal)
+                    for sig in (signal.SIGINT, signal.SIGTERM)}
+        for slot in range(self.workers):
+            self._spawn(slot)
+        self.logger.info(
+            f"Serving on http://{self.server.host}:{self.server.port} "
+            f"with {self.workers} workers")
+
+        next_report = time.monotonic() + self.report_interval
+        try:
+            while not self._stopping:
+                time.sleep(0.5)
+                self._reap()
+                if self.report_interval and time.monotonic() >= next_report:
+                    self._log_report()
+                    next_report = time.monotonic() + self.report_interval
+        finally:
+            self.logger.info("Stopping workers")
+            self._log_report()
+            for pid in list(self._children):
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+            for pid in list(self._children):
+                os.waitpid(pid, 0)
+            self._children = {}
+            self.sock.close()
+            gc.unfreeze()
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
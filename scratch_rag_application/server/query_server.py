@@ -0,0 +1,244 @@
+# server/query_server.py
+import asyncio
+import logging
+import signal
+import socket
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from aiohttp import web
+from langchain_core.documents import Document
+from scratch_rag_application.config.config_handler import ConfigHandler
+from scratch_rag_application.embedding.batching import BatchingEmbedding
+from scratch_rag_application.embedding.deferred import DeferredEmbedding
+from scratch_rag_application.embedding.embedding_factory import EmbeddingFactory
+from scratch_rag_application.loader.reindex import delete_sources, reindex_sources
+from scratch_rag_application.search.search_factory import SearchFactory
+from scratch_rag_application.utils.executor import configure_executor, reset_executor
+from scratch_rag_application.utils.metrics import Histogram
+from scratch_rag_application.vector_store.vector_store_factory import VectorStoreFactory
+
+
+class QueryServer:
+    """
+    Long-running HTTP/JSON query server.
+
+    The embedder, vector store and search strategy are built once at
+    startup and reused for every request, so queries no longer pay for
+    imports, model loading and BM25 index builds.
+    """
+
+    def __init__(self, config: ConfigHandler, host: Optional[str] = None,
+                 port: Optional[int] = None, defer_model: bool = False):
+        """
+        Args:
+            config: Configuration handler instance
+            host: Optional host overriding server.host
+            port: Optional port overriding server.port
+            defer_model: Load the embedding model on first use (or in
+                after_fork) instead of now, for servers that fork workers
+        """
+        self.logger = logging.getLogger(__name__)
+        self.config = config
+        self.host = host or config.get("server.host", "127.0.0.1")
+        self.port = port or config.get("server.port", 8080)
+        self.default_k = config.get("scoring.parameters.k", 4)
+        configure_executor(config.get("executor.max_workers"))
+
+        self.logger.info("Loading embedder and vector store")
+        create_embedder = EmbeddingFactory(config).create_embedder
+        self.embedder = DeferredEmbedding(config, create_embedder) if defer_model \
+            else create_embedder()
+        self._deferred = self.embedder if defer_model else None
+        if config.get("server.batching.enabled", True):
+            # Coalesce concurrent query embeddings into batched forward passes
+            self.embedder = BatchingEmbedding(config, self.embedder)
+        self.vector_store = VectorStoreFactory(config).create_store(self.embedder)
+
+        self.latency_ms = Histogram(
+            "query_latency_ms", [1, 2, 5, 10, 20, 50, 100, 250, 500, 1000])
+        # Named callables whose results are merged into GET /metrics
+        self.metric_sources: Dict[str, Callable[[], Any]] = {
+            "query_latency": self.latency_ms.snapshot
+        }
+        if isinstance(self.embedder, BatchingEmbedding):
+            self.metric_sources["query_embedding"] = self.embedder.metrics
+        # Called with the latency in seconds of every successful query
+        self.query_observers: List[Callable[[float], None]] = []
+
+        self.app = web.Application()
+        self.app.add_routes([
+            web.get('/health', self.handle_health),
+            web.post('/query', self.handle_query),
+            web.get('/metrics', self.handle_metrics),
+            web.post('/sources/reindex', self.handle_reindex_sources),
+            web.post('/sources/delete', self.handle_delete_sources),
+        ])
+        self._stop = asyncio.Event()
+
+    def _parse_request(self, body: Dict[str, Any]
+                       ) -> Tuple[str, int, Optional[str], Optional[Dict[str, Any]]]:
+        """Validate a query request body."""
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object")
+
+        query = body.get("query")
+        if not isinstance(query, str) or not query.strip():
+            raise ValueError("'query' must be a non-empty string")
+
+        k = body.get("k", self.default_k)
+        if not isinstance(k, int) or k < 1:
+            raise ValueError("'k' must be a positive integer")
+
+        scoring_type = body.get("scoring_type")
+        if scoring_type is not None and scoring_type not in SearchFactory.search_types():
+            raise ValueError(
+                f"'scoring_type' must be one of {SearchFactory.search_types()}")
+
+        filter = body.get("filter")
+        if filter is not None and not isinstance(filter, dict):
+            raise ValueError("'filter' must be an object")
+
+        return query, k, scoring_type, filter
+
+    @staticmethod
+    def _parse_sources(body: Dict[str, Any]) -> List[str]:
+        """Validate a source maintenance request body."""
+        sources = body.get("sources") if isinstance(body, dict) else None
+        if not isinstance(sources, list) or not sources or \
+                not all(isinstance(source, str) and source for source in sources):
+            raise ValueError("'sources' must be a non-empty list of strings")
+        return sources
+
+    @staticmethod
+    def _serialize(results: List[Tuple[Document, float]]) -> List[Dict[str, Any]]:
+        return [
+            {"content": doc.page_content, "metadata": doc.metadata, "score": float(score)}
+            for doc, score in results
+        ]
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok"})
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {name: source() for name, source in self.metric_sources.items()})
+
+    async def handle_query(self, request: web.Request) -> web.Response:
+        """Answer a query with the same options as query_store."""
+        try:
+            query, k, scoring_type, filter = self._parse_request(await request.json())
+        except ValueError as e:
+            return web.json_response({"error": str(e)}, status=400)
+
+        start = time.perf_counter()
+        try:
+            results = await self.vector_store.asimilarity_search_with_score(
+                query, k, filter, scoring_type)
+        except Exception as e:
+            self.logger.error(f"Error answering query: {str(e)}")
+            return web.json_response({"error": "search failed"}, status=500)
+
+        took = time.perf_counter() - start
+        self.latency_ms.observe(took * 1000)
+        for observer in self.query_observers:
+            observer(took)
+
+        return web.json_response({
+            "query": query,
+            "k": k,
+            "scoring_type": scoring_type or self.config.get("scoring.type", "hybrid"),
+            "took_ms": round(took * 1000, 2),
+            "results": self._serialize(results)
+        })
+
+    async def handle_reindex_sources(self, request: web.Request) -> web.Response:
+        """Re-fetch, split and embed the given sources, replacing their chunks."""
+        try:
+            sources = self._parse_sources(await request.json())
+        except ValueError as e:
+            return web.json_response({"error": str(e)}, status=400)
+        try:
+            result = await reindex_sources(self.config, self.vector_store, sources)
+        except Exception as e:
+            self.logger.error(f"Error reindexing sources: {str(e)}")
+            return web.json_response({"error": "reindex failed"}, status=500)
+        return web.json_response({"sources": sources, **result})
+
+    async def handle_delete_sources(self, request: web.Request) -> web.Response:
+        """Remove every chunk of the given sources."""
+        try:
+            sources = self._parse_sources(await request.json())
+        except ValueError as e:
+            return web.json_response({"error": str(e)}, status=400)
+        deleted = await delete_sources(self.vector_store, sources)
+        return web.json_response({"sources": sources, "deleted": deleted})
+
+    def after_fork(self) -> None:
+        """Reopen per-process resources in a pre-forked worker."""
+        self._stop = asyncio.Event()
+        reset_executor()
+        self.latency_ms = Histogram(self.latency_ms.name, self.latency_ms.buckets)
+        self.metric_sources["query_latency"] = self.latency_ms.snapshot
+        if isinstance(self.embedder, BatchingEmbedding):
+            self.embedder.after_fork()
+        self.vector_store.after_fork()
+        if self._deferred is not None:
+            # Load the model before accepting queries rather than on the first one
+            self._deferred.load()
+
+    def stop(self) -> None:
+        """Request a clean shutdown."""
+        self._stop.set()
+
+    async def run(self, sock: Optional[socket.socket] = None) -> None:
+        """
+        Serve until SIGINT/SIGTERM, then drain and close the listener.
+
+        Args:
+            sock: Optional already-bound listening socket shared by pre-forked
+                workers; host and port are used when omitted
+        """
+        runner = web.AppRunner(self.app)
+        await runner.setup()
+        if sock is None:
+            site = web.TCPSite(runner, self.host, self.port)
+        else:
+            site = web.SockSite(runner, sock)
+        await site.start()
+        self.logger.info(f"Query server listening on http://{self.host}:{self.port}")
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stop)
+
+        try:
+            await self._stop.wait()
+        finally:
+            self.logger.info("Shutting down query server")
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.remove_signal_handler(sig)
+            await runner.cleanup()
+            if isinstance(self.embedder, BatchingEmbedding):
+                self.embedder.close()
+
+
+async def serve(config: ConfigHandler, host: Optional[str] = None,
+                port: Optional[int] = None, workers: Optional[int] = None) -> None:
+    """
+    Build a QueryServer and serve until shutdown.
+
+    Args:
+        config: Configuration handler instance
+        host: Optional host overriding server.host
+        port: Optional port overriding server.port
+        workers: Optional worker process count overriding server.workers.count;
+            more than one pre-forks workers that share the search indexes
+    """
+    workers = workers or config.get("server.workers.count", 1)
+    if workers > 1:
+        from .prefork import PreforkServer
+        # The supervisor blocks; the loop has nothing else to run meanwhile
+        PreforkServer(config, host, port, workers).run()
+        return
+    server = QueryServer(config, host, port)
+    await server.run()
@@ -1,8 +1,21 @@
 # splitters/base.py
 from abc import ABC, abstractmethod
 from langchain_core.documents import Document
-from typing import List, Dict, Any
+from typing import Iterable, Iterator, List, Dict, Any
 import logging
+import multiprocessing
+
+# Splitter instance of a pool worker, built once by _init_worker
+_worker_splitter = None
+
+
+def _init_worker(splitter_class: type, params: Dict[str, Any]) -> None:
+    global _worker_splitter
+    _worker_splitter = splitter_class(params)
+
+
+def _split_batch(documents: List[Document]) -> List[Document]:
+    return _worker_splitter._split_serial(documents)
 
 
 class BaseTextSplitter(ABC):
@@ -17,6 +30,9 @@ class BaseTextSplitter(ABC):
         """
         self.logger = logging.getLogger(self.__class__.__name__)
         self.params = params
+        self.workers = params.get("text_splitter.parallel.workers", 0)
+        self.batch_size = params.get("text_splitter.parallel.batch_size", 64)
+        self.start_method = params.get("text_splitter.parallel.start_method", "spawn")
         self._splitter = self._create_splitter()
 
     @abstractmethod
@@ -28,12 +44,60 @@ class BaseTextSplitter(ABC):
         """
         Split the documents using the configured splitter.
 
+        With text_splitter.parallel.workers > 1 the documents are split in
+        a process pool; the output is the same as the serial path.
+
         Args:
             documents (List[Document]): Documents to split
 
         Returns:
             List[Document]: Split documents
         """
+        if self.workers > 1 and len(documents) > self.batch_size:
+            return list(self.iter_split_documents(documents))
+        return self._split_serial(documents)
+
+    def iter_split_documents(self, documents: List[Document]) -> Iterator[Document]:
+        """
+        Yield chunks in document order as soon as their batch is split.
+
+        Args:
+            documents (List[Document]): Documents to split
+
+        Yields:
+            Document: Split documents
+        """
+        batches = (documents[start:start + self.batch_size]
+                   for start in range(0, len(documents), self.batch_size))
+        for chunks in self.iter_split_batches(batches):
+            yield from chunks
+
+    def iter_split_batches(self, batches: Iterable[List[Document]]) -> Iterator[List[Document]]:
+        """
+        Split batches of documents, yielding each batch's chunks in input order.
+
+        Each pool worker builds its own splitter once. Results stream as
+        soon as the next batch in order is done, so callers can embed or
+        store early batches while later ones are still being split.
+
+        Args:
+            batches: Batches of documents, e.g. the documents of one source
+
+        Yields:
+            List[Document]: Split documents of each batch
+        """
+        if self.workers <= 1:
+            for batch in batches:
+                yield self._split_serial(batch)
+            return
+
+        context = multiprocessing.get_context(self.start_method)
+        with context.Pool(self.workers, initializer=_init_worker,
+                          initargs=(type(self), self.params)) as pool:
+            yield from pool.imap(_split_batch, batches)
+
+    def _split_serial(self, documents: List[Document]) -> List[Document]:
+        """Split documents in this process."""
         if not self._splitter:
             self.logger.error("Splitter not initialized")
             return documents
@@ -1,14 +1,281 @@
 # splitters/markdown_splitter.py
-from langchain_text_splitters import MarkdownTextSplitter
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from langchain_core.documents import Document
 from .base_splitter import BaseTextSplitter
 
+# Section boundaries: headings, and fence openings so that "#" lines in
+# code are never read as headings. Matched at a line start.
+_BOUNDARY = re.compile(
+    r"[ ]{0,3}(?:(?P<level>#{1,6})[ \t]+(?P<title>.*)|(?P<marker>`{3,}|~{3,}).*)$",
+    re.M)
+
+# One alternative per structural line kind inside a section, matched at a
+# line start; consecutive table rows match as one run
+_STRUCTURE = re.compile(
+    r"(?:(?P<heading>[ ]{0,3}#{1,6}[ \t]+.*)"
+    r"|(?P<fence>[ ]{0,3}(?P<marker>`{3,}|~{3,}).*)"
+    r"|(?P<table>[ \t]*\|.*(?:\n[ \t]*\|.*)*))$",
+    re.M)
+
+# Line starts that may open a boundary or structure. Both begin with a
+# literal newline, so the regex engine skips plain text without returning
+# to Python.
+_BOUNDARY_CANDIDATE = re.compile(r"\n(?=[ ]{0,3}[#`~])")
+_STRUCTURE_CANDIDATE = re.compile(r"\n(?=[ \t]*[#`~|])")
+
+
+def _heading_title(title: str) -> str:
+    """Heading text without an optional closing sequence of #s."""
+    title = title.strip()
+    if title.endswith("#"):
+        stripped = title.rstrip("#")
+        if not stripped or stripped[-1] in " \t":
+            title = stripped.rstrip()
+    return title
+
+
+class Unit(NamedTuple):
+    """A span of the source text that a chunk boundary may not cut."""
+    start: int
+    end: int
+    kind: str  # "heading", "text", "code" or "table"
+
+
+class MarkdownChunker:
+    """
+    Header-aware markdown chunker built on one linear scan.
+
+    The scan finds headings, skipping over fenced code, and so cuts the
+    text into sections: a heading and the text under it. A section that
+    fits in chunk_size is one chunk. A larger one is broken into units (the
+    heading line, runs of text, fenced code blocks and tables) and chunks
+    are packed from consecutive units. Chunks are sliced straight from the
+    source text by offset, so nothing is re-joined, and never cross a
+    heading.
+
+    Overlap re-uses trailing units of the previous chunk. A run of text
+    longer than chunk_size is cut at the last paragraph break that fits,
+    else the last line break, else the last space. A code block or table
+    longer than chunk_size is split on line boundaries; code pieces are
+    re-fenced and table pieces repeat the header rows.
+    """
+
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200,
+                 breadcrumb_separator: str = " > "):
+        if chunk_overlap >= chunk_size:
+            raise ValueError(
+                f"chunk_overlap ({chunk_overlap}) must be smaller than chunk_size ({chunk_size})")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.breadcrumb_separator = breadcrumb_separator
+
+    # ------------------------------------------------------------------
+    # Scanning
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _next_line(pattern: re.Pattern, candidates: re.Pattern, text: str,
+                   pos: int, end: int) -> Optional[re.Match]:
+        """First line matching pattern at or after the line starting at pos."""
+        match = pattern.match(text, pos, end)
+        while match is None:
+            candidate = candidates.search(text, pos, end)
+            if candidate is None:
+                return None
+            pos = candidate.end()
+            match = pattern.match(text, pos, end)
+        return match
+
+    @staticmethod
+    def _fence_end(text: str, opening: re.Match, end: int) -> int:
+        """End of the code block opened by a fence; unclosed ones run to end."""
+        closing = re.compile(r"^[ \t]*" + re.escape(opening.group("marker")),
+                             re.M).search(text, opening.end(), end)
+        if closing is None:
+            return end
+        line_end = text.find("\n", closing.end(), end)
+        return end if line_end == -1 else line_end
+
+    def _sections(self, text: str) -> Iterator[Tuple[List[str], int, int]]:
+        """Yield (heading breadcrumb, start, end) for each section, in order."""
+        headings: List[str] = []
+        start = pos = 0
+        length = len(text)
+        while pos < length:
+            match = self._next_line(_BOUNDARY, _BOUNDARY_CANDIDATE, text, pos, length)
+            if match is None:
+                break
+            if match.group("marker"):
+                pos = self._fence_end(text, match, length) + 1
+                continue
+            if match.start() > start:
+                yield list(headings), start, match.start()
+            level = len(match.group("level"))
+            del headings[level - 1:]
+            headings.extend([""] * (level - 1 - len(headings)))
+            headings.append(_heading_title(match.group("title")))
+            start, pos = match.start(), match.end() + 1
+        if start < length:
+            yield list(headings), start, length
+
+    def _units(self, text: str, start: int, end: int) -> List[Unit]:
+        """Break text[start:end] into heading, text, code and table units."""
+        units = []
+        pos = start
+        while pos < end:
+            match = self._next_line(_STRUCTURE, _STRUCTURE_CANDIDATE, text, pos, end)
+            line_start = end if match is None else match.start()
+            if text[pos:line_start].strip():
+                units.append(Unit(pos, line_start, "text"))
+            if match is None:
+                break
+
+            kind, line_end = match.lastgroup, match.end()
+            if kind == "fence":
+                kind, line_end = "code", self._fence_end(text, match, end)
+            units.append(Unit(line_start, line_end, kind))
+            pos = line_end + 1
+        return units
+
+    # ------------------------------------------------------------------
+    # Oversized units
+    # ------------------------------------------------------------------
+    def _windows(self, text: str, start: int, end: int,
+                 min_cut: int) -> Iterator[Tuple[int, int]]:
+        """
+        Cut text[start:end] into overlapping windows of at most chunk_size.
+
+        Each window ends at the last paragraph break in its second half,
+        else the last line break or space that fits. The next window
+        starts at a line or word boundary inside the overlap. The first cut
+        is never placed before min_cut.
+        """
+        while end - start > self.chunk_size:
+            limit = start + self.chunk_size
+            floor = max(start + 1, min_cut)
+            cut = text.rfind("\n\n", max(floor, start + self.chunk_size // 2), limit + 1)
+            if cut == -1:
+                cut = text.rfind("\n", floor, limit + 1)
+            if cut == -1:
+                cut = text.rfind(" ", floor, limit + 1)
+            if cut == -1:
+                cut = limit
+            yield start, cut
+
+            next_start = cut - self.chunk_overlap
+            if next_start <= start:
+                next_start = cut
+            else:
+                # A boundary just before next_start keeps the word it leads
+                boundary = text.find("\n", next_start - 1, cut)
+                if boundary == -1:
+                    boundary = text.find(" ", next_start - 1, cut)
+                next_start = cut if boundary == -1 else boundary + 1
+            start, min_cut = next_start, 0
+        if end > start:
+            yield start, end
+
+    def _split_block(self, text: str, unit: Unit) -> List[str]:
+        """Split an oversized code block or table on line boundaries."""
+        lines = text[unit.start:unit.end].split("\n")
+        if unit.kind == "code":
+            marker = _STRUCTURE.match(lines[0]).group("marker")
+            if len(lines) > 1 and lines[-1].strip().startswith(marker):
+                body, closer = lines[1:-1], lines[-1]
+            else:
+                body, closer = lines[1:], marker
+            head, tail = lines[:1], [closer]
+        else:
+            separator = len(lines) > 1 and set(lines[1].replace("|", "").strip()) <= set("-: ")
+            head = lines[:2] if separator else lines[:1]
+            body, tail = lines[len(head):], []
+
+        budget = self.chunk_size - sum(len(line) + 1 for line in head + tail)
+        pieces, current, used = [], [], 0
+        for line in body:
+            if current and used + len(line) + 1 > budget:
+                pieces.append("\n".join(head + current + tail))
+                current, used = [], 0
+            current.append(line)
+            used += len(line) + 1
+        if current or not pieces:
+            pieces.append("\n".join(head + current + tail))
+        return pieces
+
+    # ------------------------------------------------------------------
+    # Packing
+    # ------------------------------------------------------------------
+    def _pack(self, text: str, units: List[Unit]) -> Iterator[str]:
+        """Pack consecutive units into chunks sliced from the source text."""
+        first = 0
+        for i, unit in enumerate(units):
+            if unit.end - unit.start > self.chunk_size:
+                if unit.kind in ("code", "table"):
+                    if first < i:
+                        yield text[units[first].start:units[i - 1].end]
+                    yield from self._split_block(text, unit)
+                else:
+                    # Pending units lead into the first window of the text run
+                    start = units[first].start if first < i else unit.start
+                    for window_start, window_end in self._windows(
+                            text, start, unit.end, min_cut=unit.start):
+                        yield text[window_start:window_end]
+                first = i + 1
+                continue
+
+            if first < i and unit.end - units[first].start > self.chunk_size:
+                last = units[i - 1]
+                yield text[units[first].start:last.end]
+                # Carry trailing units that fit in the overlap and leave room
+                # for the incoming unit
+                start = i
+                while start - 1 > first \
+                        and last.end - units[start - 1].start <= self.chunk_overlap \
+                        and unit.end - units[start - 1].start <= self.chunk_size:
+                    start -= 1
+                first = start
+        if first < len(units):
+            yield text[units[first].start:units[-1].end]
+
+    def split_text_with_headings(self, text: str) -> Iterator[Tuple[str, List[str]]]:
+        """Yield (chunk, heading breadcrumb) pairs in document order."""
+        for headings, start, end in self._sections(text):
+            if end - start <= self.chunk_size:
+                chunks = (text[start:end],)
+            else:
+                chunks = self._pack(text, self._units(text, start, end))
+            for chunk in chunks:
+                chunk = chunk.strip()
+                if chunk:
+                    yield chunk, headings
+
+    def split_text(self, text: str) -> List[str]:
+        return [chunk for chunk, _ in self.split_text_with_headings(text)]
+
+    def split_documents(self, documents: Iterable[Document]) -> List[Document]:
+        chunks = []
+        for doc in documents:
+            section, crumbs = None, []
+            for chunk, headings in self.split_text_with_headings(doc.page_content):
+                # Chunks of one section share its breadcrumb list
+                if headings is not section:
+                    section, crumbs = headings, [heading for heading in headings if heading]
+                    path = self.breadcrumb_separator.join(crumbs)
+                metadata = dict(doc.metadata)
+                if crumbs:
+                    metadata["heading"] = crumbs[-1]
+                    metadata["section_path"] = path
+                chunks.append(Document(page_content=chunk, metadata=metadata))
+        return chunks
+
 
 class MarkdownDocumentSplitter(BaseTextSplitter):
-    def create(self):
-        params = self.config.get("markdown", {})
-        return MarkdownTextSplitter(
-            chunk_size=params.get("chunk_size", 1000),
-            chunk_overlap=params.get("chunk_overlap", 200),
-            # Uses default separators if None
-            separators=params.get("separators", None)
+    """Header-aware markdown splitter keeping heading breadcrumbs as metadata."""
+
+    def _create_splitter(self):
+        return MarkdownChunker(
+            chunk_size=self.params.get("text_splitter.markdown.chunk_size", 1000),
+            chunk_overlap=self.params.get("text_splitter.markdown.chunk_overlap", 200),
+            breadcrumb_separator=self.params.get(
+                "text_splitter.markdown.breadcrumb_separator", " > ")
         )
@@ -0,0 +1,264 @@
+# text_splitter/near_duplicates.py
+import logging
+import zlib
+from functools import lru_cache
+from typing import Callable, Collection, Dict, List, Optional, Tuple
+import numpy as np
+from langchain_core.documents import Document
+
+# Shingle hashes permuted at a time; keeps the working array of
+# _BLOCK_SHINGLES x num_perm values in cache
+_BLOCK_SHINGLES = 1024
+_SHIFT = np.uint64(32)
+# Weight of false candidate pairs, against missed ones, when picking LSH bands
+_FALSE_POSITIVE_WEIGHT = 0.1
+# Joins the sources recorded on a canonical chunk; metadata values must be scalars
+SOURCE_SEPARATOR = "\n"
+
+
+def _integrate(f, low: float, high: float, steps: int = 100) -> float:
+    """Trapezoidal integral of f over [low, high]."""
+    if high <= low:
+        return 0.0
+    width = (high - low) / steps
+    values = [f(low + i * width) for i in range(steps + 1)]
+    return width * (sum(values) - (values[0] + values[-1]) / 2)
+
+
+def rehome(document: Document, removed: Collection[str],
+           present: Callable[[str], bool]) -> Optional[Document]:
+    """
+    Move a canonical chunk of a removed source to a source that shares it.
+
+    The chunks dropped in favour of a canonical one were never stored, so
+    deleting its source would also remove content the pages listed in
+    ``duplicate_sources`` still have.
+
+    Args:
+        document: Stored chunk of a source being removed
+        removed: Sources being removed
+        present: Whether a source still has chunks in the store
+
+    Returns:
+        A copy owned by the first surviving duplicate source, with that
+        source taken out of ``duplicate_sources``, or None if no source
+        survives
+    """
+    sources = [source for source in
+               (document.metadata.get("duplicate_sources") or "").split(SOURCE_SEPARATOR)
+               if source and source not in removed]
+    for i, source in enumerate(sources):
+        if present(source):
+            return Document(page_content=document.page_content, metadata={
+                **document.metadata,
+                "source": source,
+                # The chunk of the new owner is no longer a dropped one
+                "duplicate_count": max(document.metadata.get("duplicate_count", 1) - 1, 0),
+                "duplicate_sources": SOURCE_SEPARATOR.join(sources[:i] + sources[i + 1:]),
+            })
+    return None
+
+
+@lru_cache(maxsize=None)
+def lsh_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    Bands and rows per band for LSH on num_perm MinHash values.
+
+    Two chunks with Jaccard similarity s share a bucket in at least one
+    band with probability 1 - (1 - s**rows)**bands. The split chosen
+    minimises the weighted area of false positives below the threshold
+    and false negatives above it. Every candidate pair is checked against
+    the threshold afterwards, so a false positive costs a comparison and
+    a missed pair costs an embedding; false negatives weigh more.
+
+    Returns:
+        (bands, rows)
+    """
+    best, best_error = (1, num_perm), float("inf")
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        false_positives = _integrate(lambda s: 1 - (1 - s ** rows) ** bands, 0.0, threshold)
+        false_negatives = _integrate(lambda s: (1 - s ** rows) ** bands, threshold, 1.0)
+        error = _FALSE_POSITIVE_WEIGHT * false_positives + \
+            (1 - _FALSE_POSITIVE_WEIGHT) * false_negatives
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class NearDuplicateFilter:
+    """
+    Drop near-duplicate chunks before they are embedded.
+
+    Each chunk gets a MinHash signature over its word shingles. Chunks that
+    share a bucket in any LSH band, and whose estimated Jaccard similarity
+    reaches the threshold, are grouped with union-find. The first chunk of
+    each group is kept as the canonical one and records the sources of the
+    chunks dropped in its favour. Deleting a source moves its canonical
+    chunks to a surviving duplicate source (see rehome()).
+
+    The signatures depend only on the chunk text and the configured seed,
+    so a resumed ingest keeps the same canonical chunks.
+    """
+
+    def __init__(self, params):
+        self.params = params
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.enabled = params.get("text_splitter.dedup.enabled", False)
+        self.threshold = params.get("text_splitter.dedup.threshold", 0.85)
+        self.num_perm = params.get("text_splitter.dedup.num_perm", 128)
+        self.shingle_size = params.get("text_splitter.dedup.shingle_size", 5)
+        rng = np.random.default_rng(params.get("text_splitter.dedup.seed", 1))
+        # Odd multipliers for the permutations and the shingle word weights
+        self._a = rng.integers(0, 2 ** 64, self.num_perm, dtype=np.uint64, endpoint=False) | 1
+        self._b = rng.integers(0, 2 ** 64, self.num_perm, dtype=np.uint64, endpoint=False)
+        self._weights = rng.integers(0, 2 ** 64, self.shingle_size, dtype=np.uint64,
+                                     endpoint=False) | 1
+        self.bands, self.rows = lsh_bands(self.threshold, self.num_perm)
+
+    def _shingles(self, text: str) -> np.ndarray:
+        """
+        Distinct 64-bit hashes of the word shingles of a chunk.
+
+        Words are hashed once and each shingle hash is a weighted sum of
+        its word hashes, so no shingle string is ever built. crc32 is
+        deterministic across processes, unlike hash().
+        """
+        words = np.fromiter((zlib.crc32(word.encode("utf-8")) for word in text.lower().split()),
+                            dtype=np.uint64)
+        count = max(len(words) - self.shingle_size + 1, 1)
+        hashes = np.zeros(count, dtype=np.uint64)
+        for offset, weight in enumerate(self._weights[:len(words)]):
+            # Unsigned products wrap around modulo 2**64
+            hashes += words[offset:offset + count] * weight
+        return np.unique(hashes)
+
+    def signatures(self, texts: List[str]) -> np.ndarray:
+        """
+        MinHash signatures of the texts, one row of num_perm values each.
+
+        Each permutation is a multiply-shift hash, the top 32 bits of
+        a * x + b modulo 2**64; chunks are hashed in blocks so the work is
+        done by a few large array operations.
+        """
+        signatures = np.empty((len(texts), self.num_perm), dtype=np.uint64)
+        block: List[np.ndarray] = []
+        block_start = block_size = 0
+        for i, text in enumerate(texts):
+            block.append(self._shingles(text))
+            block_size += len(block[-1])
+            if block_size >= _BLOCK_SHINGLES or i == len(texts) - 1:
+                hashes = np.concatenate(block)
+                permuted = np.multiply.outer(hashes, self._a)
+                permuted += self._b
+                permuted >>= _SHIFT
+                offsets = np.cumsum([0] + [len(shingles) for shingles in block[:-1]])
+                signatures[block_start:i + 1] = np.minimum.reduceat(permuted, offsets, axis=0)
+                block, block_start, block_size = [], i + 1, 0
+        return signatures
+
+    def groups(self, signatures: np.ndarray) -> List[int]:
+        """
+        Group near-duplicate signatures.
+
+        Within a bucket every chunk is compared with the bucket's first
+        one only, so a bucket of boilerplate repeated on every page costs
+        linear rather than quadratic time.
+
+        Returns:
+            The canonical index for each signature; the smallest index of
+            its group
+        """
+        parent = list(range(len(signatures)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for band in range(self.bands):
+            columns = signatures[:, band * self.rows:(band + 1) * self.rows]
+            buckets: Dict[bytes, List[int]] = {}
+            for i, row in enumerate(columns):
+                buckets.setdefault(row.tobytes(), []).append(i)
+            for members in buckets.values():
+                if len(members) < 2:
+                    continue
+                first = members[0]
+                similarity = (signatures[members[1:]] == signatures[first]).mean(axis=1)
+                for i, estimate in zip(members[1:], similarity):
+                    if estimate < self.threshold:
+                        continue
+                    root_first, root_i = find(first), find(i)
+                    if root_first != root_i:
+                        # The smaller index stays the root, and so the canonical chunk
+                        low, high = sorted((root_first, root_i))
+                        parent[high] = low
+
+        return [find(i) for i in range(len(signatures))]
+
+    def deduplicate(self, ids: List[str],
+                    documents: List[Document]) -> Tuple[List[str], List[Document]]:
+        """
+        Keep one canonical chunk per group of near-duplicates.
+
+        A canonical chunk that absorbed others is returned as a copy whose
+        metadata holds ``duplicate_count``, the number of chunks dropped in
+        its favour, and ``duplicate_sources``, their other sources joined
+        by newlines.
+
+        Args:
+            ids: Chunk ids, in ingest order
+            documents: Chunks, in ingest order
+
+        Returns:
+            The ids and documents that are kept, in the same order; all of
+            them if deduplication fails
+        """
+        if not documents:
+            return ids, documents
+
+        try:
+            canonical = self.groups(self.signatures([doc.page_content for doc in documents]))
+
+            dropped: Dict[int, List[int]] = {}
+            for i, root in enumerate(canonical):
+                if root != i:
+                    dropped.setdefault(root, []).append(i)
+
+            kept_ids, kept_docs = [], []
+            for i, (doc_id, doc) in enumerate(zip(ids, documents)):
+                if canonical[i] != i:
+                    continue
+                if i in dropped:
+                    own = doc.metadata.get("source")
+                    sources = dict.fromkeys(
+                        documents[j].metadata.get("source") for j in dropped[i])
+                    sources.pop(own, None)
+                    sources.pop(None, None)
+                    doc = Document(page_content=doc.page_content, metadata={
+                        **doc.metadata,
+                        "duplicate_count": len(dropped[i]),
+                        "duplicate_sources": SOURCE_SEPARATOR.join(sources),
+                    })
+                kept_ids.append(doc_id)
+                kept_docs.append(doc)
+
+            self.report(documents, kept_docs)
+            return kept_ids, kept_docs
+
+        except Exception as e:
+            self.logger.error(f"Error removing near-duplicate chunks: {str(e)}")
+            return ids, documents
+
+    def report(self, documents: List[Document], kept: List[Document]) -> None:
+        """Log how much embedding work the dropped chunks would have cost."""
+        removed = len(documents) - len(kept)
+        total_chars = sum(len(doc.page_content) for doc in documents)
+        saved_chars = total_chars - sum(len(doc.page_content) for doc in kept)
+        self.logger.info(
+            f"Near-duplicate filter (Jaccard >= {self.threshold}, {self.bands} bands x "
+            f"{self.rows} rows) dropped {removed}/{len(documents)} chunks "
+            f"({removed / len(documents):.1%}), saving {saved_chars}/{total_chars} "
+            f"characters of embedding input ({saved_chars / max(total_chars, 1):.1%})")
@@ -1,17 +1,102 @@
 # splitters/sentence_transformer_splitter.py
-from langchain_text_splitters import SentenceTransformersTokenTextSplitter
+from typing import Any, List
+from langchain_core.documents import Document
+from scratch_rag_application.embedding import model_registry
 from .base_splitter import BaseTextSplitter
 
 
+class TokenWindowSplitter:
+    """
+    Splits documents into overlapping windows of model tokens.
+
+    Texts are tokenized in batches with a single fast-tokenizer call each,
+    and chunks are sliced from the original text by character offsets
+    rather than decoded from token ids.
+    """
+
+    def __init__(self, tokenizer: Any, tokens_per_chunk: int, chunk_overlap: int,
+                 batch_size: int = 256):
+        if chunk_overlap >= tokens_per_chunk:
+            raise ValueError(
+                f"chunk_overlap ({chunk_overlap}) must be smaller than "
+                f"the chunk size ({tokens_per_chunk} tokens)")
+        self.tokenizer = tokenizer
+        self.tokens_per_chunk = tokens_per_chunk
+        self.chunk_overlap = chunk_overlap
+        self.batch_size = batch_size
+
+    def _windows(self, text: str, ids: List[int], offsets: List[Any]) -> List[str]:
+        chunks = []
+        step = self.tokens_per_chunk - self.chunk_overlap
+        for start in range(0, len(ids), step):
+            end = min(start + self.tokens_per_chunk, len(ids))
+            if offsets is not None:
+                chunk = text[offsets[start][0]:offsets[end - 1][1]]
+            else:
+                chunk = self.tokenizer.decode(ids[start:end])
+            if chunk.strip():
+                chunks.append(chunk)
+            if end == len(ids):
+                break
+        return chunks
+
+    def split_texts(self, texts: List[str]) -> List[List[str]]:
+        """Split each text into chunks, tokenizing in batches."""
+        use_offsets = getattr(self.tokenizer, "is_fast", False)
+        results = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            encoded = self.tokenizer(
+                batch,
+                add_special_tokens=False,
+                return_offsets_mapping=use_offsets,
+                return_attention_mask=False,
+                verbose=False,
+            )
+            offsets = encoded["offset_mapping"] if use_offsets else [None] * len(batch)
+            for text, ids, text_offsets in zip(batch, encoded["input_ids"], offsets):
+                results.append(self._windows(text, ids, text_offsets))
+        return results
+
+    def split_documents(self, documents: List[Document]) -> List[Document]:
+        chunks = self.split_texts([doc.page_content for doc in documents])
+        return [
+            Document(page_content=chunk, metadata=dict(doc.metadata))
+            for doc, doc_chunks in zip(documents, chunks)
+            for chunk in doc_chunks
+        ]
+
+
 class SentenceTransformerDocumentSplitter(BaseTextSplitter):
 
     def _create_splitter(self):
-        return SentenceTransformersTokenTextSplitter(
-            chunk_size=self.params.get(
-                "text_splitter.sentence_transformer.chunk_size", 1000),
+        model_name = self.params.get(
+            "text_splitter.sentence_transformer.model_name", "all-MiniLM-L6-v2")
+        if self.params.get("text_splitter.sentence_transformer.tokenizer_only", True):
+            # Tokenizer files only; the model weights are never loaded
+            tokenizer = model_registry.get_tokenizer(model_name)
+            max_length = model_registry.max_sequence_length(model_name)
+        else:
+            # Shares the model the embedder loads for the same name
+            model = model_registry.get_sentence_transformer(
+                model_name, **self.params.get(
+                    "embeddings.huggingface.model_kwargs", {"device": "cpu"}))
+            tokenizer = model.tokenizer
+            max_length = model.max_seq_length
+
+        # Longer chunks would be truncated by the model when embedded
+        limit = max_length - tokenizer.num_special_tokens_to_add()
+        chunk_size = self.params.get(
+            "text_splitter.sentence_transformer.chunk_size", 1000)
+        if chunk_size > limit:
+            self.logger.info(
+                f"chunk_size {chunk_size} exceeds what {model_name} embeds; "
+                f"using {limit} tokens")
+        return TokenWindowSplitter(
+            tokenizer,
+            tokens_per_chunk=min(chunk_size, limit),
             chunk_overlap=self.params.get(
                 "text_splitter.sentence_transformer.chunk_overlap", 200),
-
-            model_name=self.params.get(
-                "text_splitter.sentence_transformer.model_name", "all-MiniLM-L6-v2")
+            batch_size=self.params.get(
+                "text_splitter.sentence_transformer.batch_size", 256),
         )
@@ -1,15 +1,104 @@
+import copy
+import multiprocessing
+from typing import Any, Iterable, List
+from langchain_core.documents import Document
+from langchain_text_splitters import SpacyTextSplitter, TextSplitter
+from .base_splitter import BaseTextSplitter
 
+# Components a trained pipeline runs that sentence splitting never needs
+_UNUSED_COMPONENTS = ["tagger", "morphologizer", "ner", "lemmatizer",
+                      "attribute_ruler", "entity_ruler"]
 
-from .base_splitter import BaseTextSplitter
-from langchain_text_splitters import SpacyTextSplitter
+
+def load_sentence_pipeline(pipeline: str, max_length: int = 1_000_000) -> Any:
+    """
+    Load the smallest spaCy pipeline that still finds sentence boundaries.
+
+    "sentencizer" gives a blank English pipeline with the rule-based
+    sentencizer. For a trained pipeline the statistical senter is enabled
+    in place of the dependency parser when the pipeline ships one;
+    otherwise only the parser and the tok2vec it listens to are kept.
+
+    Args:
+        pipeline: "sentencizer" or a trained pipeline name, e.g. en_core_web_sm
+        max_length: Longest text, in characters, the pipeline accepts
+    """
+    import spacy
+
+    if pipeline == "sentencizer":
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+    else:
+        nlp = spacy.load(pipeline, exclude=_UNUSED_COMPONENTS + ["parser"])
+        if "senter" in nlp.component_names:
+            nlp.enable_pipe("senter")
+            if "tok2vec" in nlp.pipe_names and \
+                    "senter" not in nlp.get_pipe("tok2vec").listening_components:
+                nlp.disable_pipe("tok2vec")
+        else:
+            nlp = spacy.load(pipeline, exclude=_UNUSED_COMPONENTS + ["senter"])
+    nlp.max_length = max_length
+    return nlp
+
+
+class PipedSpacyTextSplitter(TextSplitter):
+    """
+    Sentence-based splitter that runs documents through nlp.pipe in batches.
+
+    Sentences are merged into chunks exactly as SpacyTextSplitter merges
+    them, so only the sentence boundaries depend on the pipeline used.
+    """
+
+    def __init__(self, nlp: Any, separator: str = "\n\n", n_process: int = 1,
+                 batch_size: int = 64, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._nlp = nlp
+        self._separator = separator
+        self._n_process = n_process
+        self._batch_size = batch_size
+
+    def split_text(self, text: str) -> List[str]:
+        return self._merge_splits([s.text for s in self._nlp(text).sents], self._separator)
+
+    def _split_texts(self, texts: Iterable[str]) -> Iterable[List[str]]:
+        for parsed in self._nlp.pipe(texts, n_process=self._n_process,
+                                     batch_size=self._batch_size):
+            yield self._merge_splits([s.text for s in parsed.sents], self._separator)
+
+    def split_documents(self, documents: Iterable[Document]) -> List[Document]:
+        documents = list(documents)
+        chunks = self._split_texts(doc.page_content for doc in documents)
+        return [
+            Document(page_content=chunk, metadata=copy.deepcopy(doc.metadata))
+            for doc, doc_chunks in zip(documents, chunks)
+            for chunk in doc_chunks
+        ]
 
 
 class SpacyDocumentSplitter(BaseTextSplitter):
     """Implementation of spaCy-based text splitter."""
 
     def _create_splitter(self):
-        return SpacyTextSplitter(
-            chunk_size=self.params.get("text_splitter.spacy.chunk_size", 1000),
-            chunk_overlap=self.params.get(
-                "text_splitter.spacy.chunk_overlap", 200)
+        chunk_size = self.params.get("text_splitter.spacy.chunk_size", 1000)
+        chunk_overlap = self.params.get("text_splitter.spacy.chunk_overlap", 200)
+        pipeline = self.params.get("text_splitter.spacy.pipeline", "en_core_web_sm")
+
+        if not self.params.get("text_splitter.spacy.lean", True):
+            # Full pipeline minus tagger/NER, one document at a time
+            return SpacyTextSplitter(
+                pipeline=pipeline,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap
+            )
+
+        n_process = self.params.get("text_splitter.spacy.n_process", 1)
+        if multiprocessing.current_process().daemon:
+            # Pool workers of the parallel split mode cannot start processes
+            n_process = 1
+        return PipedSpacyTextSplitter(
+            load_sentence_pipeline(pipeline),
+            n_process=n_process,
+            batch_size=self.params.get("text_splitter.spacy.batch_size", 64),
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap
         )
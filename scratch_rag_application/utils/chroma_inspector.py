@@ -1,7 +1,10 @@
 # utils/chroma_inspector.py
 import logging
-from typing import Optional, List
+from itertools import islice
+from typing import Iterator, Optional, List
 import chromadb
+from scratch_rag_application.utils.paging import iter_pages
+from scratch_rag_application.vector_store.collection_alias import read_alias
 
 logger = logging.getLogger(__name__)
 
@@ -10,9 +13,11 @@ class ChromaInspector:
     """Utility class to inspect ChromaDB contents."""
 
     def __init__(self, persist_directory: str = "./chroma_db",
-                 collection_name: str = "kong_docs"):
+                 collection_name: str = "kong_docs", page_size: int = 1000):
         self.persist_directory = persist_directory
-        self.collection_name = collection_name
+        self.page_size = page_size
+        # Follow a blue/green alias to the live collection version
+        self.collection_name, _ = read_alias(persist_directory, collection_name)
         self.client = chromadb.PersistentClient(path=persist_directory)
 
     def get_collection_info(self) -> dict:
@@ -29,22 +34,24 @@ class ChromaInspector:
             logger.error(f"Error getting collection info: {str(e)}")
             return {}
 
-    def list_documents(self, limit: Optional[int] = None) -> List[dict]:
-        """List all documents in the collection."""
-        try:
-            collection = self.client.get_collection(self.collection_name)
-            results = collection.get()
-
-            documents = []
-            for idx, (doc_id, document, metadata) in enumerate(zip(results['ids'], results['documents'], results['metadatas'])):
-                if limit and idx >= limit:
-                    break
-                documents.append({
+    def iter_documents(self, batch_size: Optional[int] = None) -> Iterator[dict]:
+        """Yield every document in the collection, reading one page at a time."""
+        collection = self.client.get_collection(self.collection_name)
+        for page in iter_pages(collection.get, batch_size or self.page_size):
+            for doc_id, document, metadata in zip(
+                    page['ids'], page['documents'], page['metadatas']):
+                yield {
                     "id": doc_id,
                     "content": document,
                     "metadata": metadata
-                })
-            return documents
+                }
+
+    def list_documents(self, limit: Optional[int] = None) -> List[dict]:
+        """List documents in the collection, reading no more pages than needed."""
+        try:
+            # A small limit is served by one page of that size
+            batch_size = min(limit, self.page_size) if limit else self.page_size
+            return list(islice(self.iter_documents(batch_size), limit))
         except Exception as e:
             logger.error(f"Error listing documents: {str(e)}")
             return []
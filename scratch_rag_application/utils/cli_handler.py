@@ -1,18 +1,51 @@
 # utils/cli_handler.py
 import argparse
 import logging
-from typing import Optional, Tuple
+from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
 
-def parse_arguments() -> Tuple[bool, Optional[str], Optional[str], bool]:
+def parse_filter(values: Optional[List[str]]) -> Optional[Dict[str, Any]]:
+    """
+    Build a Chroma-style where clause from key=value pairs.
+
+    Repeated keys are OR-ed with $in, different keys are AND-ed.
+
+    Args:
+        values: List of "key=value" strings
+
+    Returns:
+        Optional[Dict[str, Any]]: Where clause, or None if no pairs were given
+    """
+    if not values:
+        return None
+
+    fields: Dict[str, List[str]] = {}
+    for value in values:
+        key, separator, field_value = value.partition('=')
+        if not separator or not key:
+            raise argparse.ArgumentTypeError(
+                f"Invalid filter '{value}', expected key=value")
+        fields.setdefault(key.strip(), []).append(field_value.strip())
+
+    clauses = [
+        {key: field_values[0]} if len(field_values) == 1
+        else {key: {"$in": field_values}}
+        for key, field_values in fields.items()
+    ]
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def parse_arguments() -> argparse.Namespace:
     """
     Parse command line arguments for the RAG application.
 
     Returns:
-        Tuple[bool, Optional[str], Optional[str], bool]: 
-            (reload_data flag, query string if provided, visualization type, inspect flag)
+        argparse.Namespace: Parsed arguments (reload_data, no_resume,
+            from_artifacts, reindex_source, delete_source, daemon, query, k,
+            filter, visualize, serve, host, port, workers, inspect); filter
+            is converted to a where clause
     """
     parser = argparse.ArgumentParser(
         description='RAG Application for document processing and querying',
@@ -22,7 +55,42 @@ def parse_arguments() -> Tuple[bool, Optional[str], Optional[str], bool]:
     parser.add_argument(
         '--reload-data',
         action='store_true',
-        help='Force reload of all data into the vector store'
+        help='Force reload of all data into the vector store; resumes an\n'
+             'interrupted reload from the ingest journal'
+    )
+
+    parser.add_argument(
+        '--no-resume',
+        action='store_true',
+        help='With --reload-data, discard an interrupted reload and start over'
+    )
+
+    parser.add_argument(
+        '--from-artifacts',
+        action='store_true',
+        help='With --reload-data, reuse the parsed sections cached under\n'
+             'pipeline.artifacts.directory and only split and embed again'
+    )
+
+    parser.add_argument(
+        '--reindex-source',
+        action='append',
+        metavar='URL',
+        help='Re-fetch, split and embed only this source, replacing its chunks\n'
+             '(repeat for several sources)'
+    )
+
+    parser.add_argument(
+        '--delete-source',
+        action='append',
+        metavar='URL',
+        help='Remove every chunk of this source (repeat for several sources)'
+    )
+
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Re-check sources on a schedule and reindex pages that changed'
     )
 
     parser.add_argument(
@@ -31,6 +99,21 @@ def parse_arguments() -> Tuple[bool, Optional[str], Optional[str], bool]:
         help='Execute similarity search with the provided query'
     )
 
+    parser.add_argument(
+        '--k',
+        type=int,
+        help='Number of results to return (defaults to scoring.parameters.k)'
+    )
+
+    parser.add_argument(
+        '--filter',
+        action='append',
+        metavar='KEY=VALUE',
+        help='Restrict the query to documents whose metadata matches, e.g.\n'
+             '--filter content_type=qa --filter source=https://...\n'
+             'Repeat a key to match any of several values'
+    )
+
     parser.add_argument(
         '--visualize',
         choices=['relevance_score', 'document_comparison'],
@@ -39,6 +122,31 @@ def parse_arguments() -> Tuple[bool, Optional[str], Optional[str], bool]:
              'document_comparison: Show document matches with highlighted terms'
     )
 
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Run a long-lived HTTP/JSON query server (POST /query)'
+    )
+
+    parser.add_argument(
+        '--host',
+        type=str,
+        help='Host for --serve (defaults to server.host)'
+    )
+
+    parser.add_argument(
+        '--port',
+        type=int,
+        help='Port for --serve (defaults to server.port)'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Worker processes for --serve sharing one copy of the indexes\n'
+             '(defaults to server.workers.count)'
+    )
+
     parser.add_argument(
         '--inspect',
         action='store_true',
@@ -50,6 +158,11 @@ def parse_arguments() -> Tuple[bool, Optional[str], Optional[str], bool]:
     # If no arguments provided, show help and exit
     if not any(vars(args).values()):
         parser.print_help()
-        return False, None, None, False
+        return args
+
+    try:
+        args.filter = parse_filter(args.filter)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
 
-    return args.reload_data, args.query, args.visualize, args.inspect
+    return args
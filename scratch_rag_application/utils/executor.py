@@ -0,0 +1,66 @@
+# utils/executor.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import os
+import threading
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_max_workers: Optional[int] = None
+_lock = threading.Lock()
+
+
+def configure_executor(max_workers: Optional[int] = None) -> None:
+    """
+    Set the size of the shared executor used by the async APIs.
+
+    Embedding and BM25 scoring release the GIL only partly, so the pool is
+    bounded to avoid oversubscribing the CPU under many concurrent queries.
+
+    Args:
+        max_workers: Thread count, defaults to the number of CPUs
+    """
+    global _executor, _max_workers
+    with _lock:
+        if _executor is not None and max_workers != _max_workers:
+            _executor.shutdown(wait=False)
+            _executor = None
+        _max_workers = max_workers
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the shared bounded executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=_max_workers or os.cpu_count() or 4,
+                    thread_name_prefix="rag-async")
+    return _executor
+
+
+def reset_executor() -> None:
+    """Forget the executor in a forked child; its threads did not survive the fork."""
+    global _executor, _lock
+    _executor = None
+    _lock = threading.Lock()
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking call on the shared executor without blocking the event loop.
+
+    Args:
+        func: Synchronous callable
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The callable's return value
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), partial(func, *args, **kwargs))
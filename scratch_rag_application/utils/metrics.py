@@ -0,0 +1,76 @@
+# utils/metrics.py
+import bisect
+import threading
+from typing import Any, Dict, Sequence
+
+# Percentiles estimated in every snapshot
+PERCENTILES = (50, 95, 99)
+
+
+class Histogram:
+    """Thread-safe histogram with fixed upper-bound buckets."""
+
+    def __init__(self, name: str, buckets: Sequence[float]):
+        self.name = name
+        self.buckets = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._min = float("inf")
+        self._max = float("-inf")
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record a single observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+            self._min = min(self._min, value)
+            self._max = max(self._max, value)
+
+    def _percentile(self, q: float) -> float:
+        """Estimate a percentile from the bucket counts; the caller holds the lock."""
+        if not self._count:
+            return 0.0
+        rank = q / 100 * self._count
+        cumulative = 0
+        for index, count in enumerate(self._counts):
+            if count and cumulative + count >= rank:
+                # Interpolate linearly inside the bucket, narrowed to the
+                # observed range so the first and +Inf buckets are bounded
+                lower = max(self.buckets[index - 1] if index else self._min, self._min)
+                upper = min(self.buckets[index] if index < len(self.buckets)
+                            else self._max, self._max)
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self._max
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate the q-th percentile of the observations.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            float: Estimated value, or 0.0 before the first observation
+        """
+        with self._lock:
+            return self._percentile(q)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return counts per bucket ("le" upper bounds) and summary statistics."""
+        with self._lock:
+            buckets = {str(bound): count for bound, count in zip(self.buckets, self._counts)}
+            buckets["+Inf"] = self._counts[-1]
+            return {
+                "count": self._count,
+                "sum": self._sum,
+                "mean": self._sum / self._count if self._count else 0.0,
+                "min": self._min if self._count else 0.0,
+                "max": self._max if self._count else 0.0,
+                **{f"p{q}": self._percentile(q) for q in PERCENTILES},
+                "buckets": buckets
+            }
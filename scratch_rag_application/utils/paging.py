@@ -0,0 +1,46 @@
+# utils/paging.py
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Fields read when include is not given, as in Chroma's get()
+DEFAULT_INCLUDE = ["documents", "metadatas"]
+
+
+def iter_pages(get: Callable[..., Dict[str, Any]], batch_size: int,
+               include: Optional[List[str]] = None,
+               where: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Read a Chroma-style collection in limit/offset pages.
+
+    Works with any get() taking limit, offset, include and where: a
+    LangChain Chroma store, a chromadb collection or the NumPy index.
+    Rows added or deleted while pages are read may be skipped or repeated,
+    as with any offset paging.
+
+    Args:
+        get: The collection's get method
+        batch_size: Rows per page
+        include: Fields to return besides ids, e.g. documents, metadatas
+            and embeddings
+        where: Optional metadata clause
+
+    Yields:
+        get() results of at most batch_size rows; empty pages are skipped
+    """
+    if batch_size < 1:
+        raise ValueError(f"Page size must be positive, got {batch_size}")
+    kwargs: Dict[str, Any] = {
+        "limit": batch_size,
+        "include": DEFAULT_INCLUDE if include is None else include
+    }
+    if where:
+        kwargs["where"] = where
+
+    offset = 0
+    while True:
+        page = get(offset=offset, **kwargs)
+        count = len(page["ids"])
+        if count:
+            yield page
+        if count < batch_size:
+            return
+        offset += count
@@ -2,6 +2,16 @@ import re
 import logging
 from typing import Optional
 
+# First collapse all whitespace including newlines to single spaces. Runs
+# that already are a single space are not matched, so most word gaps cost
+# nothing.
+_WHITESPACE = re.compile(r'[^\S ]\s*| \s+')
+# Then restore meaningful line breaks in one pass: before headers, and
+# after periods that end sentences. After the collapse the only whitespace
+# left is single spaces, so the two never overlap and no blank lines can
+# appear. Leading with the space keeps the regex engine's fast prefix scan.
+_LINE_BREAKS = re.compile(r' (?:(#+ )|(?<=\. )(?=[A-Z]))')
+
 
 class TextCleaner:
     """Clean text by removing excessive whitespace and normalizing line breaks."""
@@ -24,43 +34,16 @@ class TextCleaner:
             return text
 
         try:
-            original_length = len(text)
-
-            self.logger.info(f"Length before cleaning: {original_length}")
-
-            # Perform cleaning steps
-            cleaned = text
-
-            # First collapse all whitespace including newlines to single spaces
-            cleaned = re.sub(r'\s+', ' ', cleaned)
-            self.logger.info(f"After collapsing whitespace: {len(cleaned)}")
-
-            # Restore meaningful line breaks
-            # Add newline before headers
-            cleaned = re.sub(r'\s(#+ )', r'\n\1', cleaned)
-            self.logger.info(f"After restoring headers: {len(cleaned)}")
-
-            # Add newline after periods that end sentences
-            cleaned = re.sub(r'\. ([A-Z])', r'.\n\1', cleaned)
-            self.logger.info(
-                f"After restoring sentence breaks: {len(cleaned)}")
-
-            # Ensure only single newlines
-            cleaned = re.sub(r'\n+', '\n', cleaned)
-            self.logger.info(f"After normalizing newlines: {len(cleaned)}")
-
-            # Trim leading/trailing whitespace
-            cleaned = cleaned.strip()
-
-            final_length = len(cleaned)
-            chars_removed = original_length - final_length
-
-            self.logger.info(f"Length after cleaning: {final_length}")
+            collapsed = _WHITESPACE.sub(' ', text)
+            # An unmatched header group is replaced by an empty string
+            cleaned = _LINE_BREAKS.sub(r'\n\1', collapsed).strip()
 
-            if chars_removed > 0:
+            # Per-step statistics cost a pass each; only gather them for debugging
+            if self.logger.isEnabledFor(logging.DEBUG):
+                breaks = cleaned.count('\n')
                 self.logger.debug(
-                    f"Cleaned text: removed {chars_removed} characters "
-                    f"({original_length} → {final_length})"
+                    f"Cleaned text: {len(text)} characters, {len(collapsed)} after "
+                    f"collapsing whitespace, {len(cleaned)} with {breaks} line breaks restored"
                 )
 
             return cleaned
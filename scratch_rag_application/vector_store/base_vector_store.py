@@ -1,10 +1,16 @@
 # vectorstore/base.py
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from uuid import uuid4
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 import logging
+import threading
+from ..search.base_search import BaseSearch
+from ..search.corpus_store import CorpusBuilder
+from ..search.search_factory import SearchFactory
+from ..utils.executor import run_blocking
+from ..utils.paging import iter_pages
 
 
 class BaseVectorStore(ABC):
@@ -14,6 +20,10 @@ class BaseVectorStore(ABC):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.params = params
         self.embedding = embedding
+        self._search_strategies: Dict[str, BaseSearch] = {}
+        # Re-entrant: building hybrid builds the BM25 and vector strategies it shares
+        self._strategy_lock = threading.RLock()
+        self.page_size = params.get("vectorstore.page_size", 1000)
         self._store = self._create_store()
 
     @abstractmethod
@@ -21,6 +31,222 @@ class BaseVectorStore(ABC):
         """Create and return the specific vector store instance."""
         pass
 
+    @property
+    def search_strategy(self) -> BaseSearch:
+        """Search strategy for the configured scoring.type."""
+        return self.get_search_strategy()
+
+    def get_search_strategy(self, search_type: Optional[str] = None) -> BaseSearch:
+        """
+        Return the search strategy for a scoring type, building it on first use.
+
+        Hybrid search shares the store's BM25 and vector strategies, so each
+        index is built once however many scoring types are in use.
+
+        Args:
+            search_type: Scoring type (hybrid/bm25/vector), defaults to scoring.type
+
+        Returns:
+            BaseSearch: Strategy bound to this store with its indexes initialized
+        """
+        search_type = search_type or self.params.get("scoring.type", "hybrid")
+        strategy = self._search_strategies.get(search_type)
+        if strategy is not None:
+            return strategy
+
+        with self._strategy_lock:
+            strategy = self._search_strategies.get(search_type)
+            if strategy is None:
+                components = {}
+                if search_type == "hybrid":
+                    components = {
+                        "bm25_searcher": self.get_search_strategy("bm25"),
+                        "vector_searcher": self.get_search_strategy("vector")
+                    }
+                strategy = SearchFactory(self.params).create_searcher(
+                    self._store, search_type, **components)
+                if self._owns_indexes(strategy):
+                    self._initialize_search_documents(strategy)
+                self._search_strategies[search_type] = strategy
+        return strategy
+
+    @staticmethod
+    def _owns_indexes(strategy: BaseSearch) -> bool:
+        """Whether the store must build a strategy's document indexes itself."""
+        return hasattr(strategy, 'initialize_documents') and \
+            not getattr(strategy, 'shares_components', False)
+
+    def _initialize_search_documents(self, strategy: BaseSearch) -> None:
+        """Initialize a search strategy with all documents in the store."""
+        try:
+            if self._store:
+                # Pages go straight into the compact corpus, so only one page
+                # of rows is held as Python objects; Documents are only built
+                # for search results
+                builder = CorpusBuilder()
+                for page in self.iter_documents():
+                    builder.add(page['documents'], page['metadatas'])
+                if len(builder):
+                    strategy.initialize_documents(builder.build())
+        except Exception as e:
+            self.logger.error(f"Error initializing search documents: {str(e)}")
+
+    def iter_documents(self, batch_size: Optional[int] = None,
+                       include: Optional[List[str]] = None,
+                       where: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Read the store in pages instead of one unbounded get().
+
+        Args:
+            batch_size: Rows per page, defaults to vectorstore.page_size
+            include: Fields to return besides ids (documents, metadatas,
+                embeddings), defaults to documents and metadatas
+            where: Optional metadata clause
+
+        Yields:
+            Pages shaped like Chroma's get() results
+        """
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return
+        yield from iter_pages(self._store.get, batch_size or self.page_size, include, where)
+
+    def _refresh_search_indexes(self) -> None:
+        """Rebuild every built strategy's indexes from the store."""
+        for strategy in list(self._search_strategies.values()):
+            if getattr(strategy, 'shares_components', False):
+                continue
+            if hasattr(strategy, 'reset_index'):
+                strategy.reset_index()
+            if hasattr(strategy, 'initialize_documents'):
+                self._initialize_search_documents(strategy)
+
+    async def aget_search_strategy(self, search_type: Optional[str] = None) -> BaseSearch:
+        """Return a search strategy, building its indexes off the event loop."""
+        search_type = search_type or self.params.get("scoring.type", "hybrid")
+        strategy = self._search_strategies.get(search_type)
+        if strategy is not None:
+            return strategy
+        return await run_blocking(self.get_search_strategy, search_type)
+
+    async def asimilarity_search_with_score(
+        self,
+        query: str,
+        k: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        search_type: Optional[str] = None
+    ) -> List[Tuple[Document, float]]:
+        """
+        Search with the configured strategy without blocking the event loop.
+
+        Args:
+            query: Search query string
+            k: Optional number of results to return
+            filter: Optional metadata where clause pushed down to the search
+            search_type: Optional scoring type overriding scoring.type
+
+        Returns:
+            List of (Document, score) tuples sorted by relevance
+        """
+        strategy = await self.aget_search_strategy(search_type)
+        return await strategy.asearch(query, k, filter)
+
+    async def aadd_documents(self, documents: List[Document],
+                             ids: Optional[List[str]] = None) -> bool:
+        """Add documents on the shared executor."""
+        return await run_blocking(self.add_documents, documents, ids)
+
+    async def asimilarity_search(self, query: str, k: int = 4,
+                                 filter: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """Perform similarity search on the shared executor."""
+        return await run_blocking(self.similarity_search, query, k, filter)
+
+    async def adelete(self, ids: Optional[List[str]] = None) -> bool:
+        """Delete documents on the shared executor."""
+        return await run_blocking(self.delete, ids)
+
+    def warm_search_indexes(self, search_types: Optional[List[str]] = None) -> None:
+        """
+        Build strategies and their lazily built indexes ahead of serving.
+
+        Hybrid reuses the BM25 and vector strategies, so warming every type
+        builds each index once.
+
+        Args:
+            search_types: Scoring types to build, defaults to every registered type
+        """
+        for search_type in search_types or SearchFactory.search_types():
+            try:
+                self.get_search_strategy(search_type).warm()
+            except Exception as e:
+                self.logger.error(
+                    f"Error warming {search_type} search indexes: {str(e)}")
+
+    def after_fork(self) -> None:
+        """
+        Reopen per-process resources in a forked worker.
+
+        Search indexes built before the fork are kept and shared
+        copy-on-write; stores holding connections or threads override this.
+        """
+        pass
+
+    def _update_search_indexes(self, where: Optional[Dict[str, Any]],
+                               documents: List[Document]) -> None:
+        """
+        Apply an incremental change to every built strategy's indexes.
+
+        Args:
+            where: Metadata clause of removed documents, or None
+            documents: Added documents
+        """
+        for strategy in list(self._search_strategies.values()):
+            if getattr(strategy, 'shares_components', False):
+                continue
+            if hasattr(strategy, 'update_documents'):
+                strategy.update_documents(where, documents)
+            elif hasattr(strategy, 'reset_index'):
+                strategy.reset_index()
+
+    def delete_by_metadata(self, where: Dict[str, Any]) -> int:
+        """
+        Delete every document whose metadata matches a where clause.
+
+        The matching ids are read in pages of page_size rows and deleted in
+        batches of the same size. Every page is read before the first
+        delete, since deleting shifts the offsets of later pages.
+
+        Args:
+            where: Chroma-style metadata clause, e.g. {"source": url}
+
+        Returns:
+            int: Number of documents deleted
+        """
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return 0
+        try:
+            ids = [doc_id for page in iter_pages(self._store.get, self.page_size, [], where)
+                   for doc_id in page['ids']]
+            for start in range(0, len(ids), self.page_size):
+                self._store.delete(ids=ids[start:start + self.page_size])
+            if ids:
+                self._update_search_indexes(where, [])
+            self.logger.info(f"Deleted {len(ids)} documents matching {where}")
+            return len(ids)
+        except Exception as e:
+            self.logger.error(f"Error deleting documents by metadata: {str(e)}")
+            return 0
+
+    async def adelete_by_metadata(self, where: Dict[str, Any]) -> int:
+        """Delete documents by metadata on the shared executor."""
+        return await run_blocking(self.delete_by_metadata, where)
+
+    def _reset_search_strategies(self) -> None:
+        """Drop strategies bound to a store instance that has been replaced."""
+        with self._strategy_lock:
+            self._search_strategies = {}
+
     def add_documents(self, documents: List[Document], ids: Optional[List[str]] = None) -> bool:
         """Add documents to the vector store."""
         if not self._store:
@@ -68,6 +294,8 @@ class BaseVectorStore(ABC):
             return False
         try:
             self._store.delete(ids=ids)
+            # Built indexes would otherwise keep returning the deleted rows
+            self._refresh_search_indexes()
             return True
         except Exception as e:
             self.logger.error(f"Error deleting documents: {str(e)}")
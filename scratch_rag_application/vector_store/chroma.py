@@ -1,10 +1,10 @@
 # vectorstore/chroma.py
+from chromadb.api.shared_system_client import SharedSystemClient
 from langchain_chroma import Chroma
 from .base_vector_store import BaseVectorStore
 import os
-from typing import Optional, List, Tuple
+from typing import Any, Dict, Optional, List, Tuple
 from langchain_core.documents import Document
-from ..search.search_factory import SearchFactory
 
 
 class ChromaVectorStore(BaseVectorStore):
@@ -12,27 +12,8 @@ class ChromaVectorStore(BaseVectorStore):
 
     def __init__(self, params: dict, embedding):
         super().__init__(params, embedding)
-        self.search_strategy = SearchFactory(
-            params).create_searcher(self._store)
-        if hasattr(self.search_strategy, 'initialize_documents'):
-            self._initialize_search_documents()
-
-    def _initialize_search_documents(self):
-        """Initialize search strategy with documents if needed."""
-        try:
-            if self._store:
-                results = self._store.get()
-                if results and results['documents']:
-                    docs = [
-                        Document(page_content=content, metadata=metadata)
-                        for content, metadata in zip(
-                            results['documents'],
-                            results['metadatas']
-                        )
-                    ]
-                    self.search_strategy.initialize_documents(docs)
-        except Exception as e:
-            self.logger.error(f"Error initializing search documents: {str(e)}")
+        # Build the configured strategy (and its BM25 index) up front
+        self.get_search_strategy()
 
     def _create_store(self) -> Chroma:
         """Create and return the Chroma vector store instance."""
@@ -55,40 +36,31 @@ class ChromaVectorStore(BaseVectorStore):
                 f"Error initializing Chroma vector store: {str(e)}")
             return None
 
-    def _initialize_bm25(self):
-        """Initialize BM25 with all documents in the store."""
-        try:
-            if self._store:
-                results = self._store.get()
-                if results and len(results['documents']) > 0:
-                    self.all_documents = results['documents']
-                    self.logger.info(
-                        f"Retrieved {len(self.all_documents)} documents for BM25 initialization")
-                    # Initialize BM25 with all documents
-                    success = self.bm25_scorer.initialize(self.all_documents)
-                    if success:
-                        self.logger.info("BM25 initialization successful")
-                    else:
-                        self.logger.error("BM25 initialization failed")
-        except Exception as e:
-            self.logger.error(f"Error initializing BM25: {str(e)}")
-
     def add_documents(self, documents: List[Document], ids: Optional[List[str]] = None) -> bool:
         """Add documents to both vector store and BM25."""
         success = super().add_documents(documents, ids)
         if success:
             self.logger.info(
-                "Documents added to vector store, reinitializing BM25")
-            self._initialize_bm25()
+                "Documents added to vector store, updating search indexes")
+            self._update_search_indexes(None, documents)
         return success
 
+    def after_fork(self) -> None:
+        """Reopen the Chroma client; the parent's SQLite handles must not be reused."""
+        SharedSystemClient.clear_system_cache()
+        self._store = self._create_store()
+        for strategy in self._search_strategies.values():
+            strategy.bind_store(self._store)
+
     def similarity_search_with_score(
         self,
         query: str,
-        k: Optional[int] = None
+        k: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        search_type: Optional[str] = None
     ) -> List[Tuple[Document, float]]:
-        """Execute search using configured strategy."""
-        return self.search_strategy.search(query, k)
+        """Execute search using configured strategy, pushing down any filter."""
+        return self.get_search_strategy(search_type).search(query, k, filter)
     # def similarity_search_with_score(
     #     self,
     #     query: str,
@@ -143,13 +115,16 @@ class ChromaVectorStore(BaseVectorStore):
     #         return self._store.similarity_search_with_score(query, k=k)
 
     def delete(self, ids: Optional[List[str]] = None) -> bool:
-        """Delete the entire collection."""
+        """Delete documents by id, or the entire collection if no ids are given."""
         if not self._store:
             self.logger.error("Vector store not initialized")
             return False
+        if ids:
+            return super().delete(ids)
         try:
             self._store.delete_collection()
             self._store = self._create_store()
+            self._reset_search_strategies()
             self.logger.info("Deleted collection and recreated store")
             return True
         except Exception as e:
@@ -0,0 +1,82 @@
+# vectorstore/collection_alias.py
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+
+def alias_path(persist_directory: str, alias: str) -> str:
+    """Path of the file pointing an alias at its active collection."""
+    return os.path.join(persist_directory, f"{alias}.alias.json")
+
+
+def versioned_name(alias: str, version: int) -> str:
+    """Collection name for a build of an alias; version 0 is the unversioned name."""
+    return alias if version == 0 else f"{alias}__v{version}"
+
+
+def read_alias(persist_directory: str, alias: str) -> Tuple[str, int]:
+    """
+    Resolve an alias to its active collection.
+
+    Args:
+        persist_directory: Chroma persist directory
+        alias: Configured collection name
+
+    Returns:
+        Tuple of (collection name, version); the alias itself at version 0
+        if no build has been swapped in yet
+    """
+    try:
+        with open(alias_path(persist_directory, alias)) as f:
+            pointer = json.load(f)
+        return pointer["collection"], int(pointer["version"])
+    except (OSError, ValueError, KeyError):
+        return alias, 0
+
+
+def read_retired(persist_directory: str, alias: str) -> Dict[int, float]:
+    """
+    Versions waiting to be dropped, with the time each may be dropped at.
+
+    Args:
+        persist_directory: Chroma persist directory
+        alias: Configured collection name
+
+    Returns:
+        Dict of version to drop time (seconds since the epoch)
+    """
+    try:
+        with open(alias_path(persist_directory, alias)) as f:
+            pointer = json.load(f)
+        return {int(version): float(drop_after)
+                for version, drop_after in pointer.get("retired", {}).items()}
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def write_alias(persist_directory: str, alias: str, version: int,
+                retired: Optional[Dict[int, float]] = None) -> None:
+    """
+    Atomically point an alias at a collection version.
+
+    The pointer is written to a temporary file and renamed over the old
+    one, so readers see either the previous or the new version, never a
+    partial file.
+
+    Args:
+        persist_directory: Chroma persist directory
+        alias: Configured collection name
+        version: Version to make active
+        retired: Old versions still to be dropped, with their drop times
+    """
+    os.makedirs(persist_directory, exist_ok=True)
+    path = alias_path(persist_directory, alias)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    pointer = {"collection": versioned_name(alias, version), "version": version}
+    if retired:
+        pointer["retired"] = {str(v): drop_after for v, drop_after in retired.items()}
+    with open(tmp_path, "w") as f:
+        json.dump(pointer, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
@@ -0,0 +1,490 @@
+# vectorstore/numpy_index.py
+import json
+import logging
+import os
+import shutil
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+import numpy as np
+from langchain_core.documents import Document
+from .quantization import BaseQuantizer, assign_clusters, kmeans
+from ..search.metadata_filter import MetadataFilterIndex
+
+# Raw float32 rows; the row count and width are kept in docstore.json
+VECTORS_FILE = "vectors.f32"
+# Rows copied per block when deletes compact the vectors file
+_COPY_ROWS = 8192
+
+
+class QuantizedVectorIndex:
+    """
+    NumPy vector index with optional IVF partitioning and compressed codes.
+
+    Full-precision vectors live in a memory-mapped file of raw float32 rows
+    and are only touched when re-ranking; queries scan the in-memory codes.
+    New batches are appended to the file in place. Codecs and IVF
+    centroids are retrained whenever the index has grown by retrain_growth
+    since they were last trained, so they never describe just the first
+    batch of a long load. The class exposes the subset of the LangChain
+    vector store interface used by BaseVectorStore and the search
+    strategies.
+    """
+
+    def __init__(self, directory: str, embedding: Any,
+                 quantizer: Optional[BaseQuantizer] = None,
+                 nlist: int = 0, nprobe: int = 8,
+                 rerank_candidates: int = 0, train_size: int = 20000,
+                 retrain_growth: float = 2.0):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.directory = directory
+        self.embeddings = embedding
+        self.quantizer = quantizer
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.rerank_candidates = rerank_candidates
+        self.train_size = train_size
+        self.retrain_growth = retrain_growth
+
+        self.dimensions = 0
+        # Number of vectors the codecs and centroids were last trained on
+        self._trained_rows = 0
+        self.ids: List[str] = []
+        self.documents: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self._vectors: Optional[np.ndarray] = None
+        self._codes: Optional[np.ndarray] = None
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+        self._filter_index: Optional[MetadataFilterIndex] = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _load(self) -> None:
+        """Load a previously persisted index, if any."""
+        if not os.path.exists(self._path("docstore.json")):
+            return
+
+        with open(self._path("docstore.json"), 'r') as f:
+            docstore = json.load(f)
+        self.ids = docstore["ids"]
+        self.documents = docstore["documents"]
+        self.metadatas = docstore["metadatas"]
+        self.dimensions = docstore.get("dimensions", 0)
+        self._trained_rows = docstore.get("trained_rows", 0)
+
+        if os.path.exists(self._path("vectors.npy")):
+            self._migrate_vectors()
+        self._open_vectors(len(self.ids))
+
+        if self.quantizer and os.path.exists(self._path("quantizer.npz")):
+            with np.load(self._path("quantizer.npz")) as state:
+                self.quantizer.load_state(dict(state))
+            self._codes = np.load(self._path("codes.npy"))
+
+        if os.path.exists(self._path("ivf.npz")):
+            with np.load(self._path("ivf.npz")) as state:
+                self._centroids = state["centroids"]
+                self._assignments = state["assignments"]
+            self._build_lists()
+
+        self.logger.info(
+            f"Loaded {len(self.ids)} vectors from {self.directory}")
+
+    def _save(self) -> None:
+        """Persist the document store, codes and partitions."""
+        # Metadata may have changed; the filter index is rebuilt on the next filter
+        self._filter_index = None
+        docstore = {
+            "ids": self.ids,
+            "documents": self.documents,
+            "metadatas": self.metadatas,
+            "dimensions": self.dimensions,
+            "trained_rows": self._trained_rows
+        }
+        tmp_path = self._path("docstore.json.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(docstore, f)
+        os.replace(tmp_path, self._path("docstore.json"))
+
+        if self.quantizer and self.quantizer.is_trained:
+            np.savez(self._path("quantizer.npz"), **self.quantizer.state())
+            np.save(self._path("codes.npy"), self._codes)
+
+        if self._centroids is not None:
+            np.savez(self._path("ivf.npz"), centroids=self._centroids,
+                     assignments=self._assignments)
+
+    def _migrate_vectors(self) -> None:
+        """Convert an index written as a single .npy file to raw rows."""
+        vectors = np.load(self._path("vectors.npy"), mmap_mode='r')
+        self.dimensions = vectors.shape[1]
+        tmp_path = self._path(VECTORS_FILE + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            for start in range(0, len(vectors), _COPY_ROWS):
+                f.write(np.ascontiguousarray(
+                    vectors[start:start + _COPY_ROWS], dtype=np.float32).tobytes())
+        os.replace(tmp_path, self._path(VECTORS_FILE))
+        del vectors
+        os.remove(self._path("vectors.npy"))
+
+    def _open_vectors(self, rows: int) -> None:
+        """Memory-map the first rows of the full-precision file."""
+        if rows == 0 or not self.dimensions:
+            self._vectors = None
+            return
+        self._vectors = np.memmap(self._path(VECTORS_FILE), dtype=np.float32,
+                                  mode='r', shape=(rows, self.dimensions))
+
+    def _append_vectors(self, vectors: np.ndarray) -> None:
+        """Append rows to the full-precision file and extend the mapping."""
+        existing = 0 if self._vectors is None else len(self._vectors)
+        if existing and vectors.shape[1] != self.dimensions:
+            raise ValueError(
+                f"Expected {self.dimensions}-dimensional vectors, "
+                f"got {vectors.shape[1]}")
+        self.dimensions = vectors.shape[1]
+        with open(self._path(VECTORS_FILE), 'ab') as f:
+            # Drop rows a crash left behind after the last saved docstore
+            f.truncate(existing * self.dimensions * 4)
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        self._open_vectors(existing + len(vectors))
+
+    def _write_vector(self, row: int, vector: np.ndarray) -> None:
+        """Overwrite one row of the full-precision file in place."""
+        with open(self._path(VECTORS_FILE), 'r+b') as f:
+            f.seek(row * self.dimensions * 4)
+            f.write(np.ascontiguousarray(vector, dtype=np.float32).tobytes())
+
+    def _compact_vectors(self, keep: np.ndarray) -> None:
+        """
+        Copy the kept rows to a new file and swap it in.
+
+        Rows are streamed in blocks so the vectors are never all in memory,
+        and readers still holding the old mapping keep a consistent view.
+        """
+        tmp_path = self._path(VECTORS_FILE + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            for start in range(0, len(keep), _COPY_ROWS):
+                block = np.asarray(self._vectors[start:start + _COPY_ROWS])
+                f.write(block[keep[start:start + _COPY_ROWS]].tobytes())
+        os.replace(tmp_path, self._path(VECTORS_FILE))
+        self._open_vectors(int(keep.sum()))
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+    def _training_sample(self, vectors: np.ndarray) -> np.ndarray:
+        if vectors.shape[0] <= self.train_size:
+            return np.asarray(vectors)
+        rng = np.random.default_rng(0)
+        rows = np.sort(rng.choice(vectors.shape[0], self.train_size, replace=False))
+        return np.asarray(vectors[rows])
+
+    def _build_lists(self) -> None:
+        """Group vector rows by their IVF partition."""
+        order = np.argsort(self._assignments, kind='stable')
+        counts = np.bincount(self._assignments, minlength=len(self._centroids))
+        self._lists = np.split(order, np.cumsum(counts)[:-1])
+
+    def _reindex(self) -> None:
+        """Retrain codecs and partitions on the full-precision vectors."""
+        if self._vectors is None or len(self._vectors) == 0:
+            self._codes = None
+            self._centroids = None
+            self._assignments = None
+            self._lists = []
+            self._trained_rows = 0
+            return
+
+        self._trained_rows = len(self._vectors)
+        sample = self._training_sample(self._vectors)
+        if self.quantizer:
+            self.quantizer.train(sample)
+            self._codes = self.quantizer.encode(self._vectors)
+        if self.nlist > 0 and len(self._vectors) >= self.nlist:
+            self._centroids = kmeans(sample, self.nlist)
+            self._assignments = assign_clusters(
+                np.asarray(self._vectors), self._centroids)
+            self._build_lists()
+
+    def _append(self, vectors: np.ndarray) -> None:
+        """
+        Append new vectors, encoding them with the existing codecs.
+
+        Codecs and centroids are retrained on a sample of every stored
+        vector once the index reaches retrain_growth times the size they
+        were trained at. Growing geometrically keeps the re-encoding cost
+        linear in the corpus size over a load.
+        """
+        self._append_vectors(vectors)
+        total = len(self._vectors)
+
+        trained = bool(self.quantizer and self.quantizer.is_trained) or \
+            self._centroids is not None
+        needs_training = (
+            (self.quantizer and not self.quantizer.is_trained) or
+            (self.nlist > 0 and self._centroids is None and total >= self.nlist) or
+            (trained and total >= self.retrain_growth * self._trained_rows)
+        )
+        if needs_training:
+            self._reindex()
+            return
+
+        if self.quantizer:
+            self._codes = np.concatenate([self._codes, self.quantizer.encode(vectors)])
+        if self._centroids is not None:
+            self._assignments = np.concatenate(
+                [self._assignments, assign_clusters(vectors, self._centroids)])
+            self._build_lists()
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(texts):
+            raise ValueError("Embedder returned no vectors")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def add_documents(self, documents: List[Document],
+                      ids: Optional[List[str]] = None) -> List[str]:
+        """Embed, encode and persist documents."""
+        if ids is None:
+            ids = [str(uuid4()) for _ in documents]
+        vectors = self._embed([doc.page_content for doc in documents])
+
+        self.ids.extend(ids)
+        self.documents.extend(doc.page_content for doc in documents)
+        self.metadatas.extend(dict(doc.metadata) for doc in documents)
+        self._append(vectors)
+        self._save()
+        return ids
+
+    def update_document(self, document_id: str, document: Document) -> None:
+        """Replace a single document and its vector."""
+        row = self.ids.index(document_id)
+        vector = self._embed([document.page_content])
+        self._write_vector(row, vector[0])
+        self.documents[row] = document.page_content
+        self.metadatas[row] = dict(document.metadata)
+        if self.quantizer and self.quantizer.is_trained:
+            self._codes[row] = self.quantizer.encode(vector)[0]
+        if self._centroids is not None:
+            self._assignments[row] = assign_clusters(vector, self._centroids)[0]
+            self._build_lists()
+        self._save()
+
+    def delete(self, ids: Optional[List[str]] = None) -> None:
+        """Delete documents by id."""
+        if not ids:
+            return
+        remove = set(ids)
+        keep = np.array([doc_id not in remove for doc_id in self.ids], dtype=bool)
+        if keep.all():
+            return
+        self.ids = [i for i, k in zip(self.ids, keep) if k]
+        self.documents = [d for d, k in zip(self.documents, keep) if k]
+        self.metadatas = [m for m, k in zip(self.metadatas, keep) if k]
+        if self._vectors is not None:
+            self._compact_vectors(keep)
+        if self._codes is not None:
+            self._codes = self._codes[keep]
+        if self._assignments is not None:
+            self._assignments = self._assignments[keep]
+            self._build_lists()
+        self._save()
+
+    def delete_collection(self) -> None:
+        """Remove every persisted file of the index."""
+        self._vectors = None
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def get(self, ids: Optional[List[str]] = None, limit: Optional[int] = None,
+            offset: Optional[int] = None,
+            include: Optional[List[str]] = None,
+            where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Return stored rows in the same shape as Chroma's get()."""
+        include = ["documents", "metadatas"] if include is None else include
+        if ids is not None:
+            wanted = set(ids)
+            rows = [i for i, doc_id in enumerate(self.ids) if doc_id in wanted]
+        elif where:
+            if self._filter_index is None:
+                self._filter_index = MetadataFilterIndex(self.metadatas)
+            rows = self._filter_index.select(where).tolist()
+            rows = rows[offset or 0:None if limit is None else (offset or 0) + limit]
+        else:
+            start = offset or 0
+            stop = len(self.ids) if limit is None else start + limit
+            rows = list(range(start, min(stop, len(self.ids))))
+
+        result = {"ids": [self.ids[i] for i in rows]}
+        result["documents"] = (
+            [self.documents[i] for i in rows] if "documents" in include else None)
+        result["metadatas"] = (
+            [self.metadatas[i] for i in rows] if "metadatas" in include else None)
+        result["embeddings"] = (
+            np.asarray(self._vectors[rows])
+            if "embeddings" in include and self._vectors is not None else None)
+        return result
+
+    def _candidate_rows(self, query: np.ndarray,
+                        filter: Optional[Dict[str, Any]]) -> np.ndarray:
+        """Select rows to score from the probed IVF lists and the filter."""
+        if self._centroids is not None:
+            probes = np.argsort(-(self._centroids @ query))[:self.nprobe]
+            rows = np.sort(np.concatenate([self._lists[p] for p in probes]))
+        else:
+            rows = np.arange(len(self.ids))
+
+        if filter:
+            if self._filter_index is None:
+                self._filter_index = MetadataFilterIndex(self.metadatas)
+            rows = np.intersect1d(rows, self._filter_index.select(filter),
+                                  assume_unique=True)
+        return rows
+
+    def _score(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Approximate (or exact when uncompressed) inner products for rows."""
+        if self.quantizer and self._codes is not None:
+            return self.quantizer.inner_products(query, self._codes[rows])
+        return np.asarray(self._vectors[rows]) @ query
+
+    def search_vector(self, query: np.ndarray, k: int,
+                      filter: Optional[Dict[str, Any]] = None,
+                      rerank_candidates: Optional[int] = None
+                      ) -> List[Tuple[int, float]]:
+        """
+        Find the rows most similar to a normalized query vector.
+
+        Args:
+            query: Normalized query vector
+            k: Number of rows to return
+            filter: Optional Chroma-style metadata where clause
+            rerank_candidates: Override for the number of candidates re-scored
+                with full-precision vectors (0 disables re-ranking)
+
+        Returns:
+            List of (row, cosine similarity) tuples, best first
+        """
+        if not self.ids:
+            return []
+        rows = self._candidate_rows(query, filter)
+        if len(rows) == 0:
+            return []
+
+        scores = self._score(query, rows)
+        rerank = self.rerank_candidates if rerank_candidates is None else rerank_candidates
+        n_keep = max(rerank, k) if self.quantizer and rerank > 0 else k
+        n_keep = min(n_keep, len(rows))
+        top = np.argpartition(-scores, n_keep - 1)[:n_keep]
+        rows, scores = rows[top], scores[top]
+
+        if self.quantizer and rerank > 0:
+            # Read only the candidate rows from the memory-mapped file
+            order = np.argsort(rows)
+            rows = rows[order]
+            scores = np.asarray(self._vectors[rows]) @ query
+
+        best = np.argsort(-scores)[:k]
+        return [(int(rows[i]), float(scores[i])) for i in best]
+
+    def similarity_search_with_score(self, query: str, k: int = 4,
+                                     filter: Optional[Dict[str, Any]] = None
+                                     ) -> List[Tuple[Document, float]]:
+        """
+        Search by text, returning cosine distances (lower is better).
+
+        Filters use Chroma where syntax and are resolved to candidate rows
+        through the metadata filter index before any vectors are scored.
+        """
+        return self.similarity_search_by_vector_with_relevance_scores(
+            self.embeddings.embed_query(query), k, filter)
+
+    def similarity_search_by_vector_with_relevance_scores(
+            self, embedding: List[float], k: int = 4,
+            filter: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
+        """Search by an embedded query, returning cosine distances (lower is better)."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        vector = vector / max(float(np.linalg.norm(vector)), 1e-12)
+        return [
+            (Document(page_content=self.documents[row],
+                      metadata=self.metadatas[row]), 1.0 - score)
+            for row, score in self.search_vector(vector, k, filter)
+        ]
+
+    def similarity_search(self, query: str, k: int = 4,
+                          filter: Optional[Dict[str, Any]] = None) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, filter)]
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    def compression_stats(self) -> Dict[str, Any]:
+        """Report the memory footprint of the compressed representation."""
+        n = len(self.ids)
+        dimensions = self.dimensions if n else 0
+        full_bytes = n * dimensions * 4
+        if self.quantizer and self.quantizer.is_trained:
+            compressed_bytes = n * self.quantizer.code_size + self.quantizer.codebook_size
+        else:
+            compressed_bytes = full_bytes
+        if self._centroids is not None:
+            compressed_bytes += self._centroids.nbytes + self._assignments.nbytes
+        return {
+            "quantization": self.quantizer.name if self.quantizer else "none",
+            "vectors": n,
+            "dimensions": dimensions,
+            "full_precision_bytes": full_bytes,
+            "compressed_bytes": compressed_bytes,
+            "compression_ratio": full_bytes / compressed_bytes if compressed_bytes else 0.0
+        }
+
+    def evaluate_recall(self, k: int = 10, sample_size: int = 100,
+                        seed: int = 0) -> Dict[str, float]:
+        """
+        Measure recall@k of the compressed search against exact search.
+
+        Stored vectors are used as queries and ground truth comes from a
+        full-precision scan of the memory-mapped vectors.
+
+        Args:
+            k: Number of neighbours compared per query
+            sample_size: Number of stored vectors used as queries
+            seed: Seed for query sampling
+
+        Returns:
+            Dict with recall with and without full-precision re-ranking
+        """
+        n = len(self.ids)
+        if n == 0:
+            return {}
+        k = min(k, n)
+        rng = np.random.default_rng(seed)
+        queries = rng.choice(n, min(sample_size, n), replace=False)
+        vectors = np.asarray(self._vectors)
+
+        recall = {"recall_at_k": 0.0, "recall_at_k_reranked": 0.0}
+        for row in queries:
+            query = vectors[row]
+            exact = set(np.argpartition(-(vectors @ query), k - 1)[:k].tolist())
+            approx = {r for r, _ in self.search_vector(query, k, rerank_candidates=0)}
+            recall["recall_at_k"] += len(exact & approx) / k
+            if self.rerank_candidates > 0:
+                reranked = {r for r, _ in self.search_vector(query, k)}
+                recall["recall_at_k_reranked"] += len(exact & reranked) / k
+
+        recall = {key: value / len(queries) for key, value in recall.items()}
+        if self.rerank_candidates <= 0:
+            recall.pop("recall_at_k_reranked")
+        recall["k"] = k
+        return recall
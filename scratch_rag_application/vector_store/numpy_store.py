@@ -0,0 +1,104 @@
+# vectorstore/numpy_store.py
+import os
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.documents import Document
+from .base_vector_store import BaseVectorStore
+from .numpy_index import QuantizedVectorIndex
+from .quantization import create_quantizer
+
+
+class NumpyVectorStore(BaseVectorStore):
+    """In-process NumPy vector store with quantized (sq8/pq) embeddings."""
+
+    def __init__(self, params: dict, embedding):
+        super().__init__(params, embedding)
+        # Build the configured strategy (and its BM25 index) up front
+        self.get_search_strategy()
+
+    def _create_store(self) -> QuantizedVectorIndex:
+        """Create and return the quantized NumPy index."""
+        try:
+            persist_directory = self.params.get(
+                "vectorstore.numpy.persist_directory", "./numpy_index")
+            collection_name = self.params.get(
+                "vectorstore.numpy.collection_name", "default")
+            quantization = self.params.get(
+                "vectorstore.numpy.quantization", "sq8")
+
+            return QuantizedVectorIndex(
+                directory=os.path.join(persist_directory, collection_name),
+                embedding=self.embedding,
+                quantizer=create_quantizer(quantization, self.params),
+                nlist=self.params.get("vectorstore.numpy.ivf.nlist", 0),
+                nprobe=self.params.get("vectorstore.numpy.ivf.nprobe", 8),
+                rerank_candidates=self.params.get(
+                    "vectorstore.numpy.rerank_candidates", 50),
+                retrain_growth=self.params.get(
+                    "vectorstore.numpy.retrain_growth", 2.0)
+            )
+        except Exception as e:
+            self.logger.error(
+                f"Error initializing NumPy vector store: {str(e)}")
+            return None
+
+    def add_documents(self, documents: List[Document], ids: Optional[List[str]] = None) -> bool:
+        """Add documents to the index and refresh the search strategy."""
+        success = super().add_documents(documents, ids)
+        if success:
+            stats = self._store.compression_stats()
+            self.logger.info(
+                f"Index holds {stats['vectors']} vectors in "
+                f"{stats['compressed_bytes']} bytes "
+                f"({stats['compression_ratio']:.1f}x compression)")
+            self._update_search_indexes(None, documents)
+        return success
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        search_type: Optional[str] = None
+    ) -> List[Tuple[Document, float]]:
+        """Execute search using configured strategy, pushing down any filter."""
+        return self.get_search_strategy(search_type).search(query, k, filter)
+
+    def quantization_report(self, k: int = 10, sample_size: int = 100) -> Dict[str, Any]:
+        """
+        Report compression ratio and the recall it costs.
+
+        Args:
+            k: Number of neighbours compared per query
+            sample_size: Number of stored vectors used as queries
+
+        Returns:
+            Dict combining compression statistics and recall@k
+        """
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return {}
+        try:
+            report = self._store.compression_stats()
+            report.update(self._store.evaluate_recall(k, sample_size))
+            self.logger.info(f"Quantization report: {report}")
+            return report
+        except Exception as e:
+            self.logger.error(f"Error building quantization report: {str(e)}")
+            return {}
+
+    def delete(self, ids: Optional[List[str]] = None) -> bool:
+        """Delete documents by id, or the entire index if no ids are given."""
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return False
+        if ids:
+            return super().delete(ids)
+        try:
+            self._store.delete_collection()
+            self._store = self._create_store()
+            self._reset_search_strategies()
+            self.logger.info("Deleted index and recreated store")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error deleting index: {str(e)}")
+            return False
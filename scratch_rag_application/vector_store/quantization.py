@@ -0,0 +1,263 @@
+# vectorstore/quantization.py
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+import numpy as np
+
+# Number of rows scored per block so temporary float32 buffers stay small
+BLOCK_SIZE = 4096
+
+
+def assign_clusters(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """
+    Assign each vector to its nearest centroid by squared L2 distance.
+
+    Args:
+        vectors: Array of shape (n, d)
+        centroids: Array of shape (k, d)
+
+    Returns:
+        Array of shape (n,) with the index of the nearest centroid
+    """
+    centroid_norms = np.einsum('ij,ij->i', centroids, centroids)
+    assignments = np.empty(vectors.shape[0], dtype=np.int64)
+    for start in range(0, vectors.shape[0], BLOCK_SIZE):
+        block = vectors[start:start + BLOCK_SIZE]
+        # ||x||^2 is constant per row, so it does not affect the argmin
+        distances = centroid_norms[None, :] - 2.0 * block @ centroids.T
+        assignments[start:start + BLOCK_SIZE] = np.argmin(distances, axis=1)
+    return assignments
+
+
+def kmeans(vectors: np.ndarray, n_clusters: int, iterations: int = 20,
+           seed: int = 0) -> np.ndarray:
+    """
+    Train centroids with Lloyd's algorithm.
+
+    Args:
+        vectors: Training vectors of shape (n, d)
+        n_clusters: Number of centroids to train (capped at n)
+        iterations: Number of assignment/update rounds
+        seed: Seed for centroid initialisation
+
+    Returns:
+        Centroids of shape (n_clusters, d)
+    """
+    rng = np.random.default_rng(seed)
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n = vectors.shape[0]
+    n_clusters = min(n_clusters, n)
+    centroids = vectors[rng.choice(n, n_clusters, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignments = assign_clusters(vectors, centroids)
+        counts = np.bincount(assignments, minlength=n_clusters)
+        nonempty = counts > 0
+
+        # Sum members per cluster with one sort + reduceat instead of np.add.at
+        order = np.argsort(assignments, kind='stable')
+        starts = (np.cumsum(counts) - counts)[nonempty]
+        sums = np.add.reduceat(vectors[order], starts, axis=0)
+        centroids[nonempty] = sums / counts[nonempty, None]
+
+        # Re-seed empty clusters from random training points
+        empty = ~nonempty
+        if empty.any():
+            centroids[empty] = vectors[rng.choice(n, int(empty.sum()))]
+
+    return centroids
+
+
+class BaseQuantizer(ABC):
+    """Abstract base class for compressed vector codecs."""
+
+    name: str = ""
+
+    def __init__(self):
+        self.dimensions: Optional[int] = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.dimensions is not None
+
+    @abstractmethod
+    def train(self, vectors: np.ndarray) -> None:
+        """Fit the codec parameters on a sample of vectors."""
+        pass
+
+    @abstractmethod
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Compress vectors of shape (n, d) into codes."""
+        pass
+
+    @abstractmethod
+    def inner_products(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Approximate inner products between a query and encoded vectors."""
+        pass
+
+    @property
+    @abstractmethod
+    def code_size(self) -> int:
+        """Bytes used per encoded vector."""
+        pass
+
+    @property
+    @abstractmethod
+    def codebook_size(self) -> int:
+        """Bytes used by the trained codec parameters."""
+        pass
+
+    @abstractmethod
+    def state(self) -> Dict[str, Any]:
+        """Return arrays needed to persist the trained codec."""
+        pass
+
+    @abstractmethod
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """Restore a codec from arrays returned by state()."""
+        pass
+
+
+class ScalarQuantizer(BaseQuantizer):
+    """8-bit scalar quantizer with a per-dimension min/max range."""
+
+    name = "sq8"
+
+    def __init__(self):
+        super().__init__()
+        self.vmin: Optional[np.ndarray] = None
+        self.scale: Optional[np.ndarray] = None
+
+    def train(self, vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.vmin = vectors.min(axis=0)
+        vmax = vectors.max(axis=0)
+        # Guard against constant dimensions
+        self.scale = np.maximum((vmax - self.vmin) / 255.0, 1e-12).astype(np.float32)
+        self.dimensions = vectors.shape[1]
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        scaled = (np.asarray(vectors, dtype=np.float32) - self.vmin) / self.scale
+        return np.clip(np.rint(scaled), 0, 255).astype(np.uint8)
+
+    def inner_products(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        # q . (vmin + code * scale) = q . vmin + code . (q * scale)
+        offset = float(query @ self.vmin)
+        weights = (query * self.scale).astype(np.float32)
+        scores = np.empty(codes.shape[0], dtype=np.float32)
+        for start in range(0, codes.shape[0], BLOCK_SIZE):
+            block = codes[start:start + BLOCK_SIZE].astype(np.float32)
+            scores[start:start + BLOCK_SIZE] = block @ weights
+        return scores + offset
+
+    @property
+    def code_size(self) -> int:
+        return self.dimensions
+
+    @property
+    def codebook_size(self) -> int:
+        return self.vmin.nbytes + self.scale.nbytes
+
+    def state(self) -> Dict[str, Any]:
+        return {"vmin": self.vmin, "scale": self.scale}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self.vmin = state["vmin"]
+        self.scale = state["scale"]
+        self.dimensions = self.vmin.shape[0]
+
+
+class ProductQuantizer(BaseQuantizer):
+    """Product quantizer with 256 centroids per subspace and asymmetric distances."""
+
+    name = "pq"
+    n_centroids = 256
+
+    def __init__(self, subspaces: int = 96, iterations: int = 20, seed: int = 0):
+        super().__init__()
+        self.subspaces = subspaces
+        self.iterations = iterations
+        self.seed = seed
+        self.codebooks: Optional[np.ndarray] = None
+
+    def train(self, vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        dimensions = vectors.shape[1]
+        if dimensions % self.subspaces:
+            raise ValueError(
+                f"Embedding dimensions ({dimensions}) must be divisible by "
+                f"the number of PQ subspaces ({self.subspaces})")
+
+        sub_dim = dimensions // self.subspaces
+        n_centroids = min(self.n_centroids, vectors.shape[0])
+        codebooks = np.zeros(
+            (self.subspaces, self.n_centroids, sub_dim), dtype=np.float32)
+        for m in range(self.subspaces):
+            sub_vectors = vectors[:, m * sub_dim:(m + 1) * sub_dim]
+            codebooks[m, :n_centroids] = kmeans(
+                sub_vectors, n_centroids, self.iterations, self.seed + m)
+            # Unused slots repeat the first centroid so they are never nearer
+            codebooks[m, n_centroids:] = codebooks[m, 0]
+        self.codebooks = codebooks
+        self.dimensions = dimensions
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        sub_dim = self.dimensions // self.subspaces
+        codes = np.empty((vectors.shape[0], self.subspaces), dtype=np.uint8)
+        for m in range(self.subspaces):
+            codes[:, m] = assign_clusters(
+                vectors[:, m * sub_dim:(m + 1) * sub_dim], self.codebooks[m])
+        return codes
+
+    def distance_table(self, query: np.ndarray) -> np.ndarray:
+        """Inner products between each query sub-vector and every centroid."""
+        sub_queries = query.reshape(self.subspaces, -1)
+        return np.einsum('md,mkd->mk', sub_queries, self.codebooks)
+
+    def inner_products(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        table = self.distance_table(query)
+        columns = np.arange(self.subspaces)
+        scores = np.empty(codes.shape[0], dtype=np.float32)
+        for start in range(0, codes.shape[0], BLOCK_SIZE):
+            block = codes[start:start + BLOCK_SIZE]
+            scores[start:start + BLOCK_SIZE] = table[columns, block].sum(axis=1)
+        return scores
+
+    @property
+    def code_size(self) -> int:
+        return self.subspaces
+
+    @property
+    def codebook_size(self) -> int:
+        return self.codebooks.nbytes
+
+    def state(self) -> Dict[str, Any]:
+        return {"codebooks": self.codebooks}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self.codebooks = state["codebooks"]
+        self.subspaces = self.codebooks.shape[0]
+        self.dimensions = self.subspaces * self.codebooks.shape[2]
+
+
+def create_quantizer(quantization: str, params: Dict[str, Any]) -> Optional[BaseQuantizer]:
+    """
+    Create a quantizer for the configured compression type.
+
+    Args:
+        quantization: One of "none", "sq8" or "pq"
+        params: Configuration parameters
+
+    Returns:
+        Quantizer instance, or None for full-precision storage
+    """
+    if quantization in (None, "none"):
+        return None
+    if quantization == "sq8":
+        return ScalarQuantizer()
+    if quantization == "pq":
+        return ProductQuantizer(
+            subspaces=params.get("vectorstore.numpy.pq.subspaces", 96),
+            iterations=params.get("vectorstore.numpy.pq.iterations", 20)
+        )
+    raise ValueError(f"Unsupported quantization type: {quantization}")
@@ -0,0 +1,329 @@
+# vectorstore/sharded_chroma.py
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import uuid4
+from langchain_core.documents import Document
+from ..embedding.batching import QueryEmbeddingError
+from .base_vector_store import BaseVectorStore
+from .chroma import ChromaVectorStore
+
+
+class ShardParams:
+    """Read-through view of the configuration with per-shard overrides."""
+
+    def __init__(self, params: Any, overrides: Dict[str, Any]):
+        self.params = params
+        self.overrides = overrides
+
+    def get(self, path: str, default: Any = None) -> Any:
+        if path in self.overrides:
+            return self.overrides[path]
+        return self.params.get(path, default)
+
+
+class SharedQueryEmbedding:
+    """
+    Embedding wrapper that embeds each query once for all shards.
+
+    Every shard's search strategy calls embed_query with the same text; the
+    first call computes the vector and the others reuse it.
+    """
+
+    def __init__(self, embedding: Any, max_entries: int = 64):
+        self.embedding = embedding
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embedding.embed_documents(texts)
+
+    def after_fork(self) -> None:
+        self._lock = threading.Lock()
+
+    async def aembed_query(self, text: str) -> List[float]:
+        with self._lock:
+            vector = self._cache.get(text)
+            if vector is not None:
+                self._cache.move_to_end(text)
+                return vector
+        vector = await self.embedding.aembed_query(text)
+        if vector:
+            with self._lock:
+                self._cache[text] = vector
+                if len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        return vector
+
+    def embed_query(self, text: str) -> List[float]:
+        with self._lock:
+            vector = self._cache.get(text)
+            if vector is not None:
+                self._cache.move_to_end(text)
+                return vector
+        vector = self.embedding.embed_query(text)
+        if vector:
+            with self._lock:
+                self._cache[text] = vector
+                if len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        return vector
+
+
+class ShardedChromaVectorStore(BaseVectorStore):
+    """
+    Chroma store partitioned across several collections.
+
+    Chunks are routed to a shard by a stable hash of a metadata key, each
+    shard keeps its own HNSW index and search strategy, and queries fan out
+    to all shards in parallel before a global top-k merge. BM25 statistics
+    are per shard, so hybrid and BM25 scores are only approximately
+    comparable across shards.
+    """
+
+    def __init__(self, params: dict, embedding):
+        self.num_shards = params.get("vectorstore.sharded_chroma.num_shards", 4)
+        self.shard_key = params.get("vectorstore.sharded_chroma.shard_key", "source")
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.num_shards, thread_name_prefix="shard")
+        super().__init__(params, embedding)
+
+    def _shard_params(self, index: int) -> ShardParams:
+        persist_directory = self.params.get(
+            "vectorstore.sharded_chroma.persist_directory", "./chroma_db")
+        collection_name = self.params.get(
+            "vectorstore.sharded_chroma.collection_name", "default")
+        return ShardParams(self.params, {
+            "vectorstore.chroma.persist_directory": persist_directory,
+            "vectorstore.chroma.collection_name": f"{collection_name}_shard_{index}"
+        })
+
+    def _create_store(self) -> List[ChromaVectorStore]:
+        """Create one ChromaVectorStore per shard."""
+        try:
+            self.shared_embedding = SharedQueryEmbedding(self.embedding)
+            return list(self._executor.map(
+                lambda i: ChromaVectorStore(self._shard_params(i), self.shared_embedding),
+                range(self.num_shards)
+            ))
+        except Exception as e:
+            self.logger.error(
+                f"Error initializing sharded Chroma vector store: {str(e)}")
+            return None
+
+    def after_fork(self) -> None:
+        """Recreate the fan-out pool (threads do not survive fork) and reopen shards."""
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.num_shards, thread_name_prefix="shard")
+        self.shared_embedding.after_fork()
+        for shard in self._store or []:
+            shard.after_fork()
+
+    def warm_search_indexes(self, search_types: Optional[List[str]] = None) -> None:
+        for shard in self._store or []:
+            shard.warm_search_indexes(search_types)
+
+    def shard_for(self, document: Document) -> int:
+        """Return the shard index for a document from a stable hash of its key."""
+        key = str(document.metadata.get(self.shard_key, ""))
+        digest = hashlib.md5(key.encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") % self.num_shards
+
+    def _higher_is_better(self, search_type: Optional[str] = None) -> bool:
+        # Vector search returns distances; BM25 and hybrid return scores
+        search_type = search_type or self.params.get("scoring.type", "hybrid")
+        return search_type != "vector"
+
+    def add_documents(self, documents: List[Document], ids: Optional[List[str]] = None) -> bool:
+        """Partition documents by shard key and write shards concurrently."""
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return False
+        try:
+            if ids is None:
+                ids = [str(uuid4()) for _ in range(len(documents))]
+
+            partitions: Dict[int, Tuple[List[Document], List[str]]] = {}
+            for doc, doc_id in zip(documents, ids):
+                shard_docs, shard_ids = partitions.setdefault(
+                    self.shard_for(doc), ([], []))
+                shard_docs.append(doc)
+                shard_ids.append(doc_id)
+
+            for index, (shard_docs, _) in sorted(partitions.items()):
+                self.logger.info(f"Shard {index}: {len(shard_docs)} documents")
+
+            results = self._executor.map(
+                lambda item: self._store[item[0]].add_documents(*item[1]),
+                partitions.items()
+            )
+            return all(results)
+        except Exception as e:
+            self.logger.error(
+                f"Error adding documents to sharded store: {str(e)}")
+            return False
+
+    def _merge(self, shard_results: List[List[Tuple[Document, float]]],
+               k: int, search_type: Optional[str] = None) -> List[Tuple[Document, float]]:
+        merged = [result for results in shard_results for result in results]
+        merged.sort(key=lambda x: x[1], reverse=self._higher_is_better(search_type))
+        return merged[:k]
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        search_type: Optional[str] = None
+    ) -> List[Tuple[Document, float]]:
+        """Scatter the query to every shard and merge a global top-k."""
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return []
+        try:
+            k = k or self.params.get("scoring.parameters.k", 4)
+            # Embed once up front; shard strategies hit the shared cache
+            self.shared_embedding.embed_query(query)
+            shard_results = list(self._executor.map(
+                lambda shard: shard.similarity_search_with_score(
+                    query, k, filter, search_type),
+                self._store
+            ))
+            return self._merge(shard_results, k, search_type)
+        except Exception as e:
+            self.logger.error(f"Error in sharded search: {str(e)}")
+            return []
+
+    async def asimilarity_search_with_score(
+        self,
+        query: str,
+        k: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        search_type: Optional[str] = None
+    ) -> List[Tuple[Document, float]]:
+        """Scatter the query to every shard concurrently and merge a global top-k."""
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return []
+        try:
+            k = k or self.params.get("scoring.parameters.k", 4)
+            await self.shared_embedding.aembed_query(query)
+            shard_results = await asyncio.gather(*(
+                shard.asimilarity_search_with_score(query, k, filter, search_type)
+                for shard in self._store
+            ))
+            return self._merge(shard_results, k, search_type)
+        except QueryEmbeddingError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error in sharded search: {str(e)}")
+            return []
+
+    def similarity_search(self, query: str, k: int = 4,
+                          filter: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """Perform vector similarity search across all shards."""
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return []
+        try:
+            self.shared_embedding.embed_query(query)
+            shard_results = list(self._executor.map(
+                lambda shard: shard._store.similarity_search_with_score(
+                    query, k=k, filter=filter),
+                self._store
+            ))
+            merged = [result for results in shard_results for result in results]
+            merged.sort(key=lambda x: x[1])
+            return [doc for doc, _ in merged[:k]]
+        except Exception as e:
+            self.logger.error(f"Error performing similarity search: {str(e)}")
+            return []
+
+    def delete_by_metadata(self, where: Dict[str, Any]) -> int:
+        """Delete matching documents from every shard concurrently."""
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return 0
+        return sum(self._executor.map(
+            lambda shard: shard.delete_by_metadata(where), self._store))
+
+    def iter_documents(self, batch_size: Optional[int] = None,
+                       include: Optional[List[str]] = None,
+                       where: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """Page through each shard in turn; pages never span shards."""
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return
+        for shard in self._store:
+            yield from shard.iter_documents(batch_size or self.page_size, include, where)
+
+    def update_document(self, document_id: str, document: Document) -> bool:
+        """Update a document in whichever shard holds it."""
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return False
+        for shard in self._store:
+            if shard._store and shard._store.get(ids=[document_id])['ids']:
+                return shard.update_document(document_id, document)
+        self.logger.error(f"Document {document_id} not found in any shard")
+        return False
+
+    def rebuild_shard(self, index: int, documents: List[Document],
+                      ids: Optional[List[str]] = None) -> bool:
+        """
+        Rebuild a single shard without touching the others.
+
+        Args:
+            index: Shard to rebuild
+            documents: All documents that belong to the shard
+            ids: Optional document ids
+
+        Returns:
+            bool: True if the shard was rebuilt
+        """
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return False
+        misplaced = [doc for doc in documents if self.shard_for(doc) != index]
+        if misplaced:
+            self.logger.error(
+                f"{len(misplaced)} documents do not belong to shard {index}")
+            return False
+        shard = self._store[index]
+        return shard.delete() and shard.add_documents(documents, ids)
+
+    def _route_ids(self, ids: List[str]) -> Dict[int, List[str]]:
+        """
+        Group ids by the shard holding them.
+
+        Ids carry no shard key, so each shard is asked which of the ids it
+        holds; that is the shard shard_for picked when the chunk was added.
+        """
+        def owned(index: int) -> Tuple[int, List[str]]:
+            shard = self._store[index]
+            return index, shard._store.get(ids=ids, include=[])['ids'] if shard._store else []
+
+        return {index: shard_ids
+                for index, shard_ids in self._executor.map(owned, range(len(self._store)))
+                if shard_ids}
+
+    def delete(self, ids: Optional[List[str]] = None) -> bool:
+        """Delete documents from the shards holding them, or every shard's collection."""
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return False
+        if not ids:
+            return all(self._executor.map(lambda shard: shard.delete(), self._store))
+        try:
+            # Only owning shards are touched: an empty id list would drop a
+            # shard's whole collection
+            routed = self._route_ids(ids)
+            return all(self._executor.map(
+                lambda item: self._store[item[0]].delete(item[1]), routed.items()))
+        except Exception as e:
+            self.logger.error(f"Error deleting documents from sharded store: {str(e)}")
+            return False
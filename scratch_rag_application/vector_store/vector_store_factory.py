@@ -2,12 +2,17 @@
 from typing import Dict, Type
 from .base_vector_store import BaseVectorStore
 from .chroma import ChromaVectorStore
+from .numpy_store import NumpyVectorStore
+from .sharded_chroma import ShardedChromaVectorStore
+from .versioned_chroma import VersionedChromaVectorStore
 from langchain_core.embeddings import Embeddings
 
 
 class VectorStoreFactory:
     _stores: Dict[str, Type[BaseVectorStore]] = {
-        "chroma": ChromaVectorStore
+        "chroma": ChromaVectorStore,
+        "numpy": NumpyVectorStore,
+        "sharded_chroma": ShardedChromaVectorStore
     }
 
     def __init__(self, config: dict):
@@ -20,4 +25,8 @@ class VectorStoreFactory:
         if not store_class:
             raise ValueError(f"Unsupported vector store type: {store_type}")
 
+        rebuild_mode = self.config.get("vectorstore.chroma.rebuild_mode", "in_place")
+        if store_type == "chroma" and rebuild_mode == "blue_green":
+            store_class = VersionedChromaVectorStore
+
         return store_class(self.config, embedding)
@@ -0,0 +1,382 @@
+# vectorstore/versioned_chroma.py
+from contextlib import contextmanager
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+from ..utils.executor import run_blocking
+from .base_vector_store import BaseVectorStore
+from .chroma import ChromaVectorStore
+from .collection_alias import read_alias, read_retired, versioned_name, write_alias
+from .sharded_chroma import ShardParams
+
+
+class VersionedChromaVectorStore(BaseVectorStore):
+    """
+    Chroma store with blue/green rebuilds behind a collection alias.
+
+    The configured collection name is an alias resolved through a small
+    pointer file. rebuild() ingests into a fresh versioned collection and
+    builds its search indexes while queries keep using the active version,
+    checks the new build and swaps the alias and the in-process reference
+    in one step.
+
+    The old version is not dropped on the write path. It is recorded as
+    retired in the alias file, and becomes due once processes following
+    the alias have had two check intervals to reopen. Whichever process
+    next finds it due (a serving process's periodic alias check, or the
+    next rebuild) drops it, unless a query in that process still has it
+    pinned.
+    """
+
+    def __init__(self, params: dict, embedding):
+        self.persist_directory = params.get(
+            "vectorstore.chroma.persist_directory", "./chroma_db")
+        self.alias = params.get("vectorstore.chroma.collection_name", "default")
+        self.min_documents = params.get("vectorstore.chroma.blue_green.min_documents", 1)
+        self.drain_timeout = params.get("vectorstore.chroma.blue_green.drain_timeout", 30)
+        self.alias_check_interval = params.get(
+            "vectorstore.chroma.blue_green.alias_check_interval", 5)
+        self._inflight: Dict[int, int] = {}
+        # Versions this process retired, kept so pinned queries are counted
+        self._retired: Dict[int, ChromaVectorStore] = {}
+        self._drained = threading.Condition()
+        self._rebuild_lock = threading.Lock()
+        self._next_alias_check = time.monotonic() + self.alias_check_interval
+        super().__init__(params, embedding)
+
+    def _open_version(self, version: int) -> ChromaVectorStore:
+        """Open (or create) the collection for a version with its own indexes."""
+        store = ChromaVectorStore(ShardParams(self.params, {
+            "vectorstore.chroma.collection_name": versioned_name(self.alias, version)
+        }), self.embedding)
+        store.version = version
+        return store
+
+    def _create_store(self) -> ChromaVectorStore:
+        """Open the collection the alias currently points at."""
+        try:
+            _, version = read_alias(self.persist_directory, self.alias)
+            self.logger.info(
+                f"Alias {self.alias} -> {versioned_name(self.alias, version)}")
+            return self._open_version(version)
+        except Exception as e:
+            self.logger.error(
+                f"Error initializing versioned Chroma vector store: {str(e)}")
+            return None
+
+    @contextmanager
+    def _pinned(self, store: Optional[ChromaVectorStore] = None
+                ) -> Iterator[ChromaVectorStore]:
+        """Hold the active version, or the given one, for the duration of a query."""
+        if store is None:
+            self._follow_alias()
+        with self._drained:
+            store = store or self._store
+            self._inflight[id(store)] = self._inflight.get(id(store), 0) + 1
+        try:
+            yield store
+        finally:
+            with self._drained:
+                self._inflight[id(store)] -= 1
+                if not self._inflight[id(store)]:
+                    del self._inflight[id(store)]
+                    self._drained.notify_all()
+
+    def _follow_alias(self) -> None:
+        """Pick up a swap made by another process, e.g. a reload while serving."""
+        if time.monotonic() < self._next_alias_check or self._rebuild_lock.locked():
+            return
+        self._next_alias_check = time.monotonic() + self.alias_check_interval
+        if any(drop_after <= time.time() for drop_after in
+               read_retired(self.persist_directory, self.alias).values()):
+            threading.Thread(target=self._drop_due_versions, daemon=True).start()
+        _, version = read_alias(self.persist_directory, self.alias)
+        if self._store is None or version == self._store.version:
+            return
+        # Open the new version (and build its BM25 index) off the query path
+        threading.Thread(
+            target=self._switch_to, args=(version,), daemon=True).start()
+
+    def _drop_due_versions(self) -> None:
+        """Drop due retired versions unless a rebuild is running."""
+        if not self._rebuild_lock.acquire(blocking=False):
+            return
+        try:
+            self._drop_retired()
+        finally:
+            self._rebuild_lock.release()
+
+    def _drop_retired(self) -> None:
+        """
+        Drop every retired version that is due and not pinned here.
+
+        Never waits: a version still pinned by a query in this process is
+        left for a later check, unless drain_timeout has passed since it
+        became due. The caller holds the rebuild lock.
+        """
+        retired = read_retired(self.persist_directory, self.alias)
+        if not retired:
+            return
+        _, active = read_alias(self.persist_directory, self.alias)
+        now = time.time()
+        remaining = dict(retired)
+        for version, drop_after in retired.items():
+            if version == active or drop_after > now:
+                continue
+            store = self._retired.get(version)
+            with self._drained:
+                pinned = store is not None and self._inflight.get(id(store))
+            if pinned:
+                if now < drop_after + self.drain_timeout:
+                    continue
+                self.logger.warning(
+                    f"Version {version} still has in-flight queries, dropping anyway")
+            try:
+                self._open_collection(version).delete_collection()
+                self.logger.info(f"Dropped collection version {version}")
+            except Exception as e:
+                self.logger.error(f"Error dropping version {version}: {str(e)}")
+                continue
+            del remaining[version]
+            self._retired.pop(version, None)
+        if remaining != retired:
+            write_alias(self.persist_directory, self.alias, active, remaining)
+
+    def _open_collection(self, version: int) -> Chroma:
+        """Open a version's collection without building its search indexes."""
+        return Chroma(
+            collection_name=versioned_name(self.alias, version),
+            embedding_function=self.embedding,
+            persist_directory=self.persist_directory)
+
+    def _next_version(self) -> int:
+        _, current = read_alias(self.persist_directory, self.alias)
+        if self._store is not None:
+            current = max(current, self._store.version)
+        return current + 1
+
+    def _publish(self, store: ChromaVectorStore) -> None:
+        """
+        Point the alias at a new version and retire the active one.
+
+        The caller holds the rebuild lock.
+        """
+        retired = read_retired(self.persist_directory, self.alias)
+        old_store = self._store
+        if old_store is not None:
+            # Followers check the alias every interval; leave them two
+            retired[old_store.version] = time.time() + 2 * self.alias_check_interval
+            self._retired[old_store.version] = old_store
+        write_alias(self.persist_directory, self.alias, store.version, retired)
+        self._store = store
+        self.logger.info(f"Alias {self.alias} swapped to version {store.version}")
+
+    def _switch_to(self, version: int) -> None:
+        if not self._rebuild_lock.acquire(blocking=False):
+            return
+        try:
+            self.logger.info(f"Alias {self.alias} moved to version {version}, reopening")
+            old_store = self._store
+            self._store = self._open_version(version)
+            if old_store is not None:
+                # Retired by the process that swapped the alias; queries here may pin it
+                self._retired[old_store.version] = old_store
+        except Exception as e:
+            self.logger.error(f"Error following alias to version {version}: {str(e)}")
+        finally:
+            self._rebuild_lock.release()
+
+    def _check_build(self, store: ChromaVectorStore, documents: List[Document]) -> bool:
+        """Basic sanity checks before a build is allowed to go live."""
+        count = sum(len(page['ids']) for page in store.iter_documents(include=[]))
+        if count != len(documents) or count < self.min_documents:
+            self.logger.error(
+                f"Build has {count} documents, expected {len(documents)} "
+                f"(minimum {self.min_documents})")
+            return False
+        probe = documents[0].page_content[:200]
+        if not store.similarity_search(probe, k=1):
+            self.logger.error("Build returned no results for a probe query")
+            return False
+        if not store.similarity_search_with_score(probe, k=1):
+            self.logger.error("Build's search strategy returned no results")
+            return False
+        return True
+
+    def rebuild(self, documents: List[Document], ids: Optional[List[str]] = None) -> bool:
+        """
+        Ingest documents into a new version and swap it in atomically.
+
+        The replaced version is retired and dropped later; see the class
+        docstring.
+
+        Args:
+            documents: Complete document set for the new version
+            ids: Optional document ids
+
+        Returns:
+            bool: True if the new version passed its checks and went live
+        """
+        if not documents:
+            self.logger.error("Refusing to rebuild with no documents")
+            return False
+
+        with self._rebuild_lock:
+            self._drop_retired()
+            version = self._next_version()
+            self.logger.info(
+                f"Building {versioned_name(self.alias, version)} with {len(documents)} documents")
+
+            try:
+                new_store = self._open_version(version)
+                if next(new_store.iter_documents(batch_size=1, include=[]), {}).get('ids'):
+                    # Leftover from an interrupted build
+                    new_store.delete()
+                if not new_store.add_documents(documents, ids) or \
+                        not self._check_build(new_store, documents):
+                    new_store._store.delete_collection()
+                    self.logger.error(
+                        f"Version {version} failed checks; keeping the active version")
+                    return False
+            except Exception as e:
+                self.logger.error(f"Error building version {version}: {str(e)}")
+                return False
+
+            self._publish(new_store)
+        return True
+
+    async def arebuild(self, documents: List[Document],
+                       ids: Optional[List[str]] = None) -> bool:
+        """Run rebuild on the shared executor."""
+        return await run_blocking(self.rebuild, documents, ids)
+
+    def add_documents(self, documents: List[Document], ids: Optional[List[str]] = None) -> bool:
+        """Add documents to the active version."""
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return False
+        with self._pinned() as store:
+            return store.add_documents(documents, ids)
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        search_type: Optional[str] = None
+    ) -> List[Tuple[Document, float]]:
+        """Search the version that is active when the query starts."""
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return []
+        with self._pinned() as store:
+            return store.similarity_search_with_score(query, k, filter, search_type)
+
+    async def asimilarity_search_with_score(
+        self,
+        query: str,
+        k: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        search_type: Optional[str] = None
+    ) -> List[Tuple[Document, float]]:
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return []
+        with self._pinned() as store:
+            return await store.asimilarity_search_with_score(query, k, filter, search_type)
+
+    def similarity_search(self, query: str, k: int = 4,
+                          filter: Optional[Dict[str, Any]] = None) -> List[Document]:
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return []
+        with self._pinned() as store:
+            return store.similarity_search(query, k, filter)
+
+    def update_document(self, document_id: str, document: Document) -> bool:
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return False
+        with self._pinned() as store:
+            return store.update_document(document_id, document)
+
+    def delete_by_metadata(self, where: Dict[str, Any]) -> int:
+        """Delete matching documents from the active version."""
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return 0
+        with self._pinned() as store:
+            return store.delete_by_metadata(where)
+
+    def get_search_strategy(self, search_type: Optional[str] = None):
+        return self._store.get_search_strategy(search_type)
+
+    def iter_documents(self, batch_size: Optional[int] = None,
+                       include: Optional[List[str]] = None,
+                       where: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Page through the version active when iteration starts.
+
+        Every page comes from that version, but it is only pinned while a
+        page is read, so an abandoned iterator never holds it. A version
+        retired mid-iteration is dropped once its grace period passes,
+        after which reading the next page fails.
+        """
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return
+        with self._pinned() as store:
+            pages = store.iter_documents(batch_size or self.page_size, include, where)
+        while True:
+            with self._pinned(store):
+                page = next(pages, None)
+            if page is None:
+                return
+            yield page
+
+    def warm_search_indexes(self, search_types: Optional[List[str]] = None) -> None:
+        if self._store:
+            self._store.warm_search_indexes(search_types)
+
+    def after_fork(self) -> None:
+        self._drained = threading.Condition()
+        self._rebuild_lock = threading.Lock()
+        self._inflight = {}
+        self._retired = {}
+        if self._store:
+            self._store.after_fork()
+
+    def delete(self, ids: Optional[List[str]] = None) -> bool:
+        """
+        Delete documents from the active version.
+
+        Without ids, an empty version is published instead and the active
+        one is retired, so it is dropped once like a replaced build.
+        """
+        if not self._store:
+            self.logger.error("Vector store not initialized")
+            return False
+        if ids:
+            try:
+                with self._pinned() as store:
+                    store._store.delete(ids=ids)
+                    store._refresh_search_indexes()
+                return True
+            except Exception as e:
+                self.logger.error(f"Error deleting documents: {str(e)}")
+                return False
+
+        with self._rebuild_lock:
+            try:
+                self._drop_retired()
+                new_store = self._open_version(self._next_version())
+                if next(new_store.iter_documents(batch_size=1, include=[]), {}).get('ids'):
+                    # Leftover from an interrupted build
+                    new_store.delete()
+                self._publish(new_store)
+                return True
+            except Exception as e:
+                self.logger.error(f"Error publishing an empty version: {str(e)}")
+                return False
@@ -0,0 +1,8 @@
+# tests/conftest.py
+
+
+class FakeConfig(dict):
+    """Minimal stand-in for ConfigHandler's dot-path lookup."""
+
+    def get(self, path, default=None):
+        return super().get(path, default)
@@ -0,0 +1,77 @@
+# tests/test_artifact_cache.py
+import gzip
+import json
+import pytest
+from langchain_core.documents import Document
+from scratch_rag_application.loader.artifact_cache import ArtifactCache
+from tests.conftest import FakeConfig
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Fixture for an artifact cache in a temporary directory."""
+    return ArtifactCache(str(tmp_path / "parsed"),
+                         ArtifactCache.parser_fingerprint(FakeConfig()))
+
+
+@pytest.fixture
+def sections():
+    """Fixture for parsed sections of one page."""
+    source = "https://docs.example.com/page"
+    return [
+        Document(page_content="## What is a plane?\nA control plane.",
+                 metadata={"source": source, "content_type": "qa", "section_id": "qa_1"}),
+        Document(page_content="General text",
+                 metadata={"source": source, "content_type": "general"}),
+    ]
+
+
+class TestArtifactCache:
+    def test_round_trip(self, cache, sections):
+        source = sections[0].metadata["source"]
+        assert cache.save(source, "abc", sections)
+
+        content_hash, loaded = cache.load(source)
+        assert content_hash == "abc"
+        assert loaded == sections
+
+    def test_columnar_layout(self, cache, sections):
+        source = sections[0].metadata["source"]
+        cache.save(source, "abc", sections)
+
+        with gzip.open(cache.path(source), "rt") as f:
+            artifact = json.load(f)
+        assert artifact["rows"] == 2
+        assert set(artifact["columns"]["metadata"]) == {"content_type", "section_id"}
+        assert artifact["columns"]["metadata"]["section_id"] == ["qa_1", None]
+
+    def test_load_many_reports_missing_sources(self, cache, sections):
+        source = sections[0].metadata["source"]
+        cache.save(source, "abc", sections)
+
+        documents, missing = cache.load_many([source, "https://docs.example.com/other"])
+        assert documents == sections
+        assert missing == ["https://docs.example.com/other"]
+
+    def test_other_parser_settings_are_a_miss(self, cache, sections):
+        source = sections[0].metadata["source"]
+        cache.save(source, "abc", sections)
+        fingerprint = ArtifactCache.parser_fingerprint(
+            FakeConfig({"content_parser": {"enabled": ["qa"]}}))
+        reparsing = ArtifactCache(cache.directory, fingerprint)
+
+        assert fingerprint != cache.fingerprint
+        assert reparsing.load(source) is None
+        assert reparsing.load_many([source]) == ([], [source])
+        assert cache.load(source) is not None
+
+    def test_artifact_without_fingerprint_is_a_miss(self, cache, sections):
+        source = sections[0].metadata["source"]
+        cache.save(source, "abc", sections)
+        with gzip.open(cache.path(source), "rt") as f:
+            artifact = json.load(f)
+        del artifact["fingerprint"]
+        with gzip.open(cache.path(source), "wt") as f:
+            json.dump(artifact, f)
+
+        assert cache.load(source) is None
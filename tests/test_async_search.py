@@ -0,0 +1,157 @@
+# tests/test_async_search.py
+import asyncio
+import threading
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from scratch_rag_application.embedding.base_embedding import BaseEmbedding
+from scratch_rag_application.embedding.batching import BatchingEmbedding
+from scratch_rag_application.search.base_search import BaseSearch
+from scratch_rag_application.search.hybrid_search import HybridSearch
+from scratch_rag_application.search.vector_search import VectorSearch
+from scratch_rag_application.utils.executor import configure_executor, run_blocking
+from tests.conftest import FakeConfig
+
+
+class OverlappingSearch(BaseSearch):
+    """Search whose calls only return once all of them run at the same time."""
+
+    def _initialize_search(self) -> None:
+        self.barrier = threading.Barrier(4)
+        self.threads = []
+
+    def search(self, query, k=None, filter=None):
+        self.threads.append(threading.current_thread().name)
+        # Breaks (and raises) unless four searches are in flight together
+        self.barrier.wait(timeout=5)
+        return [(Document(page_content=query), 0.1)]
+
+
+class FakeStore:
+    """Store answering vector queries with fixed distances."""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    def similarity_search_with_score(self, query, k=4, filter=None):
+        return [(doc, 0.1 * i) for i, doc in enumerate(self.documents[:k])]
+
+
+class BlockingEmbedding(BaseEmbedding):
+    """Embedder whose batched query calls wait until released."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        super().__init__(FakeConfig())
+
+    def _create_embedder(self):
+        return None
+
+    def _vector(self, text):
+        rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+        return rng.standard_normal(8).tolist()
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+    def embed_queries(self, texts):
+        self.started.set()
+        self.release.wait(timeout=5)
+        return [self._vector(text) for text in texts]
+
+
+class EmbeddedStore:
+    """Store holding embeddings for binary vector search."""
+
+    def __init__(self, documents, embeddings):
+        self.documents = documents
+        self.embeddings = embeddings
+
+    def get(self, include=None, limit=None, offset=None):
+        rows = slice(offset or 0, None if limit is None else (offset or 0) + limit)
+        documents = self.documents[rows]
+        return {
+            "ids": [doc.page_content for doc in documents],
+            "embeddings": [self.embeddings.base._vector(doc.page_content) for doc in documents],
+            "documents": [doc.page_content for doc in documents],
+            "metadatas": [doc.metadata for doc in documents]
+        }
+
+
+@pytest.fixture
+def executor():
+    """Fixture sizing the shared executor for a test and restoring the default after."""
+    def configure(max_workers):
+        configure_executor(max_workers)
+    yield configure
+    configure_executor(None)
+
+
+@pytest.fixture
+def config():
+    """Fixture for a config returning two results."""
+    return FakeConfig({"scoring.parameters.k": 2})
+
+
+@pytest.fixture
+def documents():
+    """Fixture for documents indexed by both hybrid legs."""
+    return [
+        Document(page_content=f"gateway plane doc {i}", metadata={"i": i})
+        for i in range(5)
+    ]
+
+
+class TestAsyncSearch:
+    @pytest.mark.asyncio
+    async def test_concurrent_queries_overlap(self, config, executor):
+        executor(4)
+        searcher = OverlappingSearch(config)
+        results = await asyncio.gather(*(
+            searcher.asearch(f"query {i}") for i in range(4)))
+
+        assert [r[0][0].page_content for r in results] == [
+            f"query {i}" for i in range(4)]
+        # Four executor threads ran the searches together
+        assert len(set(searcher.threads)) == 4
+        assert all(name.startswith("rag-async") for name in searcher.threads)
+
+    @pytest.mark.asyncio
+    async def test_hybrid_asearch_matches_search(self, config, documents):
+        searcher = HybridSearch(config, FakeStore(documents))
+        searcher.initialize_documents(documents)
+
+        expected = searcher.search("gateway doc", k=2)
+        results = await searcher.asearch("gateway doc", k=2)
+
+        assert [(doc.page_content, score) for doc, score in results] == [
+            (doc.page_content, score) for doc, score in expected]
+
+    @pytest.mark.asyncio
+    async def test_batched_embedding_holds_no_executor_thread(self, documents, executor):
+        executor(1)
+        base = BlockingEmbedding()
+        embedder = BatchingEmbedding(FakeConfig({"server.batching.window_ms": 1}), base)
+        searcher = VectorSearch(
+            FakeConfig({"scoring.parameters.k": 1, "scoring.vector.mode": "binary"}),
+            EmbeddedStore(documents, embedder))
+        searcher.warm()
+
+        try:
+            queries = [asyncio.ensure_future(searcher.asearch(doc.page_content))
+                       for doc in documents[:3]]
+            while not base.started.is_set():
+                await asyncio.sleep(0.01)
+            # The only executor thread is free while the queries wait for vectors
+            probe = await asyncio.wait_for(
+                run_blocking(lambda: threading.current_thread().name), timeout=2)
+            assert probe.startswith("rag-async")
+            assert not any(query.done() for query in queries)
+        finally:
+            base.release.set()
+        results = await asyncio.gather(*queries)
+        embedder.close()
+
+        assert [result[0][0].page_content for result in results] == [
+            doc.page_content for doc in documents[:3]]
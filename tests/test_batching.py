@@ -0,0 +1,185 @@
+# tests/test_batching.py
+import asyncio
+import threading
+import time
+import numpy as np
+import pytest
+from scratch_rag_application.embedding.base_embedding import BaseEmbedding
+from scratch_rag_application.embedding.batching import BatchingEmbedding, QueryEmbeddingError
+from tests.conftest import FakeConfig
+
+
+class RecordingEmbedding(BaseEmbedding):
+    """Embedder recording the texts of every batched query call."""
+
+    def __init__(self):
+        self.batches = []
+        # Set to an Event to hold batches until it is set
+        self.gate = None
+        self.started = threading.Event()
+        super().__init__(FakeConfig())
+
+    def _create_embedder(self):
+        return None
+
+    def _vector(self, text):
+        rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+        return rng.standard_normal(8).tolist()
+
+    def embed_queries(self, texts):
+        self.batches.append(list(texts))
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        return [self._vector(text) for text in texts]
+
+
+@pytest.fixture
+def base():
+    return RecordingEmbedding()
+
+
+@pytest.fixture
+def batching(base):
+    """Fixture building a batching embedder and stopping its collector after the test."""
+    embedders = []
+
+    def create(window_ms, max_batch_size=32):
+        embedder = BatchingEmbedding(FakeConfig({
+            "server.batching.window_ms": window_ms,
+            "server.batching.max_batch_size": max_batch_size
+        }), base)
+        embedders.append(embedder)
+        return embedder
+
+    yield create
+    for embedder in embedders:
+        embedder.close()
+
+
+def embed_concurrently(embedder, texts):
+    """Embed each text from its own thread; returns the vectors by text."""
+    results = {}
+
+    def embed(text):
+        results[text] = embedder.embed_query(text)
+
+    threads = [threading.Thread(target=embed, args=(text,)) for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert not any(thread.is_alive() for thread in threads)
+    return results
+
+
+class TestBatchingEmbedding:
+    def test_full_batch_is_sent_without_waiting_for_the_window(self, base, batching):
+        # The window never closes within the test, so only full batches flush
+        embedder = batching(window_ms=60_000, max_batch_size=4)
+
+        embed_concurrently(embedder, [f"query {i}" for i in range(8)])
+
+        assert [len(batch) for batch in base.batches] == [4, 4]
+        assert embedder.metrics()["batch_size"]["buckets"]["4"] == 2
+
+    def test_partial_batch_is_sent_when_the_window_closes(self, base, batching):
+        embedder = batching(window_ms=5)
+
+        first = embedder.embed_query("first")
+        second = embedder.embed_query("second")
+
+        assert base.batches == [["first"], ["second"]]
+        assert (first, second) == (base._vector("first"), base._vector("second"))
+
+    def test_each_caller_gets_its_own_vector(self, base, batching):
+        embedder = batching(window_ms=60_000, max_batch_size=16)
+        texts = [f"query {i}" for i in range(16)]
+
+        results = embed_concurrently(embedder, texts)
+
+        assert len(base.batches) == 1
+        assert results == {text: base._vector(text) for text in texts}
+
+    def test_failed_batch_raises_to_every_caller(self, base, batching, mocker):
+        failing = mocker.patch.object(base, "embed_queries",
+                                      side_effect=RuntimeError("model gone"))
+        embedder = batching(window_ms=60_000, max_batch_size=3)
+        errors = {}
+
+        def embed(text):
+            try:
+                embedder.embed_query(text)
+            except QueryEmbeddingError as e:
+                errors[text] = e
+
+        threads = [threading.Thread(target=embed, args=(text,)) for text in "abc"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert sorted(errors) == ["a", "b", "c"]
+        assert all(isinstance(e.__cause__, RuntimeError) for e in errors.values())
+        # The collector survives and answers the next batch
+        failing.side_effect = lambda texts: [base._vector(text) for text in texts]
+        assert embed_concurrently(embedder, ["d", "e", "f"]) == {
+            text: base._vector(text) for text in "def"}
+
+    def test_short_batch_is_an_error(self, base, batching, mocker):
+        mocker.patch.object(base, "embed_queries", return_value=[])
+        embedder = batching(window_ms=1)
+
+        with pytest.raises(QueryEmbeddingError):
+            embedder.embed_query("query")
+
+    def test_close_drains_queued_queries(self, base, batching):
+        embedder = batching(window_ms=60_000)
+        results = {}
+        thread = threading.Thread(
+            target=lambda: results.update(query=embedder.embed_query("query")))
+        thread.start()
+        # Queue.put counts unfinished tasks and the collector never marks them done
+        while not embedder._queue.unfinished_tasks:
+            time.sleep(0.001)
+
+        embedder.close()
+        thread.join(timeout=5)
+
+        assert results == {"query": base._vector("query")}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_mid_batch_keeps_the_collector_alive(self, base, batching):
+        embedder = batching(window_ms=1)
+        base.gate = threading.Event()
+
+        cancelled = asyncio.ensure_future(embedder.aembed_query("abandoned"))
+        while not base.started.is_set():
+            await asyncio.sleep(0.001)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        base.gate.set()
+
+        vector = await asyncio.wait_for(embedder.aembed_query("next"), timeout=5)
+        assert vector == base._vector("next")
+        assert cancelled.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_caller_cancelled_while_queued_is_skipped(self, base, batching):
+        embedder = batching(window_ms=1)
+        base.gate = threading.Event()
+
+        first = asyncio.ensure_future(embedder.aembed_query("first"))
+        while not base.started.is_set():
+            await asyncio.sleep(0.001)
+        # Queued behind the held batch, then abandoned before it is collected
+        queued = asyncio.ensure_future(embedder.aembed_query("abandoned"))
+        await asyncio.sleep(0.01)
+        queued.cancel()
+        await asyncio.sleep(0)
+        base.gate.set()
+
+        assert await asyncio.wait_for(first, timeout=5) == base._vector("first")
+        assert await asyncio.wait_for(embedder.aembed_query("next"), timeout=5) == \
+            base._vector("next")
+        assert ["abandoned"] not in base.batches
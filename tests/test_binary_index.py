@@ -0,0 +1,50 @@
+# tests/test_binary_index.py
+import numpy as np
+import pytest
+from scratch_rag_application.search.binary_index import (
+    BinaryIndex,
+    hamming_distances,
+    pack_signs,
+)
+
+
+@pytest.fixture
+def vectors():
+    """Fixture for random 768-dimensional embeddings."""
+    rng = np.random.default_rng(1)
+    return rng.standard_normal((1000, 768)).astype(np.float32)
+
+
+class TestBinaryIndex:
+    def test_packing_is_32x_smaller(self, vectors):
+        """Test sign bits use 1/32 of the float32 footprint."""
+        codes = pack_signs(vectors)
+        assert codes.dtype == np.uint64
+        assert codes.nbytes * 32 == vectors.nbytes
+
+    def test_hamming_distance(self):
+        """Test popcount Hamming distance on packed signs."""
+        a = pack_signs(np.array([1.0, -1.0, 1.0, -1.0]))
+        b = pack_signs(np.array([1.0, 1.0, -1.0, -1.0]))
+        assert hamming_distances(a, b[0])[0] == 2
+
+    def test_two_stage_search_recall(self, vectors):
+        """Test re-scored candidates recover the exact nearest neighbours."""
+        index = BinaryIndex(vectors)
+        rng = np.random.default_rng(2)
+        queries = index.vectors[:20] + 0.3 * rng.standard_normal((20, 768)).astype(np.float32)
+
+        hits = 0
+        for query in queries:
+            query = query / np.linalg.norm(query)
+            exact = set(np.argsort(-(index.vectors @ query))[:10].tolist())
+            approx = {row for row, _ in index.search(query, k=10, candidates=200)}
+            hits += len(exact & approx)
+        assert hits / 200 > 0.8
+
+    def test_search_scores_are_cosine(self, vectors):
+        """Test second stage returns exact cosine similarity."""
+        index = BinaryIndex(vectors)
+        row, similarity = index.search(vectors[5], k=1, candidates=50)[0]
+        assert row == 5
+        assert similarity == pytest.approx(1.0, abs=1e-5)
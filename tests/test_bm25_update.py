@@ -0,0 +1,48 @@
+# tests/test_bm25_update.py
+import pytest
+from langchain_core.documents import Document
+from scratch_rag_application.search.bm25_search import BM25Search
+from tests.conftest import FakeConfig
+
+
+def page(source, version, size=4):
+    """Chunks of one source page."""
+    return [
+        Document(page_content=f"{source} gateway v{version} chunk {i} plane" + " route" * i,
+                 metadata={"source": source})
+        for i in range(size)
+    ]
+
+
+@pytest.fixture
+def corpus():
+    """Fixture for chunks from three sources."""
+    return page("a", 1) + page("b", 1) + page("c", 1, size=2)
+
+
+class TestBM25Update:
+    def test_update_matches_full_rebuild(self, corpus):
+        updated = BM25Search(FakeConfig())
+        updated.initialize_documents(corpus)
+        assert updated.update_documents({"source": "b"}, page("b", 2, size=3))
+
+        expected_docs = [doc for doc in corpus if doc.metadata["source"] != "b"] \
+            + page("b", 2, size=3)
+        rebuilt = BM25Search(FakeConfig())
+        rebuilt.initialize_documents(expected_docs)
+
+        assert updated.documents == rebuilt.documents
+        for query in ["gateway plane", "route", "b v2", "b v1"]:
+            got = updated.search(query, k=len(expected_docs))
+            want = rebuilt.search(query, k=len(expected_docs))
+            assert [(d.page_content, pytest.approx(s)) for d, s in got] == \
+                [(d.page_content, s) for d, s in want]
+
+    def test_delete_by_filter_removes_postings(self, corpus):
+        searcher = BM25Search(FakeConfig())
+        searcher.initialize_documents(corpus)
+        searcher.update_documents({"source": {"$in": ["a", "c"]}}, [])
+
+        results = searcher.search("gateway", k=10)
+        assert {doc.metadata["source"] for doc, _ in results} == {"b"}
+        assert searcher.search("gateway", k=10, filter={"source": "a"}) == []
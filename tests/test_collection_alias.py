@@ -0,0 +1,36 @@
+# tests/test_collection_alias.py
+import os
+from scratch_rag_application.vector_store.collection_alias import (
+    alias_path,
+    read_alias,
+    read_retired,
+    versioned_name,
+    write_alias,
+)
+
+
+class TestCollectionAlias:
+    def test_missing_alias_resolves_to_unversioned_name(self, tmp_path):
+        assert read_alias(str(tmp_path), "kong_docs") == ("kong_docs", 0)
+
+    def test_write_then_read(self, tmp_path):
+        write_alias(str(tmp_path), "kong_docs", 3)
+        assert read_alias(str(tmp_path), "kong_docs") == ("kong_docs__v3", 3)
+
+        write_alias(str(tmp_path), "kong_docs", 4)
+        assert read_alias(str(tmp_path), "kong_docs") == (versioned_name("kong_docs", 4), 4)
+        # The temporary file is renamed over the pointer, never left behind
+        assert os.listdir(tmp_path) == [os.path.basename(alias_path(str(tmp_path), "kong_docs"))]
+
+    def test_corrupt_alias_falls_back(self, tmp_path):
+        with open(alias_path(str(tmp_path), "kong_docs"), "w") as f:
+            f.write("{")
+        assert read_alias(str(tmp_path), "kong_docs") == ("kong_docs", 0)
+
+    def test_retired_versions_round_trip(self, tmp_path):
+        write_alias(str(tmp_path), "kong_docs", 3, {1: 100.0, 2: 200.5})
+        assert read_alias(str(tmp_path), "kong_docs") == ("kong_docs__v3", 3)
+        assert read_retired(str(tmp_path), "kong_docs") == {1: 100.0, 2: 200.5}
+
+        write_alias(str(tmp_path), "kong_docs", 3)
+        assert read_retired(str(tmp_path), "kong_docs") == {}
@@ -0,0 +1,136 @@
+# tests/test_concurrent_search.py
+import threading
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from scratch_rag_application.search.bm25_search import BM25Search
+from scratch_rag_application.search.vector_search import VectorSearch
+from tests.conftest import FakeConfig
+
+
+def generation(gen):
+    """Documents of one ingest generation; sizes differ so mismatched parts show."""
+    size = 1000 + 370 * (gen % 4)
+    return [
+        Document(page_content=f"gateway gen{gen} doc{i} " + "plane " * (i % 5),
+                 metadata={"gen": gen, "shard": i % 3})
+        for i in range(size)
+    ]
+
+
+class FakeEmbedding:
+    def embed_query(self, text):
+        return [1.0] * 8
+
+
+class FakeStore:
+    """Store whose contents are swapped by the writer thread."""
+
+    embeddings = FakeEmbedding()
+
+    def __init__(self):
+        self.documents = generation(0)
+
+    def get(self, include=None, limit=None, offset=None):
+        documents = self.documents
+        rng = np.random.default_rng(len(documents))
+        embeddings = rng.standard_normal((len(documents), 8))
+        rows = slice(offset or 0, None if limit is None else (offset or 0) + limit)
+        return {
+            "ids": [str(i) for i in range(len(documents))][rows],
+            "embeddings": embeddings[rows],
+            "documents": [doc.page_content for doc in documents[rows]],
+            "metadatas": [doc.metadata for doc in documents[rows]]
+        }
+
+
+def run_stress(search, ingest, generations=20, readers=4):
+    """Query from several threads while one thread keeps re-ingesting."""
+    errors = []
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            try:
+                for filter in (None, {"shard": 1}):
+                    results = search(filter)
+                    assert results, "query returned no results"
+                    gens = {doc.metadata["gen"] for doc, _ in results}
+                    # Every result must come from a single snapshot
+                    assert len(gens) == 1, f"mixed generations {gens}"
+                    gen = gens.pop()
+                    for doc, _ in results:
+                        assert f"gen{gen} " in doc.page_content
+                        if filter:
+                            assert doc.metadata["shard"] == 1
+            except AssertionError as e:
+                errors.append(e)
+                stop.set()
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    try:
+        for gen in range(1, generations):
+            ingest(gen)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    assert not errors, errors[0]
+
+
+class TestConcurrentSearch:
+    @pytest.fixture
+    def config(self):
+        return FakeConfig({
+            "scoring.parameters.k": 5,
+            "scoring.vector.mode": "binary",
+            "scoring.vector.binary.candidates": 20
+        })
+
+    def test_bm25_queries_during_ingest(self, config):
+        searcher = BM25Search(config)
+        searcher.initialize_documents(generation(0))
+
+        run_stress(
+            lambda filter: searcher.search("gateway plane", k=5, filter=filter),
+            lambda gen: searcher.initialize_documents(generation(gen)))
+
+    def test_binary_vector_queries_during_rebuild(self, config):
+        store = FakeStore()
+        searcher = VectorSearch(config, store)
+        searcher.warm()
+
+        def ingest(gen):
+            store.documents = generation(gen)
+            searcher.reset_index()
+            searcher.warm()
+
+        run_stress(
+            lambda filter: searcher.search("gateway", k=5, filter=filter),
+            ingest)
+
+    def test_readers_never_rebuild_after_writes(self, config):
+        store = FakeStore()
+        searcher = VectorSearch(config, store)
+        build = searcher._build_binary_index
+        builders = []
+
+        def recording_build():
+            builders.append(threading.current_thread())
+            return build()
+
+        searcher._build_binary_index = recording_build
+        searcher.warm()
+
+        def ingest(gen):
+            store.documents = generation(gen)
+            # The writer rebuilds and swaps; readers keep the old snapshot
+            searcher.reset_index()
+
+        run_stress(
+            lambda filter: searcher.search("gateway", k=5, filter=filter),
+            ingest, generations=10)
+        assert len(builders) == 10
+        assert set(builders) == {threading.main_thread()}
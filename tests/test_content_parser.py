@@ -1,7 +1,7 @@
 # tests/test_content_parser.py
 import pytest
 from scratch_rag_application.content_parser.qa_parser import QAContentParser
-from scratch_rag_application.content_parser.base_parser import ParsedContent
+from scratch_rag_application.content_parser.base_parser import ParsedContent, remaining_text
 
 
 @pytest.fixture
@@ -74,3 +74,38 @@ class TestQAContentParser:
         parser = QAContentParser(qa_config)
         results = parser.parse(malformed_content)
         assert len(results) == 0
+
+    def test_sections_carry_spans(self, qa_config, sample_qa_content):
+        """Test each section's span covers its question and answer."""
+        parser = QAContentParser(qa_config)
+        results = parser.parse(sample_qa_content)
+
+        assert [r.start for r in results] == sorted(r.start for r in results)
+        for r in results:
+            span = sample_qa_content[r.start:r.end]
+            question, answer = r.content[3:].split("\nA: ")
+            assert question.lstrip("# ") in span
+            assert answer in span
+
+    def test_headings_end_sections(self, qa_config):
+        """Test a plain heading ends the answer before it."""
+        content = ("## How do I install it?\nRun the installer.\n"
+                   "## Upgrade\nUpgrade notes.\nData: kept as is.")
+        parser = QAContentParser(qa_config)
+        results = parser.parse(content)
+
+        assert len(results) == 1
+        assert results[0].content == "Q: ## How do I install it?\nA: Run the installer."
+        assert remaining_text(content, results).strip() == "## Upgrade\nUpgrade notes.\nData: kept as is."
+
+
+class TestRemainingText:
+    def test_joins_gaps_between_spans(self):
+        """Test the text outside possibly overlapping spans is kept in order."""
+        def section(start, end):
+            return ParsedContent(content="", content_type="qa", section_id="s",
+                                 start=start, end=end)
+
+        content = "aaQQbbRRRcc"
+        assert remaining_text(content, [section(6, 9), section(2, 4), section(7, 8)]) == "aabbcc"
+        assert remaining_text(content, []) == content
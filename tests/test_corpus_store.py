@@ -0,0 +1,70 @@
+# tests/test_corpus_store.py
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from scratch_rag_application.search.bm25_search import BM25Index, BM25Search
+from scratch_rag_application.search.corpus_store import CorpusStore
+from scratch_rag_application.search.metadata_filter import MetadataFilterIndex, matches_filter
+from tests.conftest import FakeConfig
+
+
+@pytest.fixture
+def documents():
+    """Fixture for chunks with non-ASCII text and uneven metadata."""
+    return [
+        Document(page_content="Kong gateway routes traffic", metadata={"source": "a", "rank": 1}),
+        Document(page_content="Plugins – rate limiting ✓", metadata={"source": "b"}),
+        Document(page_content="", metadata={}),
+        Document(page_content="Gateway plugins für Konnect", metadata={"source": "a", "flag": True}),
+    ]
+
+
+class TestCorpusStore:
+    def test_round_trip(self, documents):
+        corpus = CorpusStore.from_documents(documents)
+
+        assert len(corpus) == 4
+        assert list(corpus.texts()) == [doc.page_content for doc in documents]
+        assert [corpus.document(row) for row in range(4)] == documents
+
+    def test_take_and_extend(self, documents):
+        corpus = CorpusStore.from_documents(documents)
+        added = Document(page_content="Service mesh", metadata={"source": "c", "rank": 1})
+        derived = corpus.take(np.array([3, 0])).extend([added])
+
+        assert [derived.document(row) for row in range(3)] == [documents[3], documents[0], added]
+        # The original corpus is unchanged
+        assert [corpus.document(row) for row in range(4)] == documents
+
+    def test_filter_over_columns(self, documents):
+        corpus = CorpusStore.from_documents(documents).extend(
+            [Document(page_content="x", metadata={"source": "c"})])
+        index = MetadataFilterIndex(corpus.metadata)
+        metadatas = [doc.metadata for doc in documents] + [{"source": "c"}]
+
+        for where in ({"source": "a"}, {"source": {"$nin": ["a", "c"]}}, {"rank": 1},
+                      {"$or": [{"flag": True}, {"source": "c"}]}, {"missing": 1}):
+            expected = [i for i, m in enumerate(metadatas) if matches_filter(m, where)]
+            assert index.select(where).tolist() == expected
+
+
+class TestBM25Postings:
+    def test_scores_match_rank_bm25(self, documents):
+        rank_bm25 = pytest.importorskip("rank_bm25")
+        corpus = documents * 3 + [Document(page_content="gateway gateway mesh")]
+        reference = rank_bm25.BM25Okapi([doc.page_content.lower().split() for doc in corpus])
+        index = BM25Index(corpus)
+
+        for query in ["gateway", "gateway plugins", "plugins plugins", "unknown"]:
+            assert index.scores(query.split()) == pytest.approx(
+                reference.get_scores(query.split()))
+
+    def test_results_are_built_from_the_corpus(self, documents):
+        # Filler keeps the query terms below half the corpus, where idf is positive
+        corpus = documents + [Document(page_content=f"filler {i}") for i in range(6)]
+        search = BM25Search(FakeConfig({"scoring.parameters.k": 2}))
+        search.initialize_documents(CorpusStore.from_documents(corpus))
+
+        results = search.search("gateway plugins")
+        assert [doc for doc, _ in results] == [documents[3], documents[0]]
+        assert search.documents == tuple(doc.page_content for doc in corpus)
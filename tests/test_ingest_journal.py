@@ -0,0 +1,54 @@
+# tests/test_ingest_journal.py
+import pytest
+from langchain_core.documents import Document
+from scratch_rag_application.loader.ingest_journal import IngestJournal, chunk_id
+
+
+def chunks(source, size):
+    """Chunks of one source page."""
+    return [Document(page_content=f"{source} chunk {i}", metadata={"source": source})
+            for i in range(size)]
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    """Fixture for a journal location inside a temporary directory."""
+    return str(tmp_path / "ingest_journal.jsonl")
+
+
+class TestIngestJournal:
+    def test_resume_skips_committed_work(self, journal_path):
+        journal = IngestJournal(journal_path)
+        journal.reset()
+        journal.record_parsed("a", chunks("a", 1))
+        journal.record_parsed("b", chunks("b", 1))
+        ids = journal.record_split("a", chunks("a", 3))
+        journal.record_cleared()
+        journal.record_stored(ids[:2])
+
+        resumed = IngestJournal(journal_path)
+        assert resumed.resumable and resumed.cleared
+        assert set(resumed.parsed) == {"a", "b"}
+        assert set(resumed.split) == {"a"}
+        assert [doc_id for doc_id, _ in resumed.pending()] == [ids[2]]
+        assert resumed.pending()[0][1].page_content == "a chunk 2"
+
+        resumed.record_stored(ids[2:])
+        resumed.record_complete()
+        assert not IngestJournal(journal_path).resumable
+
+    def test_torn_last_line_is_ignored(self, journal_path):
+        journal = IngestJournal(journal_path)
+        journal.reset()
+        ids = journal.record_split("a", chunks("a", 2))
+        with open(journal_path, "a") as f:
+            f.write('{"stage": "stored", "ids": ["')
+
+        resumed = IngestJournal(journal_path)
+        assert len(resumed.pending()) == 2
+        assert resumed.split_ids["a"] == ids
+
+    def test_chunk_ids_are_deterministic(self):
+        assert chunk_id("a", 0, "text") == chunk_id("a", 0, "text")
+        assert chunk_id("a", 0, "text") != chunk_id("a", 1, "text")
+        assert chunk_id("a", 0, "text") != chunk_id("b", 0, "text")
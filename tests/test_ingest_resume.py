@@ -0,0 +1,111 @@
+# tests/test_ingest_resume.py
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+import main
+from scratch_rag_application.loader.ingest_journal import IngestJournal
+from scratch_rag_application.vector_store.numpy_store import NumpyVectorStore
+from tests.conftest import FakeConfig
+
+
+class FakeEmbedding:
+    """Deterministic embedder mapping each text to a fixed random vector."""
+
+    def _vector(self, text):
+        rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+        return rng.standard_normal(16).tolist()
+
+    def embed_documents(self, texts):
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+
+class FakeLoader:
+    """Loader serving three pages of four lines each."""
+
+    urls = ["https://example.com/a", "https://example.com/b", "https://example.com/c"]
+
+    async def load_urls(self, urls, from_artifacts=False):
+        return [Document(page_content="\n".join(f"{url} line {i}" for i in range(4)),
+                         metadata={"source": url})
+                for url in urls]
+
+
+class LineSplitter:
+    """Splitter emitting one chunk per line."""
+
+    def iter_split_batches(self, batches):
+        for batch in batches:
+            yield [Document(page_content=line, metadata=dict(doc.metadata))
+                   for doc in batch for line in doc.page_content.split("\n")]
+
+
+class Interrupted(Exception):
+    """Stands in for the process dying between a store write and its journal line."""
+
+
+@pytest.fixture
+def config(tmp_path, mocker):
+    """Fixture for a NumPy-backed ingest with the loader, splitter and embedder replaced."""
+    mocker.patch.object(main, "URLLoader", FakeLoader)
+    mocker.patch.object(main, "TextSplitterFactory").return_value \
+        .create_splitter.return_value = LineSplitter()
+    mocker.patch.object(main, "EmbeddingFactory").return_value \
+        .create_embedder.return_value = FakeEmbedding()
+    return FakeConfig({
+        "ingest.journal_file": str(tmp_path / "journal.jsonl"),
+        "ingest.batch_size": 3,
+        "text_splitter.dedup.enabled": False,
+        "vectorstore.type": "numpy",
+        "vectorstore.numpy.persist_directory": str(tmp_path / "index"),
+        "vectorstore.numpy.quantization": "none",
+        "scoring.type": "bm25",
+    })
+
+
+class TestIngestResume:
+    @pytest.mark.asyncio
+    async def test_resume_keeps_committed_batches(self, config, mocker):
+        record_stored = IngestJournal.record_stored
+        calls = []
+
+        def interrupt_on_third(journal, ids):
+            calls.append(ids)
+            if len(calls) == 3:
+                # The batch is in the store but its journal line never lands
+                raise Interrupted()
+            record_stored(journal, ids)
+
+        mocker.patch.object(IngestJournal, "record_stored", interrupt_on_third)
+        with pytest.raises(Interrupted):
+            await main.load_data(config)
+        mocker.patch.object(IngestJournal, "record_stored", record_stored)
+
+        journal = IngestJournal(config["ingest.journal_file"])
+        assert journal.resumable and len(journal.stored) == 6
+
+        store = await main.load_data(config)
+        stored = store._store.get(include=["documents"])
+        expected = [f"{url} line {i}" for url in FakeLoader.urls for i in range(4)]
+
+        # Batches committed before the interruption survive the resume, and
+        # the batch written without its journal line is not stored twice
+        assert sorted(stored["documents"]) == sorted(expected)
+        assert len(set(stored["ids"])) == len(expected)
+        assert isinstance(store, NumpyVectorStore)
+        assert not IngestJournal(config["ingest.journal_file"]).resumable
+
+
+class TestChromaDeleteByIds:
+    def test_ids_are_deleted_without_dropping_the_collection(self, mocker):
+        from scratch_rag_application.vector_store.chroma import ChromaVectorStore
+        collection = mocker.MagicMock()
+        collection.get.return_value = {"ids": [], "documents": [], "metadatas": []}
+        mocker.patch.object(ChromaVectorStore, "_create_store", return_value=collection)
+        store = ChromaVectorStore(FakeConfig({"scoring.type": "bm25"}), FakeEmbedding())
+
+        assert store.delete(["a", "b"])
+        collection.delete.assert_called_once_with(ids=["a", "b"])
+        collection.delete_collection.assert_not_called()
@@ -0,0 +1,107 @@
+# tests/test_markdown_splitter.py
+import pytest
+from langchain_core.documents import Document
+from scratch_rag_application.text_splitter.markdown_splitter import (
+    MarkdownChunker,
+    MarkdownDocumentSplitter,
+)
+from tests.conftest import FakeConfig
+
+
+@pytest.fixture
+def page():
+    """Fixture for a docs page with nested headings, code and a table."""
+    rows = "\n".join(f"| plugin{i} | {i} |" for i in range(30))
+    return Document(page_content=f"""# Gateway
+Intro sentence one.
+Intro sentence two.
+
+## Install
+Install the data plane node.
+
+```yaml
+# Not a heading
+image: kong
+```
+
+### Plugins
+| Name | Priority |
+| --- | --- |
+{rows}
+
+## Upgrade
+""" + "\n".join(f"Upgrade step {i} keeps the control plane online." for i in range(12)),
+        metadata={"source": "https://docs.example.com/gateway"})
+
+
+@pytest.fixture
+def chunker():
+    """Fixture for a chunker with small chunks."""
+    return MarkdownChunker(chunk_size=200, chunk_overlap=60)
+
+
+class TestMarkdownChunker:
+    def test_breadcrumbs_in_metadata(self, chunker, page):
+        chunks = chunker.split_documents([page])
+
+        paths = [chunk.metadata["section_path"] for chunk in chunks]
+        assert paths[0] == "Gateway"
+        assert "Gateway > Install > Plugins" in paths
+        assert paths[-1] == "Gateway > Upgrade"
+        assert all(chunk.metadata["source"] == page.metadata["source"] for chunk in chunks)
+
+    def test_code_blocks_stay_whole(self, chunker, page):
+        chunks = chunker.split_documents([page])
+
+        code = [chunk for chunk in chunks if "```yaml" in chunk.page_content]
+        assert len(code) == 1
+        assert "# Not a heading\nimage: kong\n```" in code[0].page_content
+        assert code[0].metadata["heading"] == "Install"
+
+    def test_large_tables_repeat_header_rows(self, chunker, page):
+        chunks = chunker.split_documents([page])
+
+        tables = [chunk.page_content for chunk in chunks
+                  if chunk.metadata["heading"] == "Plugins"]
+        assert len(tables) > 1
+        assert all(table.startswith("### Plugins") or
+                   table.startswith("| Name | Priority |\n| --- | --- |") for table in tables)
+        rows = [line for table in tables for line in table.splitlines()
+                if line.startswith("| plugin")]
+        assert rows == [f"| plugin{i} | {i} |" for i in range(30)]
+
+    def test_chunk_size_and_overlap(self, chunker, page):
+        chunks = [chunk.page_content for chunk in chunker.split_documents([page])
+                  if chunk.metadata["heading"] == "Upgrade"]
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 200 for chunk in chunks)
+        for previous, current in zip(chunks, chunks[1:]):
+            assert previous.splitlines()[-1] == current.splitlines()[0]
+
+    def test_chunks_are_slices_of_the_source(self, chunker, page):
+        for chunk in chunker.split_text(page.page_content):
+            if "```" not in chunk and "| ---" not in chunk:
+                assert chunk in page.page_content
+
+    def test_long_lines_split_at_words(self):
+        chunker = MarkdownChunker(chunk_size=50, chunk_overlap=10)
+        words = [f"w{i}" for i in range(60)]
+        chunks = chunker.split_text(" ".join(words))
+
+        assert all(len(chunk) <= 50 for chunk in chunks)
+        seen = [word for chunk in chunks for word in chunk.split()]
+        assert sorted(set(seen), key=words.index) == words
+        for previous, current in zip(chunks, chunks[1:]):
+            assert current.split()[0] in previous.split()[1:]
+
+
+class TestMarkdownDocumentSplitter:
+    def test_created_from_config(self, page):
+        splitter = MarkdownDocumentSplitter(FakeConfig({
+            "text_splitter.markdown.chunk_size": 300,
+            "text_splitter.markdown.chunk_overlap": 50,
+        }))
+
+        chunks = splitter.split_documents([page])
+        assert chunks and all(len(chunk.page_content) <= 300 for chunk in chunks)
@@ -0,0 +1,80 @@
+# tests/test_metadata_filter.py
+import pytest
+from langchain_core.documents import Document
+from scratch_rag_application.search.bm25_search import BM25Search
+from scratch_rag_application.search.metadata_filter import (
+    MetadataFilterIndex,
+    matches_filter,
+)
+from tests.conftest import FakeConfig
+
+
+@pytest.fixture
+def metadatas():
+    """Fixture for chunk metadata across two sources."""
+    return [
+        {"source": "https://a", "content_type": "qa"},
+        {"source": "https://a", "content_type": "general"},
+        {"source": "https://b", "content_type": "qa"},
+        {"source": "https://b", "content_type": "general"},
+        {"source": "https://c", "content_type": "general"},
+    ]
+
+
+@pytest.fixture
+def documents(metadatas):
+    """Fixture for documents sharing a common term."""
+    return [
+        Document(page_content=f"gateway plane doc {i}", metadata=metadata)
+        for i, metadata in enumerate(metadatas)
+    ]
+
+
+class TestMetadataFilterIndex:
+    @pytest.mark.parametrize("where", [
+        {"content_type": "qa"},
+        {"source": {"$in": ["https://a", "https://c"]}},
+        {"source": {"$ne": "https://a"}},
+        {"$and": [{"content_type": "general"}, {"source": {"$nin": ["https://c"]}}]},
+        {"$or": [{"content_type": "qa"}, {"source": "https://c"}]},
+        {"missing": "value"},
+    ])
+    def test_select_matches_row_evaluation(self, metadatas, where):
+        """Test index selection agrees with per-row filter evaluation."""
+        index = MetadataFilterIndex(metadatas)
+        expected = [i for i, m in enumerate(metadatas) if matches_filter(m, where)]
+        assert index.select(where).tolist() == expected
+
+    @pytest.mark.parametrize("where, expected", [
+        ({"lang": {"$ne": "en"}}, [1]),
+        ({"lang": {"$nin": ["en"]}}, [1]),
+        ({"lang": {"$in": ["en", "de"]}}, [0, 1]),
+        ({"$or": [{"lang": {"$ne": "en"}}, {"source": "https://c"}]}, [1, 2]),
+    ])
+    def test_missing_field_matches_no_condition(self, where, expected):
+        """Test rows without a field never match it, as in Chroma."""
+        metadatas = [{"lang": "en"}, {"lang": "de"}, {"source": "https://c"}]
+
+        assert MetadataFilterIndex(metadatas).select(where).tolist() == expected
+        assert [i for i, m in enumerate(metadatas) if matches_filter(m, where)] == expected
+
+    def test_no_filter(self, metadatas):
+        """Test an empty filter selects nothing to restrict."""
+        assert MetadataFilterIndex(metadatas).select(None) is None
+
+
+class TestBM25Filter:
+    def test_filtered_search(self, documents):
+        """Test BM25 only returns documents matching the filter."""
+        search = BM25Search(FakeConfig({"scoring.parameters.k": 10}))
+        search.initialize_documents(documents)
+
+        results = search.search("gateway plane", filter={"content_type": "qa"})
+        assert len(results) == 2
+        assert all(doc.metadata["content_type"] == "qa" for doc, _ in results)
+
+    def test_filter_without_matches(self, documents):
+        """Test a filter matching nothing returns no results."""
+        search = BM25Search(FakeConfig({"scoring.parameters.k": 10}))
+        search.initialize_documents(documents)
+        assert search.search("gateway", filter={"source": "https://z"}) == []
@@ -0,0 +1,65 @@
+# tests/test_metrics.py
+import threading
+import pytest
+from scratch_rag_application.utils.metrics import Histogram
+
+
+@pytest.fixture
+def histogram():
+    """Fixture for a histogram with an observation in most buckets."""
+    histogram = Histogram("latency_ms", [10, 1, 5, 2])
+    for value in (0.5, 1, 1.5, 3, 4, 20):
+        histogram.observe(value)
+    return histogram
+
+
+class TestHistogram:
+    def test_buckets_count_values_up_to_their_bound(self, histogram):
+        snapshot = histogram.snapshot()
+
+        assert snapshot["buckets"] == {"1": 2, "2": 1, "5": 2, "10": 0, "+Inf": 1}
+        assert snapshot["count"] == 6
+        assert snapshot["sum"] == pytest.approx(30.0)
+        assert snapshot["mean"] == pytest.approx(5.0)
+        assert (snapshot["min"], snapshot["max"]) == (0.5, 20)
+
+    @pytest.mark.parametrize("q, expected", [
+        (0, 0.5),     # lowest bucket starts at the observed minimum
+        (50, 2.0),    # rank 3 is the end of the (1, 2] bucket
+        (75, 4.25),   # rank 4.5, three quarters into (2, 5]
+        (99, 19.4),   # +Inf bucket ends at the observed maximum
+        (100, 20.0),
+    ])
+    def test_percentile_interpolates_within_buckets(self, histogram, q, expected):
+        assert histogram.percentile(q) == pytest.approx(expected)
+
+    def test_percentiles_stay_within_observed_range(self):
+        histogram = Histogram("batch_size", [1, 8])
+        for _ in range(3):
+            histogram.observe(3)
+
+        assert [histogram.percentile(q) for q in (0, 50, 99)] == [3, 3, 3]
+
+    def test_snapshot_reports_percentiles(self, histogram):
+        snapshot = histogram.snapshot()
+
+        assert snapshot["p50"] == pytest.approx(2.0)
+        assert snapshot["p99"] == pytest.approx(19.4)
+
+    def test_empty_snapshot(self):
+        snapshot = Histogram("latency_ms", [1, 2]).snapshot()
+
+        assert snapshot["count"] == 0
+        assert snapshot["mean"] == snapshot["min"] == snapshot["max"] == snapshot["p95"] == 0.0
+        assert snapshot["buckets"] == {"1": 0, "2": 0, "+Inf": 0}
+
+    def test_concurrent_observations(self):
+        histogram = Histogram("latency_ms", [1])
+        threads = [threading.Thread(target=lambda: [histogram.observe(2) for _ in range(1000)])
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert histogram.snapshot()["buckets"] == {"1": 0, "+Inf": 4000}
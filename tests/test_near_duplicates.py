@@ -0,0 +1,79 @@
+# tests/test_near_duplicates.py
+import random
+import pytest
+from langchain_core.documents import Document
+from scratch_rag_application.text_splitter.near_duplicates import (
+    NearDuplicateFilter,
+    lsh_bands,
+)
+from tests.conftest import FakeConfig
+
+
+def _words(rng, count):
+    return [f"word{rng.randrange(2000)}" for _ in range(count)]
+
+
+@pytest.fixture
+def chunks():
+    """Fixture for distinct chunks plus a callout repeated on three pages with small edits."""
+    rng = random.Random(7)
+    callout = _words(rng, 120)
+    docs = [Document(page_content=" ".join(_words(rng, 120)),
+                     metadata={"source": f"https://docs.example.com/page{i}"})
+            for i in range(20)]
+    for i, page in enumerate((3, 8, 15)):
+        edited = list(callout)
+        edited[10 + i] = "edited"
+        docs.insert(page, Document(page_content=" ".join(edited),
+                                   metadata={"source": f"https://docs.example.com/page{page}"}))
+    return docs
+
+
+class TestNearDuplicateFilter:
+    def test_keeps_first_of_each_group(self, chunks):
+        dedup = NearDuplicateFilter(FakeConfig())
+        ids = [f"id{i}" for i in range(len(chunks))]
+        kept_ids, kept = dedup.deduplicate(ids, chunks)
+
+        assert len(kept) == len(chunks) - 2
+        assert "id8" not in kept_ids and "id15" not in kept_ids
+        canonical = kept[kept_ids.index("id3")]
+        assert canonical.metadata["duplicate_count"] == 2
+        assert canonical.metadata["duplicate_sources"].split("\n") == [
+            "https://docs.example.com/page8", "https://docs.example.com/page15"]
+        assert canonical.metadata["source"] == "https://docs.example.com/page3"
+        assert all("duplicate_count" not in doc.metadata
+                   for doc_id, doc in zip(kept_ids, kept) if doc_id != "id3")
+        # The journaled chunk is not modified
+        assert "duplicate_count" not in chunks[3].metadata
+
+    def test_threshold_above_similarity_keeps_all(self, chunks):
+        dedup = NearDuplicateFilter(FakeConfig({"text_splitter.dedup.threshold": 1.0}))
+        ids = [f"id{i}" for i in range(len(chunks))]
+
+        assert dedup.deduplicate(ids, chunks)[0] == ids
+
+    def test_exact_duplicates_from_one_source(self):
+        docs = [Document(page_content="Shared callout text.", metadata={"source": "a"}),
+                Document(page_content="Shared   callout TEXT.", metadata={"source": "a"}),
+                Document(page_content="Something else.", metadata={"source": "b"})]
+        kept_ids, kept = NearDuplicateFilter(FakeConfig()).deduplicate(["x", "y", "z"], docs)
+
+        assert kept_ids == ["x", "z"]
+        assert kept[0].metadata["duplicate_count"] == 1
+        assert kept[0].metadata["duplicate_sources"] == ""
+
+    def test_signatures_are_deterministic(self, chunks):
+        texts = [doc.page_content for doc in chunks]
+        first = NearDuplicateFilter(FakeConfig()).signatures(texts)
+        second = NearDuplicateFilter(FakeConfig()).signatures(texts[::-1])
+
+        assert (first == second[::-1]).all()
+
+    def test_lsh_bands(self):
+        bands, rows = lsh_bands(0.85, 128)
+        assert bands * rows <= 128
+        # Chunks at the threshold mostly share a bucket, unrelated ones hardly ever
+        assert 1 - (1 - 0.85 ** rows) ** bands > 0.8
+        assert 1 - (1 - 0.9 ** rows) ** bands > 0.95
+        assert 1 - (1 - 0.3 ** rows) ** bands < 0.01
@@ -0,0 +1,56 @@
+# tests/test_parallel_splitter.py
+import pytest
+from langchain_core.documents import Document
+from scratch_rag_application.text_splitter.base_splitter import BaseTextSplitter
+from tests.conftest import FakeConfig
+
+
+class SentenceSplitter:
+    """Splits on sentence ends and numbers the chunks of each document."""
+
+    def split_documents(self, documents):
+        return [
+            Document(page_content=sentence.strip(),
+                     metadata={**doc.metadata, "chunk": i})
+            for doc in documents
+            for i, sentence in enumerate(doc.page_content.split(".")) if sentence.strip()
+        ]
+
+
+class FakeSplitter(BaseTextSplitter):
+    def _create_splitter(self):
+        return SentenceSplitter()
+
+
+@pytest.fixture
+def documents():
+    """Fixture for documents from several sources."""
+    return [
+        Document(page_content=". ".join(f"doc {i} sentence {j}" for j in range(i % 5 + 1)),
+                 metadata={"source": f"s{i % 3}", "section_id": str(i)})
+        for i in range(50)
+    ]
+
+
+def config(workers):
+    return FakeConfig({
+        "text_splitter.parallel.workers": workers,
+        "text_splitter.parallel.batch_size": 4,
+        "text_splitter.parallel.start_method": "spawn",
+    })
+
+
+class TestParallelSplitting:
+    def test_matches_serial_output(self, documents):
+        serial = FakeSplitter(config(0)).split_documents(documents)
+        parallel = FakeSplitter(config(3)).split_documents(documents)
+
+        assert [(d.page_content, d.metadata) for d in parallel] == \
+            [(d.page_content, d.metadata) for d in serial]
+
+    def test_batches_stream_in_input_order(self, documents):
+        batches = [documents[:1], documents[1:10], documents[10:11]]
+        results = list(FakeSplitter(config(2)).iter_split_batches(iter(batches)))
+
+        assert [{d.metadata["section_id"] for d in chunks} for chunks in results] == \
+            [{"0"}, {str(i) for i in range(1, 10)}, {"10"}]
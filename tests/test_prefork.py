@@ -0,0 +1,116 @@
+# tests/test_prefork.py
+import json
+import os
+import sys
+import types
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from scratch_rag_application.search.bm25_search import BM25Search
+from scratch_rag_application.search.vector_search import VectorSearch
+from scratch_rag_application.server.prefork import PreforkServer
+from scratch_rag_application.vector_store.numpy_store import NumpyVectorStore
+from tests.conftest import FakeConfig
+
+
+class FakeEmbedding:
+    """Deterministic embedder mapping each text to a fixed random vector."""
+
+    def _vector(self, text):
+        rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+        return rng.standard_normal(16).tolist()
+
+    def embed_documents(self, texts):
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+    def embed_queries(self, texts):
+        return [self._vector(text) for text in texts]
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Fixture for a hybrid, binary-mode config over a populated NumPy store."""
+    config = FakeConfig({
+        "vectorstore.type": "numpy",
+        "vectorstore.numpy.persist_directory": str(tmp_path),
+        "vectorstore.numpy.quantization": "none",
+        "scoring.type": "hybrid",
+        "scoring.vector.mode": "binary",
+        "scoring.parameters.k": 3,
+        "server.workers.report_interval": 0,
+    })
+    NumpyVectorStore(config, FakeEmbedding()).add_documents([
+        Document(page_content=f"gateway doc {i}", metadata={"i": i})
+        for i in range(20)
+    ])
+    return config
+
+
+@pytest.fixture
+def create_embedder(mocker):
+    """Fixture counting model loads through the embedding factory."""
+    factory = mocker.patch(
+        "scratch_rag_application.server.query_server.EmbeddingFactory")
+    factory.return_value.create_embedder.side_effect = FakeEmbedding
+    return factory.return_value.create_embedder
+
+
+class TestPreforkServer:
+    def test_parent_builds_each_index_once_without_the_model(self, config, create_embedder,
+                                                             mocker):
+        bm25_builds = mocker.spy(BM25Search, "initialize_documents")
+        binary_builds = mocker.spy(VectorSearch, "_build_binary_index")
+
+        server = PreforkServer(config, workers=2)
+        store = server.server.vector_store
+
+        assert create_embedder.call_count == 0
+        assert bm25_builds.call_count == 1
+        assert binary_builds.call_count == 1
+        hybrid = store.get_search_strategy("hybrid")
+        assert hybrid.bm25_searcher is store.get_search_strategy("bm25")
+        assert hybrid.vector_searcher is store.get_search_strategy("vector")
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+    def test_worker_loads_the_model_after_fork(self, config, create_embedder):
+        server = PreforkServer(config, workers=2)
+        read_end, write_end = os.pipe()
+
+        pid = os.fork()
+        if pid == 0:
+            # Child: stand in for PreforkServer._spawn up to serving
+            code = 1
+            try:
+                os.close(read_end)
+                server.server.after_fork()
+                results = server.server.vector_store.similarity_search_with_score(
+                    "gateway doc 7", k=1)
+                report = {"loads": create_embedder.call_count,
+                          "top": results[0][0].page_content}
+                os.write(write_end, json.dumps(report).encode())
+                code = 0
+            finally:
+                os._exit(code)
+
+        os.close(write_end)
+        with os.fdopen(read_end) as f:
+            report = json.loads(f.read() or "{}")
+        _, status = os.waitpid(pid, 0)
+
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert report == {"loads": 1, "top": "gateway doc 7"}
+        assert create_embedder.call_count == 0
+
+    def test_torch_threads_split_between_workers(self, config, create_embedder, mocker):
+        torch = types.SimpleNamespace(set_num_threads=mocker.Mock())
+        mocker.patch.dict(sys.modules, {"torch": torch})
+        mocker.patch("scratch_rag_application.server.prefork.os.cpu_count", return_value=8)
+
+        PreforkServer(config, workers=2)._limit_torch_threads()
+        config["server.workers.torch_threads"] = 3
+        PreforkServer(config, workers=2)._limit_torch_threads()
+
+        assert [call.args for call in torch.set_num_threads.call_args_list] == [(4,), (3,)]
@@ -0,0 +1,105 @@
+# tests/test_projection.py
+import threading
+import numpy as np
+import pytest
+from scratch_rag_application.embedding.projection import ProjectedEmbedding
+from tests.conftest import FakeConfig
+
+
+class FakeEmbedding:
+    """Deterministic 32-dimensional embedder that records every batch."""
+
+    def __init__(self):
+        self.batches = []
+
+    def _vector(self, text):
+        rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+        return rng.standard_normal(32).tolist()
+
+    def embed_documents(self, texts):
+        self.batches.append(list(texts))
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+    def embed_queries(self, texts):
+        return [self._vector(text) for text in texts]
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Fixture for a PCA projection to 8 dimensions fitted on up to 40 texts."""
+    return FakeConfig({
+        "embeddings.type": "huggingface",
+        "embeddings.huggingface.model_name": "fake-model",
+        "embeddings.projection.type": "pca",
+        "embeddings.projection.dimensions": 8,
+        "embeddings.projection.fit_sample_size": 40,
+        "vectorstore.type": "chroma",
+        "vectorstore.chroma.persist_directory": str(tmp_path),
+        "vectorstore.chroma.collection_name": "docs",
+    })
+
+
+@pytest.fixture
+def texts():
+    """Fixture for a corpus larger than the fit sample."""
+    return [f"chunk {i}" for i in range(100)]
+
+
+class TestProjectedEmbedding:
+    def test_refuses_to_embed_before_fitting(self, config):
+        base = FakeEmbedding()
+        embedder = ProjectedEmbedding(config, base)
+
+        assert embedder.embed_documents(["chunk 1"]) == []
+        assert embedder.embed_query("chunk 1") == []
+        assert base.batches == []
+
+    def test_fit_on_corpus_sample(self, config, texts):
+        base = FakeEmbedding()
+        embedder = ProjectedEmbedding(config, base)
+        embedder.fit_texts(texts)
+
+        # Only the sample is embedded to fit; later batches reuse the fit
+        assert len(base.batches) == 1
+        assert len(base.batches[0]) == 40 and set(base.batches[0]) <= set(texts)
+        components = embedder.projection.components
+        embedder.embed_documents(texts[:5])
+        assert embedder.projection.components is components
+
+        reloaded = ProjectedEmbedding(config, FakeEmbedding())
+        np.testing.assert_allclose(reloaded.projection.components, components)
+
+    def test_projection_dimension(self, config, texts):
+        embedder = ProjectedEmbedding(config, FakeEmbedding())
+        embedder.fit_texts(texts)
+
+        vectors = np.asarray(embedder.embed_documents(texts[:3]))
+        query = np.asarray(embedder.embed_query("chunk 1"))
+        assert vectors.shape == (3, 8) and query.shape == (8,)
+        np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-5)
+        np.testing.assert_allclose(query, vectors[1], rtol=1e-5)
+
+    def test_concurrent_first_calls_fit_once(self, config, texts, mocker):
+        base = FakeEmbedding()
+        embedder = ProjectedEmbedding(config, base)
+        fit = mocker.spy(embedder, "_fit")
+        barrier = threading.Barrier(8)
+        results = []
+
+        def first_call():
+            barrier.wait()
+            embedder.fit_texts(texts)
+            results.append(embedder.embed_documents(texts[:2]))
+
+        threads = [threading.Thread(target=first_call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert fit.call_count == 1
+        assert len(results) == 8
+        assert all(np.allclose(result, results[0]) for result in results)
@@ -0,0 +1,162 @@
+# tests/test_quantization.py
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from scratch_rag_application.vector_store.numpy_index import QuantizedVectorIndex
+from scratch_rag_application.vector_store.quantization import (
+    ProductQuantizer,
+    ScalarQuantizer,
+)
+
+
+class FakeEmbedding:
+    """Deterministic embedder mapping each text to a fixed random vector."""
+
+    def __init__(self, dimensions: int = 32):
+        self.dimensions = dimensions
+
+    def _vector(self, text: str):
+        rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+        return rng.standard_normal(self.dimensions).tolist()
+
+    def embed_documents(self, texts):
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+
+@pytest.fixture
+def vectors():
+    """Fixture for normalized random vectors."""
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((500, 32)).astype(np.float32)
+    return data / np.linalg.norm(data, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def documents():
+    """Fixture for sample documents."""
+    return [
+        Document(page_content=f"document {i}",
+                 metadata={"source": f"https://example.com/{i % 3}"})
+        for i in range(300)
+    ]
+
+
+class TestQuantizers:
+    def test_scalar_quantizer_inner_products(self, vectors):
+        """Test sq8 approximates exact inner products closely."""
+        quantizer = ScalarQuantizer()
+        quantizer.train(vectors)
+        codes = quantizer.encode(vectors)
+
+        assert codes.dtype == np.uint8
+        assert quantizer.code_size == 32
+        approx = quantizer.inner_products(vectors[0], codes)
+        np.testing.assert_allclose(approx, vectors @ vectors[0], atol=0.05)
+
+    def test_product_quantizer_codes(self, vectors):
+        """Test PQ stores one byte per subspace."""
+        quantizer = ProductQuantizer(subspaces=8, iterations=5)
+        quantizer.train(vectors)
+        codes = quantizer.encode(vectors)
+
+        assert codes.shape == (500, 8)
+        assert quantizer.code_size == 8
+        scores = quantizer.inner_products(vectors[0], codes)
+        assert np.argmax(scores) == 0
+
+    def test_product_quantizer_rejects_bad_subspaces(self, vectors):
+        """Test PQ requires subspaces that divide the dimension."""
+        with pytest.raises(ValueError):
+            ProductQuantizer(subspaces=5).train(vectors)
+
+
+class TestQuantizedVectorIndex:
+    def test_search_and_reload(self, tmp_path, documents):
+        """Test search results survive a reload from disk."""
+        embedding = FakeEmbedding()
+        index = QuantizedVectorIndex(
+            str(tmp_path), embedding, ScalarQuantizer(), rerank_candidates=20)
+        index.add_documents(documents)
+
+        results = index.similarity_search_with_score("document 7", k=3)
+        assert results[0][0].page_content == "document 7"
+        assert results[0][1] == pytest.approx(0.0, abs=1e-5)
+
+        reloaded = QuantizedVectorIndex(
+            str(tmp_path), embedding, ScalarQuantizer(), rerank_candidates=20)
+        assert reloaded.get()["ids"] == index.get()["ids"]
+        assert reloaded.similarity_search("document 7", k=1)[0].page_content == "document 7"
+
+    def test_filter_and_delete(self, tmp_path, documents):
+        """Test metadata filters and deletion by id."""
+        index = QuantizedVectorIndex(str(tmp_path), FakeEmbedding(), ScalarQuantizer())
+        ids = index.add_documents(documents)
+
+        results = index.similarity_search(
+            "document 7", k=5, filter={"source": "https://example.com/0"})
+        assert all(doc.metadata["source"] == "https://example.com/0" for doc in results)
+
+        index.delete(ids[:100])
+        assert len(index.get()["ids"]) == 200
+
+    def test_compression_report(self, tmp_path, documents):
+        """Test compression ratio and recall reporting for PQ with IVF."""
+        index = QuantizedVectorIndex(
+            str(tmp_path), FakeEmbedding(), ProductQuantizer(subspaces=4, iterations=5),
+            nlist=4, nprobe=4, rerank_candidates=50)
+        index.add_documents(documents)
+
+        stats = index.compression_stats()
+        assert stats["full_precision_bytes"] == 300 * 32 * 4
+        assert stats["compression_ratio"] > 1
+
+        recall = index.evaluate_recall(k=5, sample_size=20)
+        assert 0.0 <= recall["recall_at_k"] <= 1.0
+        assert recall["recall_at_k_reranked"] >= recall["recall_at_k"]
+
+    def test_retrains_as_the_index_grows(self, tmp_path, documents, mocker):
+        """Test codecs are retrained on the whole index each time it doubles."""
+        quantizer = ScalarQuantizer()
+        train = mocker.spy(quantizer, "train")
+        index = QuantizedVectorIndex(str(tmp_path), FakeEmbedding(), quantizer, nlist=4)
+        for start in range(0, 300, 30):
+            index.add_documents(documents[start:start + 30])
+
+        assert [len(call.args[0]) for call in train.call_args_list] == [30, 60, 120, 240]
+        assert sum(len(rows) for rows in index._lists) == 300
+
+        reloaded = QuantizedVectorIndex(
+            str(tmp_path), FakeEmbedding(), ScalarQuantizer(), nlist=4)
+        assert reloaded._trained_rows == 240
+        np.testing.assert_array_equal(reloaded._codes, index._codes)
+
+    def test_vectors_are_appended_and_updated_in_place(self, tmp_path, documents):
+        """Test adds and updates write to the existing vectors file."""
+        index = QuantizedVectorIndex(str(tmp_path), FakeEmbedding(), ScalarQuantizer())
+        ids = index.add_documents(documents[:100])
+        path = tmp_path / "vectors.f32"
+        before = path.stat()
+
+        index.add_documents(documents[100:])
+        index.update_document(ids[3], Document(page_content="document 299"))
+        after = path.stat()
+
+        assert after.st_ino == before.st_ino
+        assert after.st_size == 300 * 32 * 4
+        assert index.similarity_search("document 299", k=2)[1].page_content == "document 299"
+        vectors = index.get(include=["embeddings"])["embeddings"]
+        np.testing.assert_array_equal(vectors[3], vectors[299])
+
+    def test_legacy_npy_vectors_are_migrated(self, tmp_path, documents):
+        """Test an index saved with a single .npy vectors file still loads."""
+        index = QuantizedVectorIndex(str(tmp_path), FakeEmbedding(), ScalarQuantizer())
+        index.add_documents(documents)
+        np.save(tmp_path / "vectors.npy", index.get(include=["embeddings"])["embeddings"])
+        (tmp_path / "vectors.f32").unlink()
+
+        reloaded = QuantizedVectorIndex(str(tmp_path), FakeEmbedding(), ScalarQuantizer())
+        assert not (tmp_path / "vectors.npy").exists()
+        assert reloaded.similarity_search("document 7", k=1)[0].page_content == "document 7"
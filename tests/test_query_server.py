@@ -0,0 +1,146 @@
+# tests/test_query_server.py
+import asyncio
+import socket
+import numpy as np
+import pytest
+import pytest_asyncio
+from aiohttp import ClientSession
+from aiohttp.test_utils import TestClient, TestServer
+from langchain_core.documents import Document
+from scratch_rag_application.server.query_server import QueryServer
+from scratch_rag_application.vector_store.numpy_store import NumpyVectorStore
+from tests.conftest import FakeConfig
+
+
+class FakeEmbedding:
+    """Deterministic embedder mapping each text to a fixed random vector."""
+
+    def _vector(self, text):
+        rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+        return rng.standard_normal(16).tolist()
+
+    def embed_documents(self, texts):
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+    def embed_queries(self, texts):
+        return [self._vector(text) for text in texts]
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Fixture for a BM25 server over a populated NumPy store."""
+    config = FakeConfig({
+        "vectorstore.type": "numpy",
+        "vectorstore.numpy.persist_directory": str(tmp_path),
+        "vectorstore.numpy.quantization": "none",
+        "scoring.type": "bm25",
+        "scoring.parameters.k": 2,
+        "server.batching.window_ms": 1,
+    })
+    NumpyVectorStore(config, FakeEmbedding()).add_documents([
+        Document(page_content=f"gateway doc {i}",
+                 metadata={"source": f"https://docs/{i % 2}"})
+        for i in range(6)
+    ])
+    return config
+
+
+@pytest.fixture
+def server(config, mocker):
+    """Fixture for a query server whose model is the fake embedder."""
+    factory = mocker.patch("scratch_rag_application.server.query_server.EmbeddingFactory")
+    factory.return_value.create_embedder.side_effect = FakeEmbedding
+    server = QueryServer(config)
+    yield server
+    server.embedder.close()
+
+
+@pytest_asyncio.fixture
+async def client(server):
+    """Fixture for an aiohttp test client bound to the server's app."""
+    async with TestClient(TestServer(server.app)) as client:
+        yield client
+
+
+class TestQueryServer:
+    @pytest.mark.asyncio
+    async def test_query(self, client):
+        response = await client.post("/query", json={
+            "query": "gateway doc 3", "filter": {"source": "https://docs/1"}})
+
+        assert response.status == 200
+        body = await response.json()
+        assert body["k"] == 2
+        assert body["scoring_type"] == "bm25"
+        assert body["results"][0]["content"] == "gateway doc 3"
+        assert all(result["metadata"]["source"] == "https://docs/1"
+                   for result in body["results"])
+
+        metrics = await (await client.get("/metrics")).json()
+        assert metrics["query_latency"]["count"] == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("body, error", [
+        ({"k": 2}, "'query' must be a non-empty string"),
+        ({"query": "gateway", "k": 0}, "'k' must be a positive integer"),
+        ({"query": "gateway", "filter": "source"}, "'filter' must be an object"),
+        (["gateway"], "Request body must be a JSON object"),
+    ])
+    async def test_bad_request(self, client, body, error):
+        response = await client.post("/query", json=body)
+
+        assert response.status == 400
+        assert (await response.json()) == {"error": error}
+
+    @pytest.mark.asyncio
+    async def test_search_failure_is_a_server_error(self, client, server, mocker):
+        mocker.patch.object(server.vector_store, "asimilarity_search_with_score",
+                            side_effect=RuntimeError("store gone"))
+
+        response = await client.post("/query", json={"query": "gateway"})
+
+        assert response.status == 500
+        assert (await response.json()) == {"error": "search failed"}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("scoring_type", ["vector", "hybrid"])
+    async def test_query_embedding_failure_is_a_server_error(self, client, server, mocker,
+                                                             scoring_type):
+        mocker.patch.object(server.embedder.base, "embed_queries",
+                            side_effect=RuntimeError("model gone"))
+
+        response = await client.post("/query", json={
+            "query": "gateway", "scoring_type": scoring_type})
+
+        assert response.status == 500
+        assert (await response.json()) == {"error": "search failed"}
+
+    @pytest.mark.asyncio
+    async def test_stop_closes_the_listener(self, server, mocker):
+        close = mocker.spy(server.embedder, "close")
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        sock.listen()
+        url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+        running = asyncio.ensure_future(server.run(sock))
+        async with ClientSession() as session:
+            for _ in range(100):
+                try:
+                    async with session.get(f"{url}/health") as response:
+                        assert (await response.json()) == {"status": "ok"}
+                        break
+                except OSError:
+                    await asyncio.sleep(0.01)
+            else:
+                pytest.fail("server never started")
+
+            server.stop()
+            await asyncio.wait_for(running, timeout=5)
+
+            assert close.call_count == 1
+            with pytest.raises(OSError):
+                await session.get(f"{url}/health")
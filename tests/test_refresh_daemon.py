@@ -0,0 +1,139 @@
+# tests/test_refresh_daemon.py
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from langchain_core.documents import Document
+from scratch_rag_application.loader.refresh_daemon import RefreshDaemon
+from scratch_rag_application.vector_store.collection_alias import write_alias
+from tests.conftest import FakeConfig
+
+
+class FakeLoader:
+    """Loader whose markdown is the page body with the template stripped."""
+
+    urls = []
+    artifacts = None
+
+    def html_to_markdown(self, html, url):
+        return html.split("<!--footer-->")[0].strip()
+
+    def parse_sections(self, cleaned_text, url):
+        return [Document(page_content=cleaned_text, metadata={"source": url})]
+
+
+@pytest.fixture
+def pages():
+    """Fixture for page bodies served by the fake site, keyed by path."""
+    return {
+        "/etag": ("etag body", '"v1"'),
+        "/template": ("template body<!--footer-->2024", None),
+        "/plain": ("plain body", None),
+    }
+
+
+@pytest_asyncio.fixture
+async def site(pages):
+    """Fixture for a local site honouring If-None-Match."""
+    async def handler(request):
+        body, etag = pages[request.path]
+        if etag and request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304)
+        headers = {"ETag": etag} if etag else {}
+        return web.Response(text=body, headers=headers)
+
+    app = web.Application()
+    app.router.add_get("/{name}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}"
+    await runner.cleanup()
+
+
+@pytest.fixture
+def daemon(tmp_path, mocker):
+    """Fixture for a daemon with the loader and store update replaced."""
+    mocker.patch("scratch_rag_application.loader.refresh_daemon.URLLoader", FakeLoader)
+    replace = mocker.patch(
+        "scratch_rag_application.loader.refresh_daemon.replace_sources",
+        side_effect=lambda config, store, sources, docs: {
+            "deleted": len(sources), "added": len(docs)})
+    config = FakeConfig({
+        "refresh.state_file": str(tmp_path / "state.json"),
+        "refresh.status_file": str(tmp_path / "status.json"),
+    })
+    daemon = RefreshDaemon(config, open_store=mocker.Mock())
+    daemon.replace = replace
+    return daemon
+
+
+class TestRefreshDaemon:
+    @pytest.mark.asyncio
+    async def test_only_changed_pages_are_reindexed(self, daemon, site, pages):
+        urls = [f"{site}{path}" for path in pages]
+
+        first = await daemon.run_once(urls)
+        assert (first.checked, first.changed, first.reindexed) == (3, 3, 3)
+
+        # Validators answer 304; the template-only change hashes the same
+        pages["/template"] = ("template body<!--footer-->2025", None)
+        second = await daemon.run_once(urls)
+        assert (second.not_modified, second.unchanged, second.changed) == (1, 2, 0)
+        assert daemon.replace.call_count == 1
+
+        pages["/plain"] = ("plain body, edited", None)
+        third = await daemon.run_once(urls)
+        assert third.changed_sources == [f"{site}/plain"]
+        assert third.reindexed == 1
+        sources = daemon.replace.call_args.args[2]
+        assert sources == [f"{site}/plain"]
+
+    @pytest.mark.asyncio
+    async def test_state_survives_restart(self, daemon, site):
+        urls = [f"{site}/plain"]
+        await daemon.run_once(urls)
+
+        restarted = RefreshDaemon(daemon.config, open_store=daemon.open_store)
+        report = await restarted.run_once(urls)
+        assert (report.unchanged, report.changed) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_failed_sources_count_as_checked(self, daemon, site):
+        # The site has no /gone page and answers 500
+        report = await daemon.run_once([f"{site}/plain", f"{site}/gone"])
+
+        assert (report.checked, report.changed, report.failed) == (2, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_store_is_opened_once(self, daemon, site, pages):
+        urls = [f"{site}/plain"]
+
+        await daemon.run_once(urls)
+        await daemon.run_once(urls)
+        pages["/plain"] = ("plain body, edited", None)
+        await daemon.run_once(urls)
+
+        assert daemon.open_store.call_count == 1
+        stores = [call.args[1] for call in daemon.replace.call_args_list]
+        assert stores == [daemon.open_store.return_value] * 2
+
+    @pytest.mark.asyncio
+    async def test_store_is_reopened_when_the_alias_moves(self, daemon, site, pages, tmp_path):
+        daemon.config = FakeConfig({
+            "vectorstore.chroma.rebuild_mode": "blue_green",
+            "vectorstore.chroma.persist_directory": str(tmp_path),
+            "vectorstore.chroma.collection_name": "docs",
+        })
+        urls = [f"{site}/plain"]
+
+        await daemon.run_once(urls)
+        pages["/plain"] = ("plain body, edited", None)
+        await daemon.run_once(urls)
+        assert daemon.open_store.call_count == 1
+
+        write_alias(str(tmp_path), "docs", 2)
+        pages["/plain"] = ("plain body, edited again", None)
+        await daemon.run_once(urls)
+        assert daemon.open_store.call_count == 2
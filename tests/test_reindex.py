@@ -0,0 +1,81 @@
+# tests/test_reindex.py
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from scratch_rag_application.loader.reindex import delete_sources
+from scratch_rag_application.text_splitter.near_duplicates import NearDuplicateFilter
+from scratch_rag_application.vector_store.numpy_store import NumpyVectorStore
+from tests.conftest import FakeConfig
+
+
+class FakeEmbedding:
+    """Deterministic embedder mapping each text to a fixed random vector."""
+
+    def _vector(self, text):
+        rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+        return rng.standard_normal(16).tolist()
+
+    def embed_documents(self, texts):
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Fixture for a NumPy store of three pages sharing a deduplicated callout."""
+    callout = "Install the gateway with the package manager before you start."
+    docs = [Document(page_content=f"{page} page body", metadata={"source": page})
+            for page in ("a", "b", "c")]
+    docs += [Document(page_content=callout, metadata={"source": page})
+             for page in ("a", "b", "c")]
+    ids, kept = NearDuplicateFilter(FakeConfig()).deduplicate(
+        [f"id{i}" for i in range(len(docs))], docs)
+    store = NumpyVectorStore(FakeConfig({
+        "vectorstore.numpy.persist_directory": str(tmp_path),
+        "vectorstore.numpy.quantization": "none",
+        "vectorstore.page_size": 2,
+        "scoring.type": "bm25",
+    }), FakeEmbedding())
+    assert store.add_documents(kept, ids)
+    return store
+
+
+def chunks(store, source):
+    """Texts and metadata of the chunks a source owns."""
+    return [(text, metadata) for page in store.iter_documents(where={"source": source})
+            for text, metadata in zip(page["documents"], page["metadatas"])]
+
+
+class TestDeleteSources:
+    @pytest.mark.asyncio
+    async def test_shared_chunk_moves_to_a_remaining_source(self, store):
+        bm25 = store.get_search_strategy("bm25")
+        deleted = await delete_sources(store, ["a"])
+
+        assert deleted == 1
+        assert chunks(store, "a") == []
+        callout = [metadata for text, metadata in chunks(store, "b")
+                   if text.startswith("Install")]
+        assert len(callout) == 1
+        assert callout[0]["duplicate_sources"] == "c"
+        assert callout[0]["duplicate_count"] == 1
+        # The built search indexes follow the move
+        results = bm25.search("install gateway package", k=1, filter={"source": "b"})
+        assert results[0][0].page_content.startswith("Install")
+
+    @pytest.mark.asyncio
+    async def test_deleted_duplicate_sources_are_skipped(self, store):
+        await delete_sources(store, ["b"])
+        await delete_sources(store, ["a"])
+
+        assert [text for text, _ in chunks(store, "c")] == [
+            "c page body", "Install the gateway with the package manager before you start."]
+
+    @pytest.mark.asyncio
+    async def test_content_of_every_source_goes(self, store):
+        deleted = await delete_sources(store, ["a", "b", "c"])
+
+        assert deleted == 4
+        assert list(store.iter_documents()) == []
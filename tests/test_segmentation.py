@@ -0,0 +1,138 @@
+# tests/test_segmentation.py
+import pytest
+from scratch_rag_application.content_parser.base_parser import remaining_text
+from scratch_rag_application.content_parser.markdown_ast import parse_blocks, table_rows
+from scratch_rag_application.content_parser.segmentation_engine import SegmentationEngine
+from scratch_rag_application.content_parser.table_parser import TableContentParser
+from scratch_rag_application.utils.text_cleaner import TextCleaner
+
+
+@pytest.fixture
+def parser_config():
+    """Fixture for QA parser configuration."""
+    return {
+        "content_parser": {
+            "qa": {
+                "patterns": [
+                    {
+                        "type": "explicit",
+                        "question_pattern": "Q:|Question:",
+                        "answer_pattern": "A:|Answer:"
+                    },
+                    {
+                        "type": "header",
+                        "header_pattern": "##[ \\t]+[^?\\n]+\\?"
+                    }
+                ]
+            }
+        }
+    }
+
+
+@pytest.fixture
+def page():
+    """Fixture for a page with a Q&A, a code block and a table."""
+    return """# Gateway
+Intro sentence.
+## How do I install it?
+Run the installer.
+```bash
+kong start
+```
+### Plugins
+| Name | Priority |
+| --- | --- |
+| cors | 2000 |
+| acl | 950 |
+Trailing note."""
+
+
+@pytest.fixture
+def cleaned_page():
+    """Fixture for a page as TextCleaner leaves it, with a multi-sentence cell and prose pipes."""
+    return TextCleaner().clean("""# Gateway
+Intro sentence.
+## How do I install it?
+Run the installer.
+```bash
+kong start
+```
+### Plugins
+Chain them as a | b in the config.
+| Name | Priority |
+| --- | --- |
+| cors | 2000. Runs before auth. |
+| acl | 950 |
+Trailing note.""")
+
+
+class TestParseBlocks:
+    def test_line_based_markdown(self, page):
+        blocks = parse_blocks(page)
+
+        assert [block.kind for block in blocks] == [
+            "heading", "paragraph", "heading", "paragraph", "code", "heading", "table",
+            "paragraph"]
+        code = blocks[4]
+        assert code.info == "bash"
+        assert page[code.start:code.end] == "```bash\nkong start\n```"
+        assert table_rows(page, blocks[6]) == [["Name", "Priority"], ["cors", "2000"],
+                                               ["acl", "950"]]
+
+    def test_cleaned_markdown_folded_onto_one_line(self, cleaned_page):
+        blocks = parse_blocks(cleaned_page)
+
+        # The cleaner folds everything up to the next heading onto its line
+        kinds = [block.kind for block in blocks]
+        assert kinds == ["heading", "heading", "code", "heading", "table", "paragraph"]
+        table = blocks[4]
+        # The sentence break inside a cell stays in its row, and the prose
+        # pipe before the table does not swallow it
+        assert table_rows(cleaned_page, table) == [
+            ["Name", "Priority"], ["cors", "2000. Runs before auth."], ["acl", "950"]]
+        assert cleaned_page[table.start:].startswith("| Name |")
+        assert cleaned_page[blocks[3].start:blocks[3].end].strip() == \
+            "### Plugins Chain them as a | b in the config."
+        assert cleaned_page[table.end:].strip() == "Trailing note."
+
+    def test_pipes_in_prose_are_not_tables(self):
+        text = "Use a | b when piping. | not | a | table |"
+        assert [block.kind for block in parse_blocks(text)] == ["paragraph"]
+
+
+class TestSegmentationEngine:
+    def test_blocks_dispatched_by_kind(self, parser_config, cleaned_page):
+        engine = SegmentationEngine(parser_config, ["qa", "table", "code"])
+        sections = engine.segment(cleaned_page)
+
+        assert [s.content_type for s in sections] == ["qa", "code", "table"]
+        assert sections[0].content == "Q: ## How do I install it?\nA: Run the installer."
+        assert sections[1].content == "```bash\nkong start\n```"
+        assert sections[2].content.splitlines() == [
+            "| Name | Priority |", "|---|---|", "| cors | 2000. Runs before auth. |",
+            "| acl | 950 |"]
+
+        starts = [s.start for s in sections]
+        assert starts == sorted(starts)
+        assert all(a.end <= b.start for a, b in zip(sections, sections[1:]))
+        remaining = remaining_text(cleaned_page, sections)
+        assert "kong start" not in remaining and "cors" not in remaining
+        assert "Intro sentence." in remaining and "Trailing note." in remaining
+
+    def test_disabled_parsers_leave_blocks_in_remaining_text(self, parser_config, page):
+        engine = SegmentationEngine(parser_config, ["qa"])
+        sections = engine.segment(page)
+
+        assert [s.content_type for s in sections] == ["qa"]
+        assert "| cors | 2000 |" in remaining_text(page, sections)
+
+    def test_parser_standalone_matches_engine(self, parser_config, page):
+        engine = SegmentationEngine(parser_config, ["table"])
+        standalone = TableContentParser(parser_config).parse(page)
+
+        assert [(s.start, s.end, s.content) for s in standalone] == \
+            [(s.start, s.end, s.content) for s in engine.segment(page)]
+
+    def test_unknown_parser_type(self, parser_config):
+        with pytest.raises(ValueError):
+            SegmentationEngine(parser_config, ["images"])
@@ -0,0 +1,104 @@
+# tests/test_sharded_chroma.py
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from scratch_rag_application.vector_store.numpy_store import NumpyVectorStore
+from scratch_rag_application.vector_store.sharded_chroma import (
+    ShardedChromaVectorStore,
+    ShardParams,
+)
+from tests.conftest import FakeConfig
+
+
+class FakeEmbedding:
+    """Deterministic embedder mapping each text to a fixed random vector."""
+
+    def _vector(self, text):
+        rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+        return rng.standard_normal(16).tolist()
+
+    def embed_documents(self, texts):
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Fixture for exact NumPy-backed shards in a temporary directory."""
+    return FakeConfig({
+        "vectorstore.sharded_chroma.num_shards": 3,
+        "vectorstore.numpy.persist_directory": str(tmp_path / "unsharded"),
+        "vectorstore.numpy.quantization": "none",
+        "scoring.type": "vector",
+    })
+
+
+@pytest.fixture
+def store(config, tmp_path, mocker):
+    """Fixture for a sharded store whose shards are NumPy stores, which delete by id."""
+    def numpy_shard(params, embedding):
+        return NumpyVectorStore(ShardParams(params, {
+            "vectorstore.numpy.persist_directory": str(tmp_path / "shards"),
+            "vectorstore.numpy.collection_name":
+                params.get("vectorstore.chroma.collection_name"),
+        }), embedding)
+
+    mocker.patch("scratch_rag_application.vector_store.sharded_chroma.ChromaVectorStore",
+                 side_effect=numpy_shard)
+    return ShardedChromaVectorStore(config, FakeEmbedding())
+
+
+@pytest.fixture
+def documents():
+    """Fixture for chunks from eight sources."""
+    return [
+        Document(page_content=f"page {i % 8} chunk {i}",
+                 metadata={"source": f"https://example.com/{i % 8}"})
+        for i in range(40)
+    ]
+
+
+def shard_contents(store):
+    return [shard._store.get(include=["metadatas"]) for shard in store._store]
+
+
+class TestShardedStore:
+    def test_documents_are_routed_by_source(self, store, documents):
+        assert store.add_documents(documents, [str(i) for i in range(40)])
+
+        contents = shard_contents(store)
+        assert sum(len(content["ids"]) for content in contents) == 40
+        assert sum(bool(content["ids"]) for content in contents) > 1
+        for index, content in enumerate(contents):
+            for metadata in content["metadatas"]:
+                assert store.shard_for(Document(page_content="", metadata=metadata)) == index
+
+    def test_merged_top_k_matches_one_store(self, store, config, documents):
+        store.add_documents(documents)
+        unsharded = NumpyVectorStore(config, FakeEmbedding())
+        unsharded.add_documents(documents)
+
+        for query in ["page 3 chunk 11", "page 5", "chunk 20"]:
+            sharded = store.similarity_search_with_score(query, k=6)
+            expected = unsharded.similarity_search_with_score(query, k=6)
+            assert [doc.page_content for doc, _ in sharded] == \
+                [doc.page_content for doc, _ in expected]
+            assert [score for _, score in sharded] == pytest.approx(
+                [score for _, score in expected])
+
+    def test_delete_by_ids_touches_only_owning_shards(self, store, documents, mocker):
+        ids = [str(i) for i in range(40)]
+        store.add_documents(documents, ids)
+        owner = store.shard_for(documents[0])
+        owned = [doc_id for doc_id, doc in zip(ids, documents)
+                 if store.shard_for(doc) == owner][:2]
+        spies = [mocker.spy(shard, "delete") for shard in store._store]
+
+        assert store.delete(owned)
+
+        remaining = [doc_id for content in shard_contents(store) for doc_id in content["ids"]]
+        assert sorted(remaining) == sorted(set(ids) - set(owned))
+        assert [spy.call_count for spy in spies] == \
+            [int(index == owner) for index in range(len(spies))]
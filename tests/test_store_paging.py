@@ -0,0 +1,112 @@
+# tests/test_store_paging.py
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from scratch_rag_application.search.bm25_search import BM25Search
+from scratch_rag_application.utils.paging import iter_pages
+from scratch_rag_application.vector_store.numpy_store import NumpyVectorStore
+from tests.conftest import FakeConfig
+
+
+class FakeEmbedding:
+    """Deterministic embedder mapping each text to a fixed random vector."""
+
+    def _vector(self, text):
+        rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+        return rng.standard_normal(16).tolist()
+
+    def embed_documents(self, texts):
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+
+@pytest.fixture
+def documents():
+    """Fixture for chunks from three sources."""
+    return [
+        Document(page_content=f"gateway chunk {i}" + " route" * (i % 4),
+                 metadata={"source": f"https://example.com/{i % 3}"})
+        for i in range(23)
+    ]
+
+
+@pytest.fixture
+def store(tmp_path, documents):
+    """Fixture for a NumPy store holding the documents, with 5-row pages."""
+    store = NumpyVectorStore(FakeConfig({
+        "vectorstore.numpy.persist_directory": str(tmp_path),
+        "vectorstore.numpy.quantization": "none",
+        "vectorstore.page_size": 5,
+        "scoring.type": "bm25",
+    }), FakeEmbedding())
+    assert store.add_documents(documents)
+    return store
+
+
+def recording(get, calls):
+    """Wrap a get() to record the limit and offset of every call."""
+    def wrapped(**kwargs):
+        calls.append((kwargs.get("limit"), kwargs.get("offset")))
+        return get(**kwargs)
+    return wrapped
+
+
+class TestStorePaging:
+    def test_pages_cover_the_store(self, store, documents):
+        pages = list(store.iter_documents())
+
+        assert [len(page["ids"]) for page in pages] == [5, 5, 5, 5, 3]
+        assert [text for page in pages for text in page["documents"]] == \
+            [doc.page_content for doc in documents]
+
+    def test_where_and_include(self, store, documents):
+        where = {"source": "https://example.com/1"}
+        pages = list(store.iter_documents(batch_size=3, include=["metadatas"], where=where))
+
+        assert all(page["documents"] is None for page in pages)
+        assert sum(len(page["ids"]) for page in pages) == \
+            sum(doc.metadata == where for doc in documents)
+        assert all(metadata == where for page in pages for metadata in page["metadatas"])
+
+    def test_stops_after_a_short_page(self, store):
+        calls = []
+        pages = list(iter_pages(recording(store._store.get, calls), 23))
+
+        assert len(pages) == 1
+        # An exactly full page needs one more read to find the end
+        assert calls == [(23, 0), (23, 23)]
+        with pytest.raises(ValueError):
+            next(iter_pages(store._store.get, 0))
+
+    def test_bm25_built_from_pages(self, store, documents):
+        calls = []
+        store._store.get = recording(store._store.get, calls)
+        store._reset_search_strategies()
+        paged = store.get_search_strategy("bm25")
+
+        direct = BM25Search(FakeConfig())
+        direct.initialize_documents(documents)
+
+        assert calls and all(limit == 5 for limit, _ in calls)
+        assert paged.documents == direct.documents
+        query = "gateway route"
+        assert [doc for doc, _ in paged.search(query, k=4)] == \
+            [doc for doc, _ in direct.search(query, k=4)]
+
+    def test_delete_by_metadata_reads_and_deletes_in_pages(self, store, documents, mocker):
+        calls = []
+        store._store.get = recording(store._store.get, calls)
+        delete = mocker.spy(store._store, "delete")
+        where = {"source": "https://example.com/1"}
+        matching = sum(doc.metadata == where for doc in documents)
+
+        assert store.delete_by_metadata(where) == matching
+
+        assert calls and all(limit == 5 for limit, _ in calls)
+        assert [len(call.kwargs["ids"]) for call in delete.call_args_list] == [5, 3]
+        remaining = [metadata for page in store.iter_documents(include=["metadatas"])
+                     for metadata in page["metadatas"]]
+        assert len(remaining) == len(documents) - matching
+        assert where not in remaining
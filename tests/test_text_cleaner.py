@@ -0,0 +1,62 @@
+# tests/test_text_cleaner.py
+import logging
+import random
+import re
+import pytest
+from scratch_rag_application.utils.text_cleaner import TextCleaner
+
+
+def reference_clean(text):
+    """The original four-pass cleaning the compiled pipeline must match."""
+    cleaned = re.sub(r'\s+', ' ', text)
+    cleaned = re.sub(r'\s(#+ )', r'\n\1', cleaned)
+    cleaned = re.sub(r'\. ([A-Z])', r'.\n\1', cleaned)
+    cleaned = re.sub(r'\n+', '\n', cleaned)
+    return cleaned.strip()
+
+
+@pytest.fixture
+def golden_corpus():
+    """Fixture for hand-picked edge cases plus seeded random texts."""
+    corpus = [
+        "# Title\n\nFirst sentence. Second sentence.\n\n## Section\ntext",
+        "  ## Leading header. Next.  ",
+        "a # # b ## c ###x #",
+        "End. ## Header. Lower. upper.A. B",
+        "Tabs\tand\r\nwindows\r\nlines. And\xa0non-breaking separators. Ok",
+        "Version 1.2. Released. 3. Items. ... Ellipsis. E",
+        "```yaml\nkey: 1\n```\n| a | b |\n| --- | --- |\n| 1 | 2 |",
+    ]
+    rng = random.Random(47)
+    tokens = ["word", "Word", ".", ". ", " ", "  ", "\n", "\n\n", "\t", "#", "##", "# ",
+              "## ", "A", "z", "\xa0", "\u2028", "\x1c", "\u3000", "|", "`"]
+    for _ in range(2000):
+        corpus.append("".join(rng.choice(tokens) for _ in range(rng.randint(1, 60))))
+    return corpus
+
+
+class TestTextCleaner:
+    def test_matches_reference_on_golden_corpus(self, golden_corpus):
+        cleaner = TextCleaner()
+        for text in golden_corpus:
+            assert cleaner.clean(text) == reference_clean(text), repr(text)
+
+    def test_empty_text_returned_as_is(self):
+        assert TextCleaner().clean("") == ""
+        assert TextCleaner().clean(None) is None
+
+    def test_statistics_only_logged_for_debug(self, caplog):
+        cleaner = TextCleaner()
+        # The entry module's setup_logging() stops propagation to the root
+        # logger caplog listens on, so its handler is attached directly
+        cleaner.logger.addHandler(caplog.handler)
+        try:
+            with caplog.at_level(logging.INFO, logger=cleaner.logger.name):
+                cleaner.clean("One. Two")
+            assert not caplog.records
+
+            with caplog.at_level(logging.DEBUG, logger=cleaner.logger.name):
+                cleaner.clean("One. Two")
+            assert "1 line breaks restored" in caplog.text
+        finally:
+            cleaner.logger.removeHandler(caplog.handler)
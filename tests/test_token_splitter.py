@@ -0,0 +1,115 @@
+# tests/test_token_splitter.py
+import re
+import sys
+import types
+import pytest
+from langchain_core.documents import Document
+from scratch_rag_application.embedding import model_registry
+from scratch_rag_application.embedding.huggingface import HuggingFaceEmbedding
+from scratch_rag_application.text_splitter.sentence_transformer_splitter import (
+    SentenceTransformerDocumentSplitter,
+    TokenWindowSplitter,
+)
+from tests.conftest import FakeConfig
+
+
+class WordTokenizer:
+    """Fast-tokenizer stand-in with one token per word."""
+
+    is_fast = True
+    model_max_length = 512
+
+    def __init__(self):
+        self.calls = 0
+
+    def num_special_tokens_to_add(self):
+        return 2
+
+    def __call__(self, texts, add_special_tokens=True, return_offsets_mapping=False,
+                 return_attention_mask=True, verbose=True):
+        self.calls += 1
+        matches = [list(re.finditer(r"\S+", text)) for text in texts]
+        return {
+            "input_ids": [[hash(m.group()) for m in ms] for ms in matches],
+            "offset_mapping": [[m.span() for m in ms] for ms in matches],
+        }
+
+
+@pytest.fixture
+def tokenizer():
+    """Fixture for a word-level tokenizer."""
+    return WordTokenizer()
+
+
+@pytest.fixture
+def sentence_transformer(mocker):
+    """Fixture recording every model sentence-transformers is asked to load."""
+    loaded = []
+
+    class FakeSentenceTransformer:
+        max_seq_length = 384
+
+        def __init__(self, model_name, **model_kwargs):
+            self.tokenizer = WordTokenizer()
+            loaded.append(self)
+
+    mocker.patch.dict(sys.modules, {"sentence_transformers": types.SimpleNamespace(
+        SentenceTransformer=FakeSentenceTransformer)})
+    model_registry.clear()
+    yield loaded
+    model_registry.clear()
+
+
+class TestTokenWindowSplitter:
+    def test_windows_overlap_and_keep_original_text(self, tokenizer):
+        splitter = TokenWindowSplitter(tokenizer, tokens_per_chunk=4, chunk_overlap=1)
+        text = "w0 w1  w2\nw3 w4 w5 w6 w7 w8"
+
+        chunks = splitter.split_texts([text])[0]
+        assert chunks == ["w0 w1  w2\nw3", "w3 w4 w5 w6", "w6 w7 w8"]
+
+    def test_documents_are_tokenized_in_batches(self, tokenizer):
+        splitter = TokenWindowSplitter(tokenizer, tokens_per_chunk=3, chunk_overlap=0,
+                                       batch_size=2)
+        docs = [Document(page_content=f"a{i} b{i} c{i} d{i}", metadata={"i": i})
+                for i in range(5)]
+
+        chunks = splitter.split_documents(docs)
+        assert tokenizer.calls == 3
+        assert [chunk.page_content for chunk in chunks[:2]] == ["a0 b0 c0", "d0"]
+        assert [chunk.metadata["i"] for chunk in chunks] == [0, 0, 1, 1, 2, 2, 3, 3, 4, 4]
+
+    def test_overlap_must_be_smaller_than_chunk(self, tokenizer):
+        with pytest.raises(ValueError):
+            TokenWindowSplitter(tokenizer, tokens_per_chunk=4, chunk_overlap=4)
+
+
+class TestSentenceTransformerDocumentSplitter:
+    def test_tokenizer_only_caps_chunk_size(self, tokenizer, mocker):
+        mocker.patch.object(model_registry, "get_tokenizer", return_value=tokenizer)
+        mocker.patch.object(model_registry, "max_sequence_length", return_value=384)
+        load_model = mocker.patch.object(model_registry, "get_sentence_transformer")
+
+        splitter = SentenceTransformerDocumentSplitter(FakeConfig({
+            "text_splitter.sentence_transformer.chunk_size": 1500,
+            "text_splitter.sentence_transformer.chunk_overlap": 200,
+        }))
+        assert splitter._splitter.tokens_per_chunk == 382
+        load_model.assert_not_called()
+
+    def test_splitter_shares_the_embedder_model(self, sentence_transformer):
+        embedder = HuggingFaceEmbedding(FakeConfig({
+            "embeddings.huggingface.model_name": "sentence-transformers/all-MiniLM-L6-v2",
+        }))
+        splitter = SentenceTransformerDocumentSplitter(FakeConfig({
+            "text_splitter.sentence_transformer.model_name": "all-MiniLM-L6-v2",
+            "text_splitter.sentence_transformer.tokenizer_only": False,
+            "text_splitter.sentence_transformer.chunk_size": 100,
+            "text_splitter.sentence_transformer.chunk_overlap": 10,
+        }))
+
+        assert len(sentence_transformer) == 1
+        model = sentence_transformer[0]
+        assert embedder._embedder.client is model
+        assert splitter._splitter.tokenizer is model.tokenizer
+        assert model_registry.get_tokenizer("all-MiniLM-L6-v2") is model.tokenizer
@@ -0,0 +1,165 @@
+# tests/test_versioned_chroma.py
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from scratch_rag_application.vector_store import versioned_chroma
+from scratch_rag_application.vector_store.collection_alias import read_alias, read_retired
+from scratch_rag_application.vector_store.numpy_index import QuantizedVectorIndex
+from scratch_rag_application.vector_store.numpy_store import NumpyVectorStore
+from scratch_rag_application.vector_store.sharded_chroma import ShardParams
+from scratch_rag_application.vector_store.versioned_chroma import VersionedChromaVectorStore
+from tests.conftest import FakeConfig
+
+
+class FakeEmbedding:
+    """Deterministic embedder mapping each text to a fixed random vector."""
+
+    def _vector(self, text):
+        rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+        return rng.standard_normal(16).tolist()
+
+    def embed_documents(self, texts):
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Fixture for a versioned store whose retired versions are due at once."""
+    return FakeConfig({
+        "vectorstore.chroma.persist_directory": str(tmp_path),
+        "vectorstore.chroma.collection_name": "docs",
+        "vectorstore.chroma.blue_green.alias_check_interval": 0,
+        "vectorstore.numpy.quantization": "none",
+        "scoring.type": "bm25",
+    })
+
+
+@pytest.fixture
+def versions(tmp_path):
+    return tmp_path / "versions"
+
+
+@pytest.fixture
+def collections(versions, mocker):
+    """Fixture backing every version with a NumPy store; returns the drop-path opener."""
+    def numpy_version(params, embedding):
+        return NumpyVectorStore(ShardParams(params, {
+            "vectorstore.numpy.persist_directory": str(versions),
+            "vectorstore.numpy.collection_name":
+                params.get("vectorstore.chroma.collection_name"),
+        }), embedding)
+
+    def open_collection(collection_name, embedding_function, persist_directory):
+        return QuantizedVectorIndex(str(versions / collection_name), embedding_function)
+
+    mocker.patch.object(versioned_chroma, "ChromaVectorStore", side_effect=numpy_version)
+    return mocker.patch.object(versioned_chroma, "Chroma", side_effect=open_collection)
+
+
+def documents(generation):
+    return [Document(page_content=f"gen {generation} chunk {i}", metadata={"i": i})
+            for i in range(5)]
+
+
+class TestVersionedStore:
+    def test_rebuild_retires_the_old_version_without_waiting(self, config, versions,
+                                                             collections):
+        config["vectorstore.chroma.blue_green.alias_check_interval"] = 60
+        store = VersionedChromaVectorStore(config, FakeEmbedding())
+
+        assert store.rebuild(documents(1))
+        assert store.rebuild(documents(2))
+
+        # Nothing is due yet, so both old versions are kept and recorded
+        assert read_alias(config["vectorstore.chroma.persist_directory"], "docs")[1] == 2
+        assert set(read_retired(config["vectorstore.chroma.persist_directory"], "docs")) == {0, 1}
+        assert (versions / "docs__v1").exists()
+        assert collections.call_count == 0
+
+    def test_pinned_version_is_dropped_after_its_queries(self, config, versions, collections):
+        store = VersionedChromaVectorStore(config, FakeEmbedding())
+        store.rebuild(documents(1))
+        store._drop_due_versions()
+
+        with store._pinned() as pinned:
+            assert pinned.version == 1
+            store.rebuild(documents(2))
+            store._drop_due_versions()
+            assert (versions / "docs__v1").exists()
+            assert [doc.page_content for doc, _ in
+                    pinned.similarity_search_with_score("gen 1 chunk 3", k=1)] == \
+                ["gen 1 chunk 3"]
+
+        store._drop_due_versions()
+        assert not (versions / "docs__v1").exists()
+        assert read_retired(config["vectorstore.chroma.persist_directory"], "docs") == {}
+        assert store.similarity_search_with_score("gen 2 chunk 3", k=1)[0][0].page_content == \
+            "gen 2 chunk 3"
+
+    def test_version_followed_from_another_process_is_kept_while_pinned(self, config, versions,
+                                                                        collections):
+        store = VersionedChromaVectorStore(config, FakeEmbedding())
+        store.rebuild(documents(1))
+        store._drop_due_versions()
+        writer = VersionedChromaVectorStore(config, FakeEmbedding())
+
+        with store._pinned() as pinned:
+            assert writer.rebuild(documents(2))
+            store._switch_to(2)
+            store._drop_due_versions()
+            assert (versions / "docs__v1").exists()
+            assert [doc.page_content for doc, _ in
+                    pinned.similarity_search_with_score("gen 1 chunk 3", k=1)] == \
+                ["gen 1 chunk 3"]
+
+        store._drop_due_versions()
+        assert not (versions / "docs__v1").exists()
+        assert store._store.version == 2
+
+    def test_build_is_counted_in_pages(self, config, collections):
+        config["vectorstore.page_size"] = 2
+        store = VersionedChromaVectorStore(config, FakeEmbedding())
+
+        assert store.rebuild(documents(1))
+        assert store._check_build(store._store, documents(1))
+        assert not store._check_build(store._store, documents(1)[:3])
+
+    def test_delete_all_publishes_an_empty_version_and_drops_once(self, config, versions,
+                                                                  collections, mocker):
+        store = VersionedChromaVectorStore(config, FakeEmbedding())
+        store.rebuild(documents(1))
+        store._drop_due_versions()
+        collections.reset_mock()
+        old = store._store
+        old_delete = mocker.spy(old, "delete")
+
+        assert store.delete()
+
+        directory = config["vectorstore.chroma.persist_directory"]
+        assert read_alias(directory, "docs")[1] == 2
+        assert store._store._store.get(include=[])["ids"] == []
+        assert old_delete.call_count == 0
+        store._drop_due_versions()
+        store._drop_due_versions()
+        assert [call.kwargs["collection_name"] for call in collections.call_args_list] == \
+            ["docs__v1"]
+        assert not (versions / "docs__v1").exists()
+
+    def test_iter_documents_pins_only_while_reading_a_page(self, config, collections):
+        store = VersionedChromaVectorStore(config, FakeEmbedding())
+        store.rebuild(documents(1))
+        first = store._store
+
+        pages = store.iter_documents(batch_size=2)
+        assert len(next(pages)["ids"]) == 2
+        assert store._inflight == {}
+        store.rebuild(documents(2))
+
+        # Later pages still come from the version the iteration started on
+        rest = [doc for page in pages for doc in page["documents"]]
+        assert store._store is not first
+        assert sorted(rest) == [f"gen 1 chunk {i}" for i in range(2, 5)]
+        assert store._inflight == {}